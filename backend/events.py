@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered too slow to keep up
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_INTERVAL_SECONDS = 15
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: str
+    restricted: bool  # BDEs only receive events about their own clients and tasks
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+    dropped_events: int = 0
+
+    def can_see(self, event: Dict[str, Any]) -> bool:
+        audience = event.get("audience", {})
+        if not self.restricted:
+            return not audience.get("restricted_only")
+        return self.user_id in (audience.get("assigned_bde"), audience.get("assigned_to"), audience.get("created_by"))
+
+
+class EventBroker:
+    """In-process fan-out of change events to /stream subscribers.
+
+    With several workers, `relay` forwards each locally published event to
+    the other workers, which hand it to their own subscribers via
+    `publish_remote`.
+    """
+
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.sequence = itertools.count(1)
+        self.relay: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    @property
+    def has_listeners(self) -> bool:
+        """Whether publishing can reach anyone (subscribers here or, via the relay, elsewhere)"""
+        return bool(self.subscribers) or self.relay is not None
+
+    def subscribe(self, user_id: str, restricted: bool) -> Subscriber:
+        subscriber = Subscriber(user_id=user_id, restricted=restricted)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(
+        self,
+        event_type: str,
+        data: Dict[str, Any],
+        assigned_bde: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        created_by: Optional[str] = None,
+        restricted_only: bool = False
+    ) -> None:
+        """Queue an event for every subscriber allowed to see it. Never blocks the writer.
+        
+        `restricted_only` events only go to the BDEs in the audience, e.g. a change
+        in which BDE sees a client, which means nothing to admins.
+        """
+        event = {
+            "id": next(self.sequence),
+            "type": event_type,
+            "data": {**data, "at": datetime.utcnow().isoformat()},
+            "audience": {
+                "assigned_bde": assigned_bde,
+                "assigned_to": assigned_to,
+                "created_by": created_by,
+                "restricted_only": restricted_only
+            },
+        }
+        self._fan_out(event)
+        if self.relay:
+            self.relay(event)
+
+    def publish_remote(self, event: Dict[str, Any]) -> None:
+        """Deliver an event published by another worker, numbered in this worker's sequence"""
+        self._fan_out({**event, "id": next(self.sequence)})
+
+    def _fan_out(self, event: Dict[str, Any]) -> None:
+        for subscriber in list(self.subscribers):
+            if subscriber.can_see(event):
+                self._deliver(subscriber, event)
+
+    def _deliver(self, subscriber: Subscriber, event: Dict[str, Any]) -> None:
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: a slow consumer doesn't hold up writers or grow memory. Its
+            # backlog is replaced by a single resync so it refetches (or calls /sync) once
+            subscriber.dropped_events += subscriber.queue.qsize() + 1
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait({"id": event["id"], "type": "resync", "data": {"reason": "too_many_events"}})
+            logger.warning(f"Event subscriber {subscriber.user_id} fell behind; sent resync")
+
+    @property
+    def backlog(self) -> int:
+        return sum(subscriber.queue.qsize() for subscriber in self.subscribers)
+
+# Global instance
+event_broker = EventBroker()
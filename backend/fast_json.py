@@ -0,0 +1,53 @@
+import os
+import logging
+from typing import Any, AsyncIterator, Dict, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Opt-in: list endpoints skip re-validating documents we wrote ourselves and encode with orjson
+FAST_JSON_ENABLED = ORJSON_AVAILABLE and os.environ.get('FAST_JSON_RESPONSES', 'false').lower() == 'true'
+
+if os.environ.get('FAST_JSON_RESPONSES', 'false').lower() == 'true' and not ORJSON_AVAILABLE:
+    logger.warning("FAST_JSON_RESPONSES is set but orjson is not installed; using the standard encoder")
+
+# Objects per encoded chunk when streaming a list
+STREAM_BATCH_SIZE = 100
+
+
+def construct_trusted(model: Type[BaseModel], doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Field values for a document this API wrote itself.
+
+    model_construct fills in defaults for fields older documents don't have
+    and drops unknown keys such as Mongo's _id, but skips validation, so
+    nested notes and attachments stay the plain dicts Mongo returned.
+    """
+    return model.model_construct(**doc).__dict__
+
+
+def encode(content: Any) -> bytes:
+    # orjson natively handles the datetimes and enums these documents contain
+    return orjson.dumps(content)
+
+
+async def stream_json_array(cursor, model: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """Encode documents as they arrive from the cursor and yield the JSON array in batches"""
+    yield b"["
+    batch = []
+    first = True
+    async for doc in cursor:
+        batch.append(encode(construct_trusted(model, doc)))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield (b"" if first else b",") + b",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b"" if first else b",") + b",".join(batch)
+    yield b"]"
@@ -1,14 +1,34 @@
 import os
 import json
-from typing import Optional, Dict, Any, List
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
+import importlib.util
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 import logging
 
+from request_context import external_call
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 logger = logging.getLogger(__name__)
 
+# The Google client libraries cost every worker a few hundred ms and tens of MB
+# to import, configured or not, so they're imported on first use and only
+# looked up here
+def is_installed(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        return False
+
+GOOGLE_LIBRARIES_AVAILABLE = all(
+    is_installed(module_name)
+    for module_name in ("googleapiclient", "google_auth_oauthlib", "google.oauth2")
+)
+
+def build_service(service_name: str, version: str, credentials: "Credentials"):
+    from googleapiclient.discovery import build
+    return build(service_name, version, credentials=credentials)
+
 class GoogleWorkspaceService:
     def __init__(self):
         self.client_id = os.environ.get('GOOGLE_CLIENT_ID')
@@ -37,6 +57,7 @@ class GoogleWorkspaceService:
     def get_authorization_url(self) -> str:
         """Get Google OAuth authorization URL"""
         try:
+            from google_auth_oauthlib.flow import Flow
             flow = Flow.from_client_config(
                 self.client_config,
                 scopes=self.scopes,
@@ -51,12 +72,14 @@ class GoogleWorkspaceService:
     def exchange_code_for_tokens(self, code: str) -> Dict[str, Any]:
         """Exchange authorization code for tokens"""
         try:
+            from google_auth_oauthlib.flow import Flow
             flow = Flow.from_client_config(
                 self.client_config,
                 scopes=self.scopes,
                 redirect_uri=self.redirect_uri
             )
-            flow.fetch_token(code=code)
+            with external_call():
+                flow.fetch_token(code=code)
             credentials = flow.credentials
             
             return {
@@ -71,8 +94,11 @@ class GoogleWorkspaceService:
             logger.error(f"Error exchanging code for tokens: {e}")
             raise
 
-    def refresh_credentials(self, credentials_dict: Dict[str, Any]) -> Credentials:
+    def refresh_credentials(self, credentials_dict: Dict[str, Any]) -> "Credentials":
         """Refresh Google credentials if needed"""
+        from google.oauth2.credentials import Credentials
+        from google.auth.transport.requests import Request
+        
         try:
             credentials = Credentials(
                 token=credentials_dict.get("access_token"),
@@ -84,7 +110,8 @@ class GoogleWorkspaceService:
             )
             
             if credentials.expired:
-                credentials.refresh(Request())
+                with external_call():
+                    credentials.refresh(Request())
                 
             return credentials
         except Exception as e:
@@ -95,7 +122,7 @@ class GoogleWorkspaceService:
         """Send notification to Google Chat"""
         try:
             credentials = self.refresh_credentials(credentials_dict)
-            service = build('chat', 'v1', credentials=credentials)
+            service = build_service('chat', 'v1', credentials)
             
             # Create the message
             message_body = {
@@ -103,10 +130,11 @@ class GoogleWorkspaceService:
             }
             
             # Send the message
-            result = service.spaces().messages().create(
-                parent=space_name,
-                body=message_body
-            ).execute()
+            with external_call():
+                result = service.spaces().messages().create(
+                    parent=space_name,
+                    body=message_body
+                ).execute()
             
             logger.info(f"Chat message sent successfully: {result.get('name')}")
             return True
@@ -119,12 +147,13 @@ class GoogleWorkspaceService:
         """Create a Google Calendar event"""
         try:
             credentials = self.refresh_credentials(credentials_dict)
-            service = build('calendar', 'v3', credentials=credentials)
+            service = build_service('calendar', 'v3', credentials)
             
-            event = service.events().insert(
-                calendarId='primary',
-                body=event_data
-            ).execute()
+            with external_call():
+                event = service.events().insert(
+                    calendarId='primary',
+                    body=event_data
+                ).execute()
             
             logger.info(f"Calendar event created: {event.get('id')}")
             return event.get('htmlLink')
@@ -137,7 +166,7 @@ class GoogleWorkspaceService:
         """Create a folder in Google Drive"""
         try:
             credentials = self.refresh_credentials(credentials_dict)
-            service = build('drive', 'v3', credentials=credentials)
+            service = build_service('drive', 'v3', credentials)
             
             folder_metadata = {
                 'name': folder_name,
@@ -147,10 +176,11 @@ class GoogleWorkspaceService:
             if parent_folder_id:
                 folder_metadata['parents'] = [parent_folder_id]
             
-            folder = service.files().create(
-                body=folder_metadata,
-                fields='id,name,webViewLink'
-            ).execute()
+            with external_call():
+                folder = service.files().create(
+                    body=folder_metadata,
+                    fields='id,name,webViewLink'
+                ).execute()
             
             logger.info(f"Drive folder created: {folder.get('name')} - {folder.get('id')}")
             return folder.get('webViewLink')
@@ -163,7 +193,7 @@ class GoogleWorkspaceService:
         """Send an email via Gmail"""
         try:
             credentials = self.refresh_credentials(credentials_dict)
-            service = build('gmail', 'v1', credentials=credentials)
+            service = build_service('gmail', 'v1', credentials)
             
             import base64
             from email.mime.text import MIMEText
@@ -174,10 +204,11 @@ class GoogleWorkspaceService:
             
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
             
-            result = service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
+            with external_call():
+                result = service.users().messages().send(
+                    userId='me',
+                    body={'raw': raw_message}
+                ).execute()
             
             logger.info(f"Gmail sent successfully: {result.get('id')}")
             return True
@@ -190,10 +221,11 @@ class GoogleWorkspaceService:
         """Get or create a Google Chat space"""
         try:
             credentials = self.refresh_credentials(credentials_dict)
-            service = build('chat', 'v1', credentials=credentials)
+            service = build_service('chat', 'v1', credentials)
             
             # List existing spaces
-            spaces = service.spaces().list().execute()
+            with external_call():
+                spaces = service.spaces().list().execute()
             
             # Look for existing space
             for space in spaces.get('spaces', []):
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Import-Time and Memory Profile
+Imports the API module in a fresh interpreter (exactly what each uvicorn
+worker does at startup) and reports how long that took, how much resident
+memory it added, and which packages account for it, so the per-worker
+cold-start cost can be tracked as worker counts grow
+
+Usage (from backend/):
+    python import_profile.py
+    python import_profile.py --top 20 --output import_profile.json
+    /entrypoint.sh --import-profile               # in the container: print the report and exit
+    IMPORT_PROFILE=true /entrypoint.sh            # log the report, then start as usual
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).parent
+
+# Run in the child interpreter: import the module and report wall time and RSS around it
+CHILD_SCRIPT = """
+import json, sys, time
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+rss_before = rss_kb()
+started = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - started
+print(json.dumps({
+    "seconds": seconds,
+    "rss_before_kb": rss_before,
+    "rss_after_kb": rss_kb(),
+    "modules_loaded": len(sys.modules),
+    "google_libraries_loaded": "googleapiclient" in sys.modules,
+}))
+"""
+
+# "import time:       914 |     173708 |   googleapiclient.discovery"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_import_times(stderr: str) -> List[Dict[str, Any]]:
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({
+                "module": name,
+                "depth": (len(indent) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+    return imports
+
+
+def get_direct_imports(imports: List[Dict[str, Any]], module: str) -> List[Dict[str, Any]]:
+    """Modules imported by the module itself. -X importtime lists children before their parent"""
+    children: List[Dict[str, Any]] = []
+    for entry in imports:
+        if entry["depth"] == 0:
+            if entry["module"] == module:
+                return children
+            children = []
+        elif entry["depth"] == 1:
+            children.append(entry)
+    return []
+
+
+def profile_import(module: str) -> Dict[str, Any]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    # server reads these at import time; importing doesn't connect
+    env.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    env.setdefault("DB_NAME", "import_profile")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT, module],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = parse_import_times(result.stderr)
+
+    # Self time summed per top-level package is what a lazy import would save
+    package_ms: Dict[str, float] = defaultdict(float)
+    for entry in imports:
+        package_ms[entry["module"].split(".")[0]] += entry["self_ms"]
+
+    report["packages"] = dict(sorted(package_ms.items(), key=lambda item: item[1], reverse=True))
+    report["direct_imports"] = sorted(get_direct_imports(imports, module), key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return report
+
+
+def print_report(module: str, report: Dict[str, Any], top: int):
+    rss_added_mb = (report["rss_after_kb"] - report["rss_before_kb"]) / 1024
+    print(f"📦 import {module}: {report['seconds'] * 1000:.0f} ms, +{rss_added_mb:.1f} MB RSS "
+          f"({report['rss_after_kb'] / 1024:.1f} MB total), {report['modules_loaded']} modules")
+    print(f"   Google client libraries loaded: {'yes ⚠️' if report['google_libraries_loaded'] else 'no'}")
+
+    print(f"\n   {'package':<32} {'self ms':>9}")
+    for package, ms in list(report["packages"].items())[:top]:
+        print(f"   {package:<32} {ms:>9.1f}")
+
+    print(f"\n   {'imported by ' + module:<32} {'cumulative ms':>14}")
+    for entry in report["direct_imports"][:top]:
+        print(f"   {entry['module']:<32} {entry['cumulative_ms']:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the import time and memory cost of the API module")
+    parser.add_argument("--module", default="server", help="Module to import (default: server)")
+    parser.add_argument("--top", type=int, default=10, help="Rows per table")
+    parser.add_argument("--output", help="Also write the full report here as JSON")
+    args = parser.parse_args()
+
+    report = profile_import(args.module)
+    print_report(args.module, report, args.top)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n✅ Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from worker_bus import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+LEASE_COLLECTION = "leader_leases"
+LEASE_SECONDS = 30  # A leader that dies is replaced within this long
+
+
+class LeaderLease:
+    """A named lease in Mongo held by at most one worker at a time.
+
+    The holder renews it well before it expires; if it stops renewing (crash,
+    hang, lost connection) anyone may take it over once it has expired.
+    """
+
+    def __init__(self, db, name: str, holder: str = WORKER_ID, lease_seconds: float = LEASE_SECONDS):
+        self.collection = db[LEASE_COLLECTION]
+        self.name = name
+        self.holder = holder
+        self.lease_seconds = lease_seconds
+
+    async def try_acquire(self) -> bool:
+        """Take or renew the lease. False while another holder's lease is still valid"""
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": self.name, "$or": [{"holder": self.holder}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": self.holder, "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # The lease exists and is someone else's; the upsert tried to insert a second one
+            return False
+
+    async def release(self) -> None:
+        await self.collection.delete_one({"_id": self.name, "holder": self.holder})
+
+
+async def run_as_leader(
+    db,
+    name: str,
+    job: Callable[[], Awaitable[None]],
+    lease_seconds: float = LEASE_SECONDS,
+    holder: str = WORKER_ID
+) -> None:
+    """Background loop: run `job` only while this worker holds the `name` lease.
+
+    Every worker runs this; the leader runs the job, the others keep trying
+    to take over. A leader that can't renew stops the job before its lease
+    can expire, so two copies never overlap for long.
+    """
+    lease = LeaderLease(db, name, holder=holder, lease_seconds=lease_seconds)
+    job_task: Optional[asyncio.Task] = None
+    try:
+        while True:
+            try:
+                leader = await asyncio.wait_for(lease.try_acquire(), lease_seconds / 3)
+            except Exception as e:
+                logger.error(f"Error renewing the {name} lease: {e}")
+                leader = False
+
+            if job_task is not None and job_task.done():
+                if not job_task.cancelled() and job_task.exception():
+                    logger.error(f"{name} stopped with an error, restarting: {job_task.exception()}")
+                job_task = None
+
+            if leader and job_task is None:
+                logger.info(f"Worker {lease.holder} is now the {name} leader")
+                job_task = asyncio.create_task(job())
+            elif not leader and job_task is not None:
+                logger.info(f"Worker {lease.holder} lost the {name} lease; stopping")
+                job_task.cancel()
+                job_task = None
+
+            await asyncio.sleep(lease_seconds / 3)
+    finally:
+        if job_task is not None:
+            job_task.cancel()
+            # Hand over right away instead of making the next leader wait out the lease
+            try:
+                await lease.release()
+            except Exception as e:
+                logger.error(f"Error releasing the {name} lease: {e}")
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from typing import Optional
+
+from metrics import LOOP_LAG, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_INTERVAL_SECONDS = 0.1
+# A stall longer than this gets the blocked thread's stack logged
+LOOP_LAG_THRESHOLD_MS = float(os.environ.get('LOOP_LAG_THRESHOLD_MS', 250))
+STACK_DEPTH = 25  # Innermost frames; the framework frames above them are always the same
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up and catches whoever is blocking it.
+
+    A coroutine sleeps for a fixed interval and records how much longer than
+    that it actually took (the lag). A watchdog thread checks the coroutine's
+    heartbeat; if it stops for longer than the threshold the loop is stuck in
+    synchronous code, and the thread logs that code's current stack while it
+    is still running, so the culprit shows up by name.
+    """
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL_SECONDS, threshold_ms: float = LOOP_LAG_THRESHOLD_MS):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.heartbeat = time.perf_counter()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.stopped = threading.Event()
+
+    async def run(self) -> None:
+        """Background loop; the watchdog thread runs for as long as this task does"""
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.perf_counter()
+        self.stopped.clear()
+        watchdog = threading.Thread(target=self.watch, name="loop-lag-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                started = time.perf_counter()
+                await asyncio.sleep(self.interval)
+                self.heartbeat = time.perf_counter()
+                LOOP_LAG.observe(max(0.0, self.heartbeat - started - self.interval))
+        finally:
+            self.stopped.set()
+
+    def watch(self) -> None:
+        reported = False
+        while not self.stopped.wait(self.interval):
+            blocked_for = time.perf_counter() - self.heartbeat - self.interval
+            if blocked_for < self.threshold:
+                reported = False
+                continue
+            # One report per stall, taken while the blocking call is still on the stack
+            if not reported:
+                reported = True
+                LOOP_STALLS.inc()
+                self.report(blocked_for)
+
+    def report(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH)) if frame else "(stack unavailable)\n"
+        task = asyncio.current_task(self.loop) if self.loop else None
+        task_name = task.get_name() if task else "no task (loop callback)"
+        if task:
+            coro = task.get_coro()
+            task_name = f"{task_name} ({getattr(coro, '__qualname__', coro)})"
+        logger.warning(
+            f"Event loop blocked for {blocked_for * 1000:.0f}ms+ in {task_name}. Blocking stack:\n{stack}"
+        )
+
+
+# Global instance
+loop_monitor = LoopLagMonitor()
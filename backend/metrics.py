@@ -0,0 +1,225 @@
+import time
+import threading
+import logging
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labelnames: Sequence[str], values: Sequence[str]) -> str:
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(labelnames, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(ABC):
+    """A metric family in the Prometheus text format. Updates are thread safe, since
+    pymongo reports commands from Motor's worker threads"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"] + self.samples()
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines, one per label set (and bucket)"""
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            return [f"{self.name}{format_labels(self.labelnames, labels)} {value}" for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, *labels: str) -> None:
+        self.inc(-amount, *labels)
+
+    @contextmanager
+    def track_in_progress(self, *labels: str):
+        self.inc(1, *labels)
+        try:
+            yield
+        finally:
+            self.dec(1, *labels)
+
+
+class CallbackGauge(Metric):
+    """A gauge read from the application when scraped, e.g. a queue length"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {self.callback()}"]
+        except Exception as e:
+            logger.error(f"Error reading metric {self.name}: {e}")
+            return []
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts, +Inf count, sum)
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * len(self.buckets), 0, 0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self.lock:
+            for labels, (bucket_counts, count, total) in self.values.items():
+                bucket_labelnames = self.labelnames + ("le",)
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(f"{self.name}_bucket{format_labels(bucket_labelnames, labels + (str(bound),))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{format_labels(bucket_labelnames, labels + ('+Inf',))} {count}")
+                lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {count}")
+                lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {total}")
+        return lines
+
+
+registry: List[Metric] = []
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ["collection", "command"], buckets=MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter("mongodb_command_failures_total", "MongoDB commands that failed", ["collection", "command"])
+BCRYPT_DURATION = Histogram("bcrypt_duration_seconds", "Time spent hashing or checking passwords", ["operation"])
+BCRYPT_IN_PROGRESS = Gauge("bcrypt_operations_in_progress", "Password hashes currently being computed")
+NOTIFICATION_DURATION = Histogram("notification_duration_seconds", "Time spent sending Slack notifications", ["outcome"])
+NOTIFICATIONS_IN_PROGRESS = Gauge("notifications_in_progress", "Slack notifications currently being sent")
+UPLOAD_BYTES = Counter("upload_bytes_total", "Attachment bytes received", ["kind"])
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+LOOP_STALLS = Counter("event_loop_stalls_total", "Times the event loop was blocked past LOOP_LAG_THRESHOLD_MS")
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every command Motor sends, labelled by collection and command name"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # The succeeded/failed events don't carry the command, so remember its collection
+        self.collections: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.command.get("collection", "")
+        with self.lock:
+            self.collections[(event.connection_id, event.request_id)] = str(collection)
+
+    def _collection(self, event) -> str:
+        with self.lock:
+            return self.collections.pop((event.connection_id, event.request_id), "")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1_000_000, self._collection(event), event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collection(event)
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1_000_000, collection, event.command_name)
+        MONGO_COMMAND_FAILURES.inc(1, collection, event.command_name)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template (not per URL) and status"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope; unmatched paths share
+            # one label so scanners can't blow up the series count
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code)
+            )
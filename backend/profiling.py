@@ -0,0 +1,181 @@
+import gzip
+import time
+import uuid
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+PROFILE_HEADER = b"x-profile-request"
+PROFILE_ID_HEADER = b"x-profile-id"
+SAMPLING_INTERVAL_SECONDS = 0.001
+MAX_TRIGGER_COUNT = 50
+
+
+@dataclass
+class ProfilingTrigger:
+    """Profile the next `remaining` requests whose path starts with `path_prefix`"""
+    path_prefix: str
+    remaining: int
+    expires_at: datetime
+    requested_by: str  # User ID
+    method: Optional[str] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    def matches(self, method: str, path: str) -> bool:
+        return (
+            self.remaining > 0
+            and datetime.utcnow() < self.expires_at
+            and path.startswith(self.path_prefix)
+            and (self.method is None or self.method == method)
+        )
+
+
+class ProfilingController:
+    """Armed triggers for this worker. Nothing is profiled while the list is empty.
+
+    With several workers, `relay` forwards arm, disarm and claim to the
+    others (applied there by `apply_remote`), so a trigger armed on one
+    worker catches requests on all of them and `count` stays roughly global.
+    """
+
+    def __init__(self):
+        self.triggers: List[ProfilingTrigger] = []
+        self.relay: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def _relay(self, message: Dict[str, Any]) -> None:
+        if self.relay:
+            self.relay(message)
+
+    def arm(self, path_prefix: str, count: int, expires_minutes: float, requested_by: str, method: Optional[str] = None) -> ProfilingTrigger:
+        trigger = ProfilingTrigger(
+            path_prefix=path_prefix,
+            remaining=min(count, MAX_TRIGGER_COUNT),
+            expires_at=datetime.utcnow() + timedelta(minutes=expires_minutes),
+            requested_by=requested_by,
+            method=method.upper() if method else None
+        )
+        self.triggers.append(trigger)
+        self._relay({"action": "arm", "trigger": asdict(trigger)})
+        return trigger
+
+    def disarm(self) -> None:
+        self.triggers.clear()
+        self._relay({"action": "disarm"})
+
+    def claim(self, method: str, path: str) -> Optional[ProfilingTrigger]:
+        """Take one profiling slot for this request, dropping used up or expired triggers"""
+        self.triggers = [t for t in self.triggers if t.remaining > 0 and datetime.utcnow() < t.expires_at]
+        for trigger in self.triggers:
+            if trigger.matches(method, path):
+                trigger.remaining -= 1
+                self._relay({"action": "claim", "trigger_id": trigger.id})
+                return trigger
+        return None
+
+    def apply_remote(self, message: Dict[str, Any]) -> None:
+        """Replay an arm, disarm or claim made on another worker"""
+        action = message.get("action")
+        if action == "arm":
+            if not any(t.id == message["trigger"]["id"] for t in self.triggers):
+                self.triggers.append(ProfilingTrigger(**message["trigger"]))
+        elif action == "disarm":
+            self.triggers.clear()
+        elif action == "claim":
+            for trigger in self.triggers:
+                if trigger.id == message.get("trigger_id"):
+                    trigger.remaining -= 1
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under pyinstrument and hands the speedscope profile to `save`.
+
+    A request is profiled when an armed trigger matches it, or when a super
+    admin sends "X-Profile-Request: true" (checked by `authorize`). With no
+    triggers and no header the request goes straight through.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: ProfilingController,
+        authorize: Callable[[Optional[str]], Awaitable[Optional[str]]],
+        save: Callable[[Dict[str, Any]], Awaitable[None]]
+    ):
+        self.app = app
+        self.controller = controller
+        self.authorize = authorize
+        self.save = save
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PYINSTRUMENT_AVAILABLE:
+            await self.app(scope, receive, send)
+            return
+
+        # The disabled path: no armed triggers and no profiling header
+        if not self.controller.triggers and not any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+
+        source = requested_by = None
+        if headers.get(PROFILE_HEADER, b"").lower() == b"true":
+            authorization = headers.get(b"authorization", b"").decode()
+            requested_by = await self.authorize(authorization.removeprefix("Bearer ").strip() or None)
+            source = "header" if requested_by else None
+        if source is None:
+            trigger = self.controller.claim(scope["method"], scope["path"])
+            if trigger:
+                source, requested_by = "trigger", trigger.requested_by
+        if source is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        profiler = Profiler(interval=SAMPLING_INTERVAL_SECONDS, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            try:
+                speedscope = SpeedscopeRenderer().render(profiler.last_session)
+                await self.save({
+                    "id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 1),
+                    "source": source,
+                    "requested_by": requested_by,
+                    "created_at": datetime.utcnow(),
+                    "speedscope_gzip": gzip.compress(speedscope.encode()),
+                })
+                logger.info(f"Profiled {scope['method']} {scope['path']} ({duration_ms:.0f}ms) as {profile_id}")
+            except Exception as e:
+                logger.error(f"Error saving profile for {scope['path']}: {e}")
+
+
+# Global instance
+profiling_controller = ProfilingController()
@@ -0,0 +1,157 @@
+import os
+import re
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from typing import Optional
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this are logged with their DB and external call breakdown (0 disables)
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 1000))
+# Requests running more DB commands than this are logged with a per-collection breakdown,
+# however fast they were: a query per item (N+1) is slow once the list grows (0 disables)
+SLOW_REQUEST_DB_COMMANDS = int(os.environ.get('SLOW_REQUEST_DB_COMMANDS', 50))
+
+# ?token=<JWT>: EventSource can't send an Authorization header, so /stream takes it in the URL
+TOKEN_QUERY_PARAM = re.compile(r"(?<=[?&])(token=)[^&]*")
+
+
+class RequestStats:
+    """What one request spent its time on. Motor runs commands on worker threads
+    (with a copy of the request's context), so updates take a lock"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.db_commands = 0
+        self.db_commands_by_collection: Counter = Counter()  # "clients.find" -> count
+        self.db_seconds = 0.0
+        self.external_calls = 0
+        self.external_seconds = 0.0
+
+    def add_db_command(self, collection: str, command_name: str) -> None:
+        with self.lock:
+            self.db_commands += 1
+            self.db_commands_by_collection[f"{collection}.{command_name}"] += 1
+
+    def add_db_seconds(self, seconds: float) -> None:
+        with self.lock:
+            self.db_seconds += seconds
+
+    def add_external_call(self, seconds: float) -> None:
+        with self.lock:
+            self.external_calls += 1
+            self.external_seconds += seconds
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f'db;desc="MongoDB ({self.db_commands} commands)";dur={self.db_seconds * 1000:.1f}',
+            f'ext;desc="External HTTP ({self.external_calls} calls)";dur={self.external_seconds * 1000:.1f}',
+            f'total;dur={self.elapsed_seconds * 1000:.1f}',
+        ])
+
+    def db_command_breakdown(self) -> str:
+        with self.lock:
+            return ", ".join(f"{name} x{count}" for name, count in self.db_commands_by_collection.most_common())
+
+
+class AccessLogTokenFilter(logging.Filter):
+    """Redacts ?token= values from uvicorn's access log ("uvicorn.access"),
+    whose record args are (client, method, path with query, http version, status)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple) and len(record.args) > 2 and isinstance(record.args[2], str):
+            path = TOKEN_QUERY_PARAM.sub(r"\1[redacted]", record.args[2])
+            record.args = record.args[:2] + (path,) + record.args[3:]
+        return True
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def external_call():
+    """Count a call to a third-party HTTP API (Slack, Google) against the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = request_stats.get()
+        if stats is not None:
+            stats.add_external_call(time.perf_counter() - started)
+
+
+class RequestStatsListener(monitoring.CommandListener):
+    """Adds every Mongo command (and its duration) to the request that issued it"""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        stats = request_stats.get()
+        if stats is not None:
+            # The collection is the command's value, e.g. {"find": "clients"}; getMore names it separately
+            collection = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+            stats.add_db_command(collection if isinstance(collection, str) else event.database_name, event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        stats = request_stats.get()
+        if stats is not None:
+            stats.add_db_seconds(event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self.succeeded(event)
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware adding a Server-Timing header and logging slow or DB-chatty requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        event_stream = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, event_stream
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                event_stream = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", [])
+                )
+                # Streaming responses send headers first, so their totals only cover the work done so far
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", stats.server_timing().encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.reset(token)
+            elapsed_ms = stats.elapsed_seconds * 1000
+            # /stream connections are meant to stay open
+            if SLOW_REQUEST_THRESHOLD_MS and elapsed_ms > SLOW_REQUEST_THRESHOLD_MS and not event_stream:
+                logger.warning(
+                    f"Slow request {scope['method']} {scope['path']} -> {status_code} took {elapsed_ms:.0f}ms "
+                    f"(db: {stats.db_commands} commands / {stats.db_seconds * 1000:.0f}ms, "
+                    f"external: {stats.external_calls} calls / {stats.external_seconds * 1000:.0f}ms)"
+                )
+            if SLOW_REQUEST_DB_COMMANDS and stats.db_commands > SLOW_REQUEST_DB_COMMANDS and not event_stream:
+                logger.warning(
+                    f"Request {scope['method']} {scope['path']} -> {status_code} ran {stats.db_commands} DB commands "
+                    f"in {elapsed_ms:.0f}ms, likely a query per item: {stats.db_command_breakdown()}"
+                )
@@ -0,0 +1,133 @@
+import re
+import html
+import logging
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_NAME = "client_search"
+
+# Searched fields and their weights: a company or contact match outranks a passing mention in a note.
+# "notes" covers legacy plain-string notes, "notes.text" the structured ones
+SEARCH_FIELDS = {
+    "company_name": 10,
+    "contact_person": 5,
+    "requirements": 2,
+    "decision_maker_details": 2,
+    "notes": 1,
+    "notes.text": 1,
+    "attachments.original_filename": 1,
+    "notes.attachments.original_filename": 1,
+}
+
+SNIPPET_RADIUS = 60  # Characters of context either side of the first match
+MAX_HIGHLIGHTS = 5
+
+# Only what results and highlighting need, not the whole client
+SEARCH_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "company_name": 1,
+    "contact_person": 1,
+    "requirements": 1,
+    "decision_maker_details": 1,
+    "stage": 1,
+    "assigned_bde": 1,
+    "is_dropped": 1,
+    "notes": 1,
+    "attachments.original_filename": 1,
+}
+
+
+def get_search_index() -> Tuple[List[Tuple[str, str]], Dict[str, Any]]:
+    """Keys and options of the clients text index, in the shape ensure_indexes expects"""
+    keys = [(field, "text") for field in SEARCH_FIELDS]
+    return keys, {"name": SEARCH_INDEX_NAME, "weights": SEARCH_FIELDS, "default_language": "english"}
+
+
+def parse_search_terms(query: str) -> List[str]:
+    """Words and quoted phrases of a $text query, minus negated ones, for highlighting"""
+    phrases = re.findall(r'"([^"]+)"', query)
+    words = [word for word in re.sub(r'"[^"]*"', " ", query).split() if not word.startswith("-")]
+    return [term for term in phrases + words if term.strip()]
+
+
+def iter_field_values(doc: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(field, text) pairs for every searched value of a client document"""
+    for field in ("company_name", "contact_person", "requirements", "decision_maker_details"):
+        if isinstance(doc.get(field), str):
+            yield field, doc[field]
+    for note in doc.get("notes", []):
+        if isinstance(note, str):
+            yield "notes.text", note
+            continue
+        if isinstance(note.get("text"), str):
+            yield "notes.text", note["text"]
+        for attachment in note.get("attachments", []):
+            yield "notes.attachments.original_filename", attachment.get("original_filename", "")
+    for attachment in doc.get("attachments", []):
+        yield "attachments.original_filename", attachment.get("original_filename", "")
+
+
+def make_snippet(text: str, pattern: re.Pattern) -> str:
+    """HTML-escaped excerpt around the first match with every match wrapped in <mark>"""
+    first = pattern.search(text)
+    start = max(0, first.start() - SNIPPET_RADIUS)
+    end = min(len(text), first.end() + SNIPPET_RADIUS)
+    excerpt = text[start:end]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        position = match.end()
+    parts.append(html.escape(excerpt[position:]))
+
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+class ClientSearch:
+    """Relevance-ranked client search on the Mongo text index.
+
+    Kept behind this class so a dedicated search engine can replace the
+    text index without touching the route.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def search(self, query: str, scope: Dict[str, Any], skip: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Total number of matches and one page of matching clients, best first"""
+        text_query = {**scope, "$text": {"$search": query}}
+        total = await self.db.clients.count_documents(text_query)
+        if total <= skip:
+            return total, []
+
+        cursor = self.db.clients.find(
+            text_query,
+            {**SEARCH_PROJECTION, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).skip(skip).limit(limit)
+        return total, await cursor.to_list(limit)
+
+    def highlight(self, doc: Dict[str, Any], query: str) -> List[Dict[str, str]]:
+        """Snippets of the fields that matched.
+
+        The text index matches stemmed words, so a term is highlighted
+        wherever a word starts with it ("deploy" marks "deployment").
+        """
+        terms = parse_search_terms(query)
+        if not terms:
+            return []
+        pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\w*",
+            re.IGNORECASE
+        )
+
+        highlights = []
+        for field, text in iter_field_values(doc):
+            if text and pattern.search(text):
+                highlights.append({"field": field, "snippet": make_snippet(text, pattern)})
+                if len(highlights) >= MAX_HIGHLIGHTS:
+                    break
+        return highlights
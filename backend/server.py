@@ -1,17 +1,25 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response, Header
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
-import shutil
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Tuple, AsyncIterator
+import re
 import uuid
+import hashlib
+import base64
+import json
+import zipfile
+import calendar
 from datetime import datetime, timedelta
+import asyncio
+import socket
 import bcrypt
 from jose import JWTError, jwt
 from enum import Enum
@@ -19,9 +27,16 @@ from enum import Enum
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+from metrics import (
+    MongoCommandListener, MetricsMiddleware, CallbackGauge, render_metrics, PROMETHEUS_CONTENT_TYPE,
+    BCRYPT_DURATION, BCRYPT_IN_PROGRESS, NOTIFICATION_DURATION, NOTIFICATIONS_IN_PROGRESS, UPLOAD_BYTES
+)
+
+from request_context import AccessLogTokenFilter, RequestStatsListener, RequestTimingMiddleware, external_call
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandListener(), RequestStatsListener()])
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
@@ -41,19 +56,31 @@ STAGES = {
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
-
-# Import Google services after loading env
-try:
-    import sys
-    sys.path.append(str(ROOT_DIR))
-    from google_services import google_service
-    GOOGLE_ENABLED = True
-    print("Google services loaded successfully")
-except ImportError as e:
-    print(f"Google services not available: {e}")
-    GOOGLE_ENABLED = False
+optional_security = HTTPBearer(auto_error=False)
+
+# Import Google services after loading env. The client libraries themselves
+# load on first use, so workers that never talk to Google never pay for them
+import sys
+sys.path.append(str(ROOT_DIR))
+from google_services import google_service, GOOGLE_LIBRARIES_AVAILABLE
+GOOGLE_ENABLED = GOOGLE_LIBRARIES_AVAILABLE
+if GOOGLE_ENABLED:
+    print("Google services available (client libraries load on first use)")
+else:
+    print("Google services not available: client libraries not installed")
     google_service = None
 
+from thumbnails import thumbnail_service, get_thumbnail_key, can_generate_thumbnail, PIL_AVAILABLE
+from storage import create_storage_from_env, InvalidStorageKey
+from upload_gc import UploadGarbageCollector, DEFAULT_GRACE_PERIOD_HOURS
+from fast_json import FAST_JSON_ENABLED, stream_json_array
+from events import event_broker, HEARTBEAT_INTERVAL_SECONDS
+from search import ClientSearch, get_search_index
+from profiling import ProfilingMiddleware, profiling_controller, PYINSTRUMENT_AVAILABLE
+from loop_monitor import loop_monitor
+from worker_bus import worker_bus
+from leader_election import LeaderLease, run_as_leader
+
 # Enums
 class UserRole(str, Enum):
     SUPER_ADMIN = "super_admin"
@@ -138,6 +165,7 @@ class Client(BaseModel):
     attachments: List[FileAttachment] = []  # Client-level attachments
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_interaction: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)  # Any write, used by /sync
     is_dropped: bool = False
     drop_reason: Optional[str] = None
 
@@ -174,12 +202,17 @@ class ClientUpdate(BaseModel):
     decision_maker_details: Optional[str] = None
     stage: Optional[ClientStage] = None
     assigned_bde: Optional[str] = None
+    is_dropped: Optional[bool] = None
+    drop_reason: Optional[str] = None
     notes: Optional[List[NoteWithAttachment]] = None  # Updated
 
 # File upload configuration
 UPLOAD_DIRECTORY = Path(__file__).parent / "uploads"
 UPLOAD_DIRECTORY.mkdir(exist_ok=True)
 
+# Local disk by default; set ATTACHMENT_STORAGE=s3 to share files between API nodes
+attachment_storage = create_storage_from_env(UPLOAD_DIRECTORY)
+
 ALLOWED_FILE_TYPES = {
     # Images
     "image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp",
@@ -210,14 +243,13 @@ async def save_uploaded_file(file: UploadFile, user_id: str) -> FileAttachment:
     # Generate unique filename
     file_extension = Path(file.filename).suffix
     unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIRECTORY / unique_filename
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file (streamed, so large files are never held in memory)
+    file_size = await attachment_storage.save(unique_filename, file.file, file.content_type)
+    UPLOAD_BYTES.inc(file_size, "direct")
     
-    # Get file size
-    file_size = file_path.stat().st_size
+    # Render the preview in the background so the upload response isn't delayed
+    thumbnail_service.schedule(attachment_storage, unique_filename, file.content_type)
     
     return FileAttachment(
         filename=unique_filename,
@@ -227,6 +259,48 @@ async def save_uploaded_file(file: UploadFile, user_id: str) -> FileAttachment:
         uploaded_by=user_id
     )
 
+# Resumable (chunked) uploads
+PARTIAL_UPLOAD_DIRECTORY = UPLOAD_DIRECTORY / ".partial"
+PARTIAL_UPLOAD_DIRECTORY.mkdir(exist_ok=True)
+UPLOAD_SESSION_EXPIRE_HOURS = 24
+# How long a chunk request may hold a session's write claim; a worker that dies
+# mid-chunk blocks retries of that session for at most this long
+UPLOAD_WRITE_LEASE_SECONDS = 300
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    file_type: str
+    total_size: int
+
+class UploadSession(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    filename: str  # Final unique filename (storage key)
+    original_filename: str
+    file_type: str
+    total_size: int
+    offset: int = 0
+    user_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(hours=UPLOAD_SESSION_EXPIRE_HOURS))
+
+def get_partial_upload_path(session_id: str) -> Path:
+    return PARTIAL_UPLOAD_DIRECTORY / f"{session_id}.part"
+
+def open_partial_upload(session_id: str, offset: int):
+    """Open the partial file for writing at the committed offset.
+    
+    Bytes past it are from a chunk that failed (or a worker that died) before
+    the offset was committed, and are overwritten.
+    """
+    partial_path = get_partial_upload_path(session_id)
+    if (partial_path.stat().st_size if partial_path.exists() else 0) < offset:
+        # Partial files live on one host's disk; this one doesn't have the bytes
+        return None
+    buffer = open(partial_path, "r+b")
+    buffer.truncate(offset)
+    buffer.seek(offset)
+    return buffer
+
 class Task(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
@@ -237,6 +311,7 @@ class Task(BaseModel):
     deadline: datetime
     status: str = "pending"  # pending, done, overdue
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)  # Any write, used by /sync
 
 class TaskCreate(BaseModel):
     title: str
@@ -257,12 +332,114 @@ class DashboardStats(BaseModel):
     pending_tasks: int
     overdue_tasks: int
 
+class ClientSuggestion(BaseModel):
+    client_id: str
+    company_name: str
+    value: str
+
+class ClientSuggestions(BaseModel):
+    companies: List[ClientSuggestion]
+    contacts: List[ClientSuggestion]
+    emails: List[ClientSuggestion]
+
+class SearchHighlight(BaseModel):
+    field: str
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+
+class SearchResult(BaseModel):
+    client_id: str
+    company_name: str
+    contact_person: Optional[str] = None
+    stage: ClientStage
+    assigned_bde: Optional[str] = None
+    is_dropped: bool = False
+    score: float
+    highlights: List[SearchHighlight]
+
+class SearchResults(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    results: List[SearchResult]
+
+class FacetValue(BaseModel):
+    value: Any
+    label: Optional[str] = None
+    count: int
+
+class ClientFacets(BaseModel):
+    stages: List[FacetValue]
+    industries: List[FacetValue]
+    sources: List[FacetValue]
+    company_sizes: List[FacetValue]
+    bdes: List[FacetValue]
+
+class ProfilingTriggerCreate(BaseModel):
+    path_prefix: str  # e.g. /api/dashboard/stats
+    method: Optional[str] = None
+    count: int = 1
+    expires_minutes: float = 30
+
+class Bootstrap(BaseModel):
+    user: User
+    stats: DashboardStats
+    users: Optional[List[User]] = None  # Admins only
+    bdes: List[User]
+
+class BoardCard(BaseModel):
+    id: str
+    company_name: str
+    contact_person: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    industry: Optional[str] = None
+    budget: Optional[float] = None
+    budget_currency: str = "USD"
+    stage: ClientStage
+    assigned_bde: Optional[str] = None
+    created_at: Optional[datetime] = None
+    last_interaction: Optional[datetime] = None
+    is_dropped: bool = False
+    notes_count: int = 0
+    attachments_count: int = 0
+
+class BoardColumn(BaseModel):
+    stage: ClientStage
+    name: str
+    count: int
+    cards: List[BoardCard]
+    next_cursor: Optional[str] = None
+
+class Board(BaseModel):
+    columns: List[BoardColumn]
+
+class StageChange(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_id: str
+    from_stage: Optional[ClientStage] = None
+    to_stage: ClientStage
+    changed_by: str  # User ID
+    changed_by_name: str
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
+class TimelineEvent(BaseModel):
+    id: str
+    type: str  # created, stage_change, note, attachment, task
+    timestamp: datetime
+    data: Dict[str, Any]
+
+class Timeline(BaseModel):
+    events: List[TimelineEvent]
+    next_cursor: Optional[str] = None
+
 # Utility functions
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    with BCRYPT_IN_PROGRESS.track_in_progress(), BCRYPT_DURATION.time("hash"):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    with BCRYPT_IN_PROGRESS.track_in_progress(), BCRYPT_DURATION.time("verify"):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 def create_token(data: dict):
     to_encode = data.copy()
@@ -270,9 +447,8 @@ def create_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_user_from_token(token: str) -> User:
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
@@ -286,6 +462,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     
     return User(**user_doc)
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await get_user_from_token(credentials.credentials)
+
+def fast_json_list_response(cursor, model):
+    """Stream a list of trusted DB documents as JSON, bypassing response_model re-validation"""
+    return StreamingResponse(stream_json_array(cursor, model), media_type="application/json")
+
 def check_permissions(required_roles: List[UserRole]):
     def decorator(current_user: User = Depends(get_current_user)):
         if current_user.role not in required_roles:
@@ -293,6 +476,48 @@ def check_permissions(required_roles: List[UserRole]):
         return current_user
     return decorator
 
+# Conditional GET support: every write bumps a per-collection counter, so a
+# read can tell whether anything changed without touching the data itself
+COLLECTION_VERSIONS_ID = "collection_versions"
+
+async def bump_collection_versions(*collections: str):
+    """Call after a write to clients/tasks/users completes"""
+    await db.meta.update_one(
+        {"_id": COLLECTION_VERSIONS_ID},
+        {"$inc": {collection: 1 for collection in collections}},
+        upsert=True
+    )
+
+async def get_collection_versions() -> Dict[str, int]:
+    versions_doc = await db.meta.find_one({"_id": COLLECTION_VERSIONS_ID}) or {}
+    return {k: v for k, v in versions_doc.items() if k != "_id"}
+
+async def get_etag(scope: str, current_user: User, collections: List[str], *extra) -> str:
+    """Weak ETag from the collection counters plus who is asking (BDEs see a filtered view)"""
+    versions = await get_collection_versions()
+    parts = [scope, current_user.id, current_user.role.value]
+    parts += [f"{collection}:{versions.get(collection, 0)}" for collection in collections]
+    parts += [str(part) for part in extra]
+    return 'W/"' + hashlib.sha1("|".join(parts).encode()).hexdigest()[:20] + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+def set_etag_headers(response: Response, etag: str):
+    # no-cache lets the browser keep the body but revalidate it on every request
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
 # Authentication Routes
 @api_router.get("/")
 async def root():
@@ -315,6 +540,7 @@ async def register(user_data: UserCreate, current_user: User = Depends(check_per
     user = User(**{k: v for k, v in user_dict.items() if k != "password"})
     
     await db.users.insert_one({**user.dict(), "password": user_dict["password"]})
+    await bump_collection_versions("users")
     return user
 
 @api_router.post("/auth/login", response_model=Token)
@@ -347,6 +573,7 @@ async def init_super_admin():
         **super_admin.dict(),
         "password": hash_password("admin123")
     })
+    await bump_collection_versions("users")
     
     return {"message": "Super admin created", "email": "admin@crm.com", "password": "admin123"}
 
@@ -357,7 +584,9 @@ async def create_client(client_data: ClientCreate, current_user: User = Depends(
     client_dict = client_data.dict()
     client_dict["created_by"] = current_user.id  # Set created_by to current user
     client = Client(**client_dict)
-    await db.clients.insert_one(client.dict())
+    await db.clients.insert_one({**client.dict(), **get_suggest_fields(client.dict())})
+    await bump_collection_versions("clients")
+    publish_client_event("client.created", client.dict())
     
     # Send notification
     await send_notification(f"🎉 New client added: {client.company_name} by {current_user.name}")
@@ -365,7 +594,11 @@ async def create_client(client_data: ClientCreate, current_user: User = Depends(
     return client
 
 @api_router.get("/clients", response_model=List[Client])
-async def get_clients(current_user: User = Depends(get_current_user)):
+async def get_clients(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    etag = await get_etag("clients", current_user, ["clients"])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
     query = {}
     
     # BDE can only see their clients
@@ -373,22 +606,196 @@ async def get_clients(current_user: User = Depends(get_current_user)):
         query["assigned_bde"] = current_user.id
     
     # Sort by created_at descending (latest first)
+    if FAST_JSON_ENABLED:
+        fast_response = fast_json_list_response(db.clients.find(query, {"_id": 0}).sort("created_at", -1).limit(1000), Client)
+        set_etag_headers(fast_response, etag)
+        return fast_response
+    
     clients = await db.clients.find(query).sort("created_at", -1).to_list(1000)
+    set_etag_headers(response, etag)
     return [Client(**client) for client in clients]
 
+# Type-ahead: lowercase copies of the suggested fields, so an anchored prefix
+# regex can be answered from an index instead of scanning every client
+SUGGEST_FIELDS = {
+    "company_name": "company_name_lower",
+    "contact_person": "contact_person_lower",
+    "email": "email_lower"
+}
+SUGGEST_DEFAULT_LIMIT = 5
+SUGGEST_MAX_LIMIT = 20
+
+def get_suggest_fields(doc: dict) -> dict:
+    """Normalized prefix fields for whichever suggested fields the document sets"""
+    return {
+        lower_field: doc[field].strip().lower()
+        for field, lower_field in SUGGEST_FIELDS.items()
+        if isinstance(doc.get(field), str)
+    }
+
+@api_router.get("/clients/suggest", response_model=ClientSuggestions)
+async def suggest_clients(q: str, limit: int = SUGGEST_DEFAULT_LIMIT, current_user: User = Depends(get_current_user)):
+    """Companies, contacts and emails starting with `q`"""
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+    prefix = q.strip().lower()
+    if not prefix:
+        return ClientSuggestions(companies=[], contacts=[], emails=[])
+    
+    query = {}
+    
+    # BDE can only see their clients
+    if current_user.role == UserRole.BDE:
+        query["assigned_bde"] = current_user.id
+    
+    async def suggest(field: str) -> List[ClientSuggestion]:
+        lower_field = SUGGEST_FIELDS[field]
+        docs = await db.clients.find(
+            {**query, lower_field: {"$regex": f"^{re.escape(prefix)}"}},
+            {"_id": 0, "id": 1, "company_name": 1, field: 1}
+        ).sort(lower_field, 1).limit(limit).to_list(limit)
+        return [ClientSuggestion(client_id=doc["id"], company_name=doc["company_name"], value=doc[field]) for doc in docs]
+    
+    companies, contacts, emails = await asyncio.gather(
+        suggest("company_name"),
+        suggest("contact_person"),
+        suggest("email")
+    )
+    return ClientSuggestions(companies=companies, contacts=contacts, emails=emails)
+
+SEARCH_DEFAULT_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+@api_router.get("/search", response_model=SearchResults)
+async def search(
+    q: str,
+    page: int = 1,
+    page_size: int = SEARCH_DEFAULT_PAGE_SIZE,
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over clients, their notes and attachment filenames, best match first"""
+    page = max(1, page)
+    page_size = max(1, min(page_size, SEARCH_MAX_PAGE_SIZE))
+    if not q.strip():
+        return SearchResults(total=0, page=page, page_size=page_size, results=[])
+    
+    scope = {}
+    
+    # BDE can only search their clients
+    if current_user.role == UserRole.BDE:
+        scope["assigned_bde"] = current_user.id
+    
+    client_search = ClientSearch(db)
+    total, docs = await client_search.search(q, scope, skip=(page - 1) * page_size, limit=page_size)
+    
+    return SearchResults(
+        total=total,
+        page=page,
+        page_size=page_size,
+        results=[
+            SearchResult(
+                client_id=doc["id"],
+                company_name=doc["company_name"],
+                contact_person=doc.get("contact_person"),
+                stage=doc.get("stage", ClientStage.FIRST_CONTACT),
+                assigned_bde=doc.get("assigned_bde"),
+                is_dropped=doc.get("is_dropped", False),
+                score=doc.get("score", 0),
+                highlights=client_search.highlight(doc, q)
+            )
+            for doc in docs
+        ]
+    )
+
+# Filter dropdown options: field -> ClientFacets attribute
+FACET_FIELDS = {
+    "stage": "stages",
+    "industry": "industries",
+    "source": "sources",
+    "company_size": "company_sizes",
+    "assigned_bde": "bdes"
+}
+
+# Computed facets per visibility scope, tagged with the collection versions they were built from.
+# The versions live in Mongo, so a write through any worker invalidates every worker's copy
+facets_cache: Dict[str, Tuple[Dict[str, int], ClientFacets]] = {}
+
+async def compute_client_facets(query: dict) -> ClientFacets:
+    facets = {
+        attribute: [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$match": {"_id": {"$nin": [None, ""]}}},
+            {"$sort": {"count": -1, "_id": 1}}
+        ]
+        for field, attribute in FACET_FIELDS.items()
+    }
+    result = await db.clients.aggregate([{"$match": query}, {"$facet": facets}]).to_list(1)
+    facet_result = result[0] if result else {}
+    
+    bde_ids = [group["_id"] for group in facet_result.get("bdes", [])]
+    bde_names = {
+        user["id"]: user["name"]
+        for user in await db.users.find({"id": {"$in": bde_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+    }
+    
+    def facet_values(attribute: str, labels: Dict[Any, str]) -> List[FacetValue]:
+        return [
+            FacetValue(value=group["_id"], label=labels.get(group["_id"]), count=group["count"])
+            for group in facet_result.get(attribute, [])
+        ]
+    
+    stage_names = {stage: info["name"] for stage, info in STAGES.items()}
+    return ClientFacets(
+        stages=facet_values("stages", stage_names),
+        industries=facet_values("industries", {}),
+        sources=facet_values("sources", {}),
+        company_sizes=facet_values("company_sizes", {}),
+        bdes=facet_values("bdes", bde_names)
+    )
+
+@api_router.get("/clients/facets", response_model=ClientFacets)
+async def get_client_facets(current_user: User = Depends(get_current_user)):
+    """Distinct values and counts of the filterable client fields"""
+    query = {}
+    
+    # BDE can only see their clients
+    if current_user.role == UserRole.BDE:
+        query["assigned_bde"] = current_user.id
+    
+    # Admins share one entry; any client or user write bumps the versions and invalidates it
+    cache_key = query.get("assigned_bde", "all")
+    versions = await get_collection_versions()
+    versions = {collection: versions.get(collection, 0) for collection in ("clients", "users")}
+    
+    cached = facets_cache.get(cache_key)
+    if cached and cached[0] == versions:
+        facets = cached[1]
+    else:
+        facets = await compute_client_facets(query)
+        facets_cache[cache_key] = (versions, facets)
+    
+    return facets
+
 @api_router.get("/clients/{client_id}", response_model=Client)
-async def get_client(client_id: str, current_user: User = Depends(get_current_user)):
-    client_doc = await db.clients.find_one({"id": client_id})
-    if not client_doc:
+async def get_client(client_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    # Existence and access first, so a 304 tells nobody about a client they can't see
+    access_doc = await db.clients.find_one({"id": client_id}, {"_id": 0, "assigned_bde": 1})
+    if not access_doc:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    client = Client(**client_doc)
-    
     # BDE can only see their clients
-    if current_user.role == UserRole.BDE and client.assigned_bde != current_user.id:
+    if current_user.role == UserRole.BDE and access_doc.get("assigned_bde") != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return client
+    etag = await get_etag(f"client:{client_id}", current_user, ["clients"])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    client_doc = await db.clients.find_one({"id": client_id})
+    if not client_doc:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    set_etag_headers(response, etag)
+    return Client(**client_doc)
 
 @api_router.put("/clients/{client_id}", response_model=Client)
 async def update_client(client_id: str, update_data: ClientUpdate, current_user: User = Depends(get_current_user)):
@@ -404,8 +811,40 @@ async def update_client(client_id: str, update_data: ClientUpdate, current_user:
     
     update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
     update_dict["last_interaction"] = datetime.utcnow()
+    update_dict["updated_at"] = update_dict["last_interaction"]
+    
+    await db.clients.update_one({"id": client_id}, {"$set": {**update_dict, **get_suggest_fields(update_dict)}})
+    await bump_collection_versions("clients")
+    
+    if "stage" in update_dict and update_dict["stage"] != client.stage:
+        stage_change = StageChange(
+            client_id=client_id,
+            from_stage=client.stage,
+            to_stage=update_dict["stage"],
+            changed_by=current_user.id,
+            changed_by_name=current_user.name,
+            changed_at=update_dict["updated_at"]
+        )
+        await db.stage_changes.insert_one(stage_change.dict())
     
-    await db.clients.update_one({"id": client_id}, {"$set": update_dict})
+    publish_client_event(
+        "client.updated",
+        {**client_doc, **update_dict},
+        fields=sorted(k for k in update_dict if k not in ("last_interaction", "updated_at"))
+    )
+    
+    # The previous BDE no longer sees this client (nor its tasks); let their next sync drop them
+    if "assigned_bde" in update_dict and update_dict["assigned_bde"] != client.assigned_bde:
+        await record_tombstones("clients", [client_doc], reason="reassigned")
+        await reassign_client_tasks(client_id, client.assigned_bde, update_dict["updated_at"])
+        # Admins see the client either way; only the two BDEs' boards change
+        event_broker.publish("client.removed", {"id": client_id}, assigned_bde=client.assigned_bde, restricted_only=True)
+        event_broker.publish(
+            "client.added",
+            {"id": client_id, "company_name": client.company_name, "stage": update_dict.get("stage", client.stage)},
+            assigned_bde=update_dict["assigned_bde"],
+            restricted_only=True
+        )
     
     # Send notification for important updates
     if "stage" in update_dict:
@@ -442,7 +881,13 @@ async def add_note(client_id: str, note: dict, current_user: User = Depends(get_
     # Add note to the beginning (latest first)
     await db.clients.update_one(
         {"id": client_id}, 
-        {"$push": {"notes": {"$each": [new_note.dict()], "$position": 0}}, "$set": {"last_interaction": datetime.utcnow()}}
+        {"$push": {"notes": {"$each": [new_note.dict()], "$position": 0}}, "$set": {"last_interaction": new_note.timestamp, "updated_at": new_note.timestamp}}
+    )
+    await bump_collection_versions("clients")
+    event_broker.publish(
+        "note.added",
+        {"client_id": client_id, "note_id": new_note.id, "author": new_note.author},
+        assigned_bde=client.assigned_bde
     )
     
     # Send notification
@@ -472,6 +917,170 @@ async def upload_file(file: UploadFile = File(...), current_user: User = Depends
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
 
+async def get_upload_session(session_id: str, current_user: User) -> UploadSession:
+    session_doc = await db.upload_sessions.find_one({"id": session_id})
+    if not session_doc:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    
+    session = UploadSession(**session_doc)
+    
+    # Only the uploader can resume their own session
+    if session.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    if session.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="Upload session expired")
+    
+    return session
+
+@api_router.post("/uploads", response_model=UploadSession)
+async def create_upload_session(session_data: UploadSessionCreate, current_user: User = Depends(get_current_user)):
+    """Start a resumable upload; chunks are then sent with PUT /uploads/{session_id}"""
+    if session_data.file_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"File type {session_data.file_type} not allowed. Allowed types: PDF, DOCX, Images, Videos, etc."
+        )
+    
+    if session_data.total_size <= 0:
+        raise HTTPException(status_code=400, detail="File size must be greater than zero")
+    
+    if session_data.total_size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail=f"File too large. Maximum size is {MAX_FILE_SIZE//1024//1024}MB")
+    
+    session = UploadSession(
+        filename=f"{uuid.uuid4()}{Path(session_data.filename).suffix}",
+        original_filename=session_data.filename,
+        file_type=session_data.file_type,
+        total_size=session_data.total_size,
+        user_id=current_user.id
+    )
+    
+    get_partial_upload_path(session.id).touch()
+    await db.upload_sessions.insert_one(session.dict())
+    
+    return session
+
+async def claim_upload_session(session: UploadSession, offset: int) -> str:
+    """Take the session's write claim at `offset` and return the claim token.
+    
+    The claim is a conditional update in Mongo, so only one request (on any
+    worker) writes to a session at a time, and only at its committed offset.
+    """
+    writer = str(uuid.uuid4())
+    now = datetime.utcnow()
+    result = await db.upload_sessions.update_one(
+        {"id": session.id, "offset": offset, "$or": [{"writing_until": None}, {"writing_until": {"$lt": now}}]},
+        {"$set": {"writer": writer, "writing_until": now + timedelta(seconds=UPLOAD_WRITE_LEASE_SECONDS)}}
+    )
+    if result.matched_count:
+        return writer
+    
+    session_doc = await db.upload_sessions.find_one({"id": session.id}, {"_id": 0, "offset": 1, "writing_until": 1}) or {}
+    current_offset = session_doc.get("offset", 0)
+    if current_offset == offset:
+        detail = "Another request is writing to this upload"
+    else:
+        # The client lost track (e.g. a chunk was only partially received)
+        detail = f"Offset mismatch. Server has {current_offset} bytes"
+    raise HTTPException(status_code=409, detail=detail, headers={"Upload-Offset": str(current_offset)})
+
+async def release_upload_session(session_id: str, writer: str, offset: Optional[int] = None) -> bool:
+    """Drop the write claim, committing the new offset if given. False if the claim was lost"""
+    update: Dict[str, Any] = {"$unset": {"writer": "", "writing_until": ""}}
+    if offset is not None:
+        update["$set"] = {"offset": offset}
+    result = await db.upload_sessions.update_one({"id": session_id, "writer": writer}, update)
+    return result.matched_count == 1
+
+@api_router.get("/uploads/{session_id}", response_model=UploadSession)
+async def get_upload_session_status(session_id: str, current_user: User = Depends(get_current_user)):
+    """Report how many bytes the server already has, so the client can resume from there"""
+    return await get_upload_session(session_id, current_user)
+
+@api_router.put("/uploads/{session_id}", response_model=UploadSession)
+async def upload_chunk(
+    session_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    current_user: User = Depends(get_current_user)
+):
+    """Append the request body to the upload, starting at Upload-Offset"""
+    session = await get_upload_session(session_id, current_user)
+    writer = await claim_upload_session(session, upload_offset)
+    
+    written = 0
+    try:
+        # File I/O goes to the thread pool so a slow disk doesn't stall the event loop
+        buffer = await run_in_threadpool(open_partial_upload, session.id, upload_offset)
+        if buffer is None:
+            raise HTTPException(status_code=409, detail="Upload data not found on this server; start a new upload")
+        try:
+            async for chunk in request.stream():
+                if upload_offset + written + len(chunk) > session.total_size:
+                    raise HTTPException(status_code=400, detail="Chunk exceeds declared file size")
+                await run_in_threadpool(buffer.write, chunk)
+                written += len(chunk)
+                UPLOAD_BYTES.inc(len(chunk), "resumable")
+        finally:
+            await run_in_threadpool(buffer.close)
+    except Exception:
+        # The offset stays where it was; the next chunk overwrites whatever was written
+        await release_upload_session(session.id, writer)
+        raise
+    
+    if not await release_upload_session(session.id, writer, upload_offset + written):
+        raise HTTPException(status_code=409, detail="Upload session was cancelled or taken over by another request")
+    
+    session.offset = upload_offset + written
+    return session
+
+@api_router.post("/uploads/{session_id}/complete")
+async def complete_upload_session(session_id: str, current_user: User = Depends(get_current_user)):
+    """Finish a resumable upload and return the same attachment details as /upload-file"""
+    session = await get_upload_session(session_id, current_user)
+    if session.offset != session.total_size:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete. Server has {session.offset} of {session.total_size} bytes",
+            headers={"Upload-Offset": str(session.offset)}
+        )
+    
+    writer = await claim_upload_session(session, session.total_size)
+    try:
+        # Drops anything a failed chunk left past the end
+        buffer = await run_in_threadpool(open_partial_upload, session.id, session.total_size)
+        if buffer is None:
+            raise HTTPException(status_code=409, detail="Upload data not found on this server; start a new upload")
+        await run_in_threadpool(buffer.close)
+        await attachment_storage.save_file(session.filename, get_partial_upload_path(session.id), session.file_type)
+    except Exception:
+        await release_upload_session(session.id, writer)
+        raise
+    await db.upload_sessions.delete_one({"id": session.id})
+    
+    thumbnail_service.schedule(attachment_storage, session.filename, session.file_type)
+    
+    attachment = FileAttachment(
+        filename=session.filename,
+        original_filename=session.original_filename,
+        file_size=session.total_size,
+        file_type=session.file_type,
+        uploaded_by=current_user.id
+    )
+    return attachment.dict()
+
+@api_router.delete("/uploads/{session_id}")
+async def cancel_upload_session(session_id: str, current_user: User = Depends(get_current_user)):
+    """Abort a resumable upload and discard the bytes received so far"""
+    session = await get_upload_session(session_id, current_user)
+    
+    # A chunk still being written finds its claim gone and fails
+    await db.upload_sessions.delete_one({"id": session.id})
+    get_partial_upload_path(session.id).unlink(missing_ok=True)
+    
+    return {"message": "Upload cancelled"}
+
 @api_router.post("/clients/{client_id}/attachments")
 async def add_client_attachment(
     client_id: str, 
@@ -503,7 +1112,13 @@ async def add_client_attachment(
         # Add attachment to client
         await db.clients.update_one(
             {"id": client_id},
-            {"$push": {"attachments": attachment.dict()}}
+            {"$push": {"attachments": attachment.dict()}, "$set": {"updated_at": attachment.uploaded_at}}
+        )
+        await bump_collection_versions("clients")
+        event_broker.publish(
+            "attachment.added",
+            {"client_id": client_id, "attachment_id": attachment.id, "original_filename": attachment.original_filename},
+            assigned_bde=client.assigned_bde
         )
         
         # Send notification
@@ -513,6 +1128,107 @@ async def add_client_attachment(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading attachment: {str(e)}")
 
+class ZipStreamBuffer:
+    """Write-only sink for zipfile; collected bytes are drained after every write so memory stays flat"""
+    def __init__(self):
+        self.chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def get_client_attachment_entries(client_doc: dict) -> List[tuple]:
+    """(path inside the archive, attachment) for client-level and note-level attachments, with unique names"""
+    entries = []
+    used_names = set()
+    
+    def add_entry(folder: str, attachment: dict):
+        name = Path(attachment.get("original_filename") or attachment["filename"]).name
+        path = f"{folder}/{name}"
+        counter = 2
+        while path in used_names:
+            path = f"{folder}/{Path(name).stem} ({counter}){Path(name).suffix}"
+            counter += 1
+        used_names.add(path)
+        entries.append((path, attachment))
+    
+    for attachment in client_doc.get("attachments", []):
+        add_entry("client", attachment)
+    
+    for note in client_doc.get("notes", []):
+        # Legacy string notes have no attachments
+        if not isinstance(note, dict):
+            continue
+        for attachment in note.get("attachments", []):
+            note_date = note.get("timestamp").strftime("%Y-%m-%d") if isinstance(note.get("timestamp"), datetime) else "undated"
+            add_entry(f"notes/{note_date}", attachment)
+    
+    return entries
+
+async def stream_attachments_zip(entries: List[tuple]):
+    """Build the ZIP on the fly: each file is read from storage in chunks and yielded as soon as it is written"""
+    buffer = ZipStreamBuffer()
+    missing_files = []
+    
+    # Attachments are mostly PDFs, images and videos that are already compressed, so store them as-is
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for path, attachment in entries:
+            if not await attachment_storage.exists(attachment["filename"]):
+                missing_files.append(path)
+                continue
+            
+            uploaded_at = attachment.get("uploaded_at")
+            zip_info = zipfile.ZipInfo(
+                path,
+                date_time=uploaded_at.timetuple()[:6] if isinstance(uploaded_at, datetime) else datetime.utcnow().timetuple()[:6]
+            )
+            zip_info.file_size = attachment.get("file_size", 0)
+            
+            with archive.open(zip_info, mode="w") as entry:
+                async for chunk in attachment_storage.iter_chunks(attachment["filename"]):
+                    entry.write(chunk)
+                    yield buffer.drain()
+            yield buffer.drain()
+        
+        if missing_files:
+            archive.writestr("MISSING_FILES.txt", "These attachments could not be found in storage:\n" + "\n".join(missing_files))
+    
+    # Closing the archive writes the central directory
+    yield buffer.drain()
+
+@api_router.get("/clients/{client_id}/attachments.zip")
+async def download_client_attachments_zip(client_id: str, current_user: User = Depends(get_current_user)):
+    """Download every client and note attachment of a client as one ZIP"""
+    client_doc = await db.clients.find_one(
+        {"id": client_id},
+        {"_id": 0, "company_name": 1, "assigned_bde": 1, "attachments": 1, "notes": 1}
+    )
+    if not client_doc:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    # BDE can only export their clients
+    if current_user.role == UserRole.BDE and client_doc.get("assigned_bde") != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    entries = get_client_attachment_entries(client_doc)
+    if not entries:
+        raise HTTPException(status_code=404, detail="Client has no attachments")
+    
+    archive_name = re.sub(r"[^A-Za-z0-9._-]+", "_", client_doc.get("company_name", "client")).strip("_") or "client"
+    return StreamingResponse(
+        stream_attachments_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}-attachments.zip"'}
+    )
+
 @api_router.post("/clients/{client_id}/notes/{note_id}/attachments")
 async def add_note_attachment(
     client_id: str,
@@ -545,7 +1261,13 @@ async def add_note_attachment(
         # Find and update the specific note
         await db.clients.update_one(
             {"id": client_id, "notes.id": note_id},
-            {"$push": {"notes.$.attachments": attachment.dict()}}
+            {"$push": {"notes.$.attachments": attachment.dict()}, "$set": {"updated_at": attachment.uploaded_at}}
+        )
+        await bump_collection_versions("clients")
+        event_broker.publish(
+            "attachment.added",
+            {"client_id": client_id, "note_id": note_id, "attachment_id": attachment.id, "original_filename": attachment.original_filename},
+            assigned_bde=client.assigned_bde
         )
         
         # Send notification
@@ -555,23 +1277,73 @@ async def add_note_attachment(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading note attachment: {str(e)}")
 
+@app.exception_handler(InvalidStorageKey)
+async def invalid_storage_key_handler(request: Request, exc: InvalidStorageKey):
+    # A file name from the URL that would point outside attachment storage
+    return JSONResponse(status_code=400, content={"detail": "Invalid file name"})
+
+async def get_stored_file_response(key: str, download_name: Optional[str], media_type: str, headers: Optional[Dict[str, str]] = None):
+    """Hand the browser a presigned URL when the backend supports it, otherwise stream the file ourselves"""
+    download_url = await attachment_storage.get_download_url(key, download_name)
+    if download_url:
+        return RedirectResponse(download_url, status_code=307)
+    
+    local_path = attachment_storage.local_path(key)
+    if local_path is not None:
+        return FileResponse(path=local_path, filename=download_name, media_type=media_type, headers=headers)
+    
+    return StreamingResponse(attachment_storage.iter_chunks(key), media_type=media_type, headers=headers)
+
 @api_router.get("/download/{filename}")
 async def download_file(filename: str, current_user: User = Depends(get_current_user)):
     """Download a file by filename"""
-    file_path = UPLOAD_DIRECTORY / filename
+    if not await attachment_storage.exists(filename):
+        raise HTTPException(status_code=404, detail="File not found")
     
-    if not file_path.exists():
+    return await get_stored_file_response(filename, filename, 'application/octet-stream')
+
+@api_router.get("/download/{filename}/url")
+async def get_download_url(filename: str, current_user: User = Depends(get_current_user)):
+    """Get a short-lived direct download URL so the transfer bypasses the API"""
+    if not await attachment_storage.exists(filename):
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type='application/octet-stream'
+    download_url = await attachment_storage.get_download_url(filename, filename)
+    return {"url": download_url or f"/api/download/{filename}", "presigned": download_url is not None}
+
+@api_router.get("/download/{filename}/thumbnail")
+async def download_thumbnail(filename: str, file_type: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    """Download a downscaled preview (JPEG) of an image or the first page of a PDF"""
+    thumbnail_key = get_thumbnail_key(filename)
+    
+    if not await attachment_storage.exists(thumbnail_key):
+        if not await attachment_storage.exists(filename):
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        # Files uploaded before the worker pool existed (or whose job was lost) are rendered on demand
+        suffix = Path(filename).suffix.lower()
+        if not file_type:
+            file_type = "application/pdf" if suffix == ".pdf" else f"image/{suffix.lstrip('.')}"
+        if not can_generate_thumbnail(file_type):
+            raise HTTPException(status_code=404, detail="No preview available for this file type")
+        
+        if not await thumbnail_service.generate(attachment_storage, filename, file_type):
+            raise HTTPException(status_code=404, detail="Preview could not be generated")
+    
+    # No download name, so browsers render the preview inline
+    return await get_stored_file_response(
+        thumbnail_key,
+        None,
+        'image/jpeg',
+        headers={"Cache-Control": "private, max-age=86400"}
     )
 
 # Simple notification system (can be replaced with Slack/Discord webhook)
 async def send_notification(message: str):
     """Send notification to Slack webhook"""
+    outcome = "skipped"
+    started = datetime.utcnow()
+    NOTIFICATIONS_IN_PROGRESS.inc()
     try:
         import requests
         import json
@@ -590,19 +1362,22 @@ async def send_notification(message: str):
             
             logger.info(f"Sending to Slack: {payload}")
             
-            response = requests.post(
-                slack_webhook_url,
-                data=json.dumps(payload),
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
+            with external_call():
+                response = requests.post(
+                    slack_webhook_url,
+                    data=json.dumps(payload),
+                    headers={'Content-Type': 'application/json'},
+                    timeout=10
+                )
             
             logger.info(f"Slack response status: {response.status_code}")
             logger.info(f"Slack response text: {response.text}")
             
             if response.status_code == 200:
+                outcome = "sent"
                 logger.info(f"✅ Slack notification sent successfully: {message}")
             else:
+                outcome = "failed"
                 logger.error(f"❌ Failed to send Slack notification: {response.status_code} - {response.text}")
         else:
             logger.warning("⚠️ No Slack webhook URL configured")
@@ -611,9 +1386,95 @@ async def send_notification(message: str):
         logger.info(f"NOTIFICATION: {message}")
         
     except Exception as e:
+        outcome = "failed"
         logger.error(f"❌ Failed to send notification: {e}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
+    finally:
+        NOTIFICATIONS_IN_PROGRESS.dec()
+        NOTIFICATION_DURATION.observe((datetime.utcnow() - started).total_seconds(), outcome)
+
+# On-demand profiling (super admins only)
+PROFILE_RETENTION_DAYS = 7
+PROFILE_LIST_PROJECTION = {"_id": 0, "speedscope_gzip": 0}
+
+async def authorize_profiling(token: Optional[str]) -> Optional[str]:
+    """User ID if the token belongs to a super admin, for the X-Profile-Request header"""
+    if not token:
+        return None
+    try:
+        user = await get_user_from_token(token)
+    except HTTPException:
+        return None
+    return user.id if user.role == UserRole.SUPER_ADMIN else None
+
+async def save_profile(profile: Dict[str, Any]):
+    await db.profiles.insert_one(profile)
+
+@api_router.post("/admin/profiling/triggers")
+async def arm_profiling(
+    trigger_data: ProfilingTriggerCreate,
+    current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))
+):
+    """Profile the next `count` requests to paths starting with `path_prefix` (only Super Admin)"""
+    if not PYINSTRUMENT_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Profiling not available (pyinstrument is not installed)")
+    if trigger_data.count < 1 or trigger_data.expires_minutes <= 0:
+        raise HTTPException(status_code=400, detail="count and expires_minutes must be positive")
+    
+    # Triggers live in each worker's memory; the worker bus arms them on the other workers too
+    trigger = profiling_controller.arm(
+        path_prefix=trigger_data.path_prefix,
+        count=trigger_data.count,
+        expires_minutes=trigger_data.expires_minutes,
+        requested_by=current_user.id,
+        method=trigger_data.method
+    )
+    return trigger
+
+@api_router.get("/admin/profiling/triggers")
+async def get_profiling_triggers(current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))):
+    return profiling_controller.triggers
+
+@api_router.delete("/admin/profiling/triggers")
+async def disarm_profiling(current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))):
+    profiling_controller.disarm()
+    return {"message": "Profiling triggers cleared"}
+
+@api_router.get("/admin/profiles")
+async def get_profiles(limit: int = 50, current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))):
+    """Recorded profiles, newest first (without the profile data)"""
+    return await db.profiles.find({}, PROFILE_LIST_PROJECTION).sort("created_at", -1).to_list(max(1, min(limit, 500)))
+
+@api_router.get("/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))):
+    """The profile as a speedscope file (open it at https://www.speedscope.app)"""
+    profile = await db.profiles.find_one({"id": profile_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return Response(
+        content=profile["speedscope_gzip"],
+        media_type="application/json",
+        headers={
+            "Content-Encoding": "gzip",
+            "Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'
+        }
+    )
+
+@api_router.post("/admin/uploads/gc")
+async def collect_orphaned_uploads(
+    grace_period_hours: float = DEFAULT_GRACE_PERIOD_HOURS,
+    quarantine: bool = False,
+    dry_run: bool = False,
+    current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN]))
+):
+    """Remove uploaded files that no client or note references any more (only Super Admin)"""
+    if grace_period_hours < 1:
+        raise HTTPException(status_code=400, detail="Grace period must be at least 1 hour")
+    
+    upload_gc = UploadGarbageCollector(db, attachment_storage, PARTIAL_UPLOAD_DIRECTORY)
+    return await upload_gc.run(grace_period_hours=grace_period_hours, quarantine=quarantine, dry_run=dry_run)
 
 @api_router.delete("/clients/{client_id}")
 async def delete_client(client_id: str, current_user: User = Depends(get_current_user)):
@@ -625,11 +1486,18 @@ async def delete_client(client_id: str, current_user: User = Depends(get_current
     if not client_doc:
         raise HTTPException(status_code=404, detail="Client not found")
     
+    related_tasks = await db.tasks.find({"client_id": client_id}, TOMBSTONE_PROJECTION).to_list(None)
+    
     # Delete the client
     await db.clients.delete_one({"id": client_id})
     
     # Also delete related tasks
     await db.tasks.delete_many({"client_id": client_id})
+    await db.stage_changes.delete_many({"client_id": client_id})
+    await bump_collection_versions("clients", "tasks")
+    await record_tombstones("clients", [client_doc])
+    await record_tombstones("tasks", related_tasks, assigned_bde=client_doc.get("assigned_bde"))
+    event_broker.publish("client.deleted", {"id": client_id}, assigned_bde=client_doc.get("assigned_bde"))
     
     # Send notification
     await send_notification(f"🗑️ Client {client_doc['company_name']} deleted by {current_user.name}")
@@ -641,6 +1509,7 @@ async def delete_client(client_id: str, current_user: User = Depends(get_current
 async def create_task(task_data: TaskCreate, current_user: User = Depends(get_current_user)):
     task = Task(**task_data.dict(), created_by=current_user.id)
     await db.tasks.insert_one(task.dict())
+    await bump_collection_versions("tasks")
     
     # Get client info for notification
     client_doc = await db.clients.find_one({"id": task.client_id})
@@ -650,27 +1519,43 @@ async def create_task(task_data: TaskCreate, current_user: User = Depends(get_cu
     assigned_user_doc = await db.users.find_one({"id": task.assigned_to})
     assigned_user_name = assigned_user_doc["name"] if assigned_user_doc else "Unknown User"
     
+    publish_task_event("task.created", task.dict(), client_doc.get("assigned_bde") if client_doc else None)
+    
     # Send notification
     await send_notification(f"📋 New task '{task.title}' assigned to {assigned_user_name} for {client_name} by {current_user.name}")
     
     return task
 
+async def get_task_visibility_query(current_user: User) -> dict:
+    """BDE can see tasks assigned to them and tasks for their clients"""
+    if current_user.role != UserRole.BDE:
+        return {}
+    
+    client_ids = [doc["id"] for doc in await db.clients.find({"assigned_bde": current_user.id}, {"_id": 0, "id": 1}).to_list(1000)]
+    return {
+        "$or": [
+            {"assigned_to": current_user.id},
+            {"client_id": {"$in": client_ids}},
+            {"created_by": current_user.id}  # Also see tasks they created
+        ]
+    }
+
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks(current_user: User = Depends(get_current_user)):
-    query = {}
+async def get_tasks(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    # BDEs also see tasks of their clients, so reassigning a client changes their view
+    etag = await get_etag("tasks", current_user, ["tasks", "clients"] if current_user.role == UserRole.BDE else ["tasks"])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # BDE can see tasks assigned to them and tasks for their clients
-    if current_user.role == UserRole.BDE:
-        client_ids = [doc["id"] for doc in await db.clients.find({"assigned_bde": current_user.id}).to_list(1000)]
-        query = {
-            "$or": [
-                {"assigned_to": current_user.id},
-                {"client_id": {"$in": client_ids}},
-                {"created_by": current_user.id}  # Also see tasks they created
-            ]
-        }
+    query = await get_task_visibility_query(current_user)
+    
+    if FAST_JSON_ENABLED:
+        fast_response = fast_json_list_response(db.tasks.find(query, {"_id": 0}).limit(1000), Task)
+        set_etag_headers(fast_response, etag)
+        return fast_response
     
     tasks = await db.tasks.find(query).to_list(1000)
+    set_etag_headers(response, etag)
     return [Task(**task) for task in tasks]
 
 @api_router.get("/users/all", response_model=List[User])
@@ -713,11 +1598,23 @@ async def delete_user(user_id: str, current_user: User = Depends(get_current_use
             detail=f"Cannot delete user. User has {len(assigned_tasks)} assigned tasks. Please reassign tasks first."
         )
     
+    created_tasks = await db.tasks.find({"created_by": user_id}, TOMBSTONE_PROJECTION).to_list(None)
+    
     # Delete the user
     await db.users.delete_one({"id": user_id})
     
     # Delete tasks created by this user
     await db.tasks.delete_many({"created_by": user_id})
+    await bump_collection_versions("users", "tasks")
+    await record_tombstones("users", [user_doc])
+    await record_tombstones("tasks", created_tasks)
+    for deleted_task in created_tasks:
+        event_broker.publish(
+            "task.deleted",
+            {"id": deleted_task["id"]},
+            assigned_to=deleted_task.get("assigned_to"),
+            created_by=deleted_task.get("created_by")
+        )
     
     # Send notification
     await send_notification(f"👤 User {user_to_delete.name} ({user_to_delete.email}) deleted by {current_user.name}")
@@ -733,6 +1630,7 @@ async def update_task_status(task_id: str, status_data: dict, current_user: User
     task = Task(**task_doc)
     
     # Check permissions
+    client_doc = None
     if current_user.role == UserRole.BDE:
         if task.assigned_to != current_user.id:
             # Check if task is for their client
@@ -740,12 +1638,505 @@ async def update_task_status(task_id: str, status_data: dict, current_user: User
             if not client_doc or client_doc["assigned_bde"] != current_user.id:
                 raise HTTPException(status_code=403, detail="Access denied")
     
-    await db.tasks.update_one({"id": task_id}, {"$set": {"status": status_data["status"]}})
+    await db.tasks.update_one({"id": task_id}, {"$set": {"status": status_data["status"], "updated_at": datetime.utcnow()}})
+    await bump_collection_versions("tasks")
+    
+    # The client's BDE also follows this task on the board
+    if event_broker.has_listeners:
+        if client_doc is None:
+            client_doc = await db.clients.find_one({"id": task.client_id}, {"_id": 0, "assigned_bde": 1})
+        publish_task_event(
+            "task.updated",
+            {**task.dict(), "status": status_data["status"]},
+            client_doc.get("assigned_bde") if client_doc else None
+        )
     return {"message": "Task status updated"}
 
+# Live updates
+def publish_client_event(event_type: str, client_data: dict, **extra):
+    """Compact board event: enough to move a card without refetching the client"""
+    event_broker.publish(
+        event_type,
+        {
+            "id": client_data["id"],
+            "company_name": client_data.get("company_name"),
+            "stage": client_data.get("stage"),
+            "assigned_bde": client_data.get("assigned_bde"),
+            "is_dropped": client_data.get("is_dropped", False),
+            **extra
+        },
+        assigned_bde=client_data.get("assigned_bde")
+    )
+
+def publish_task_event(event_type: str, task_data: dict, client_bde: Optional[str]):
+    event_broker.publish(
+        event_type,
+        {
+            "id": task_data["id"],
+            "client_id": task_data.get("client_id"),
+            "title": task_data.get("title"),
+            "status": task_data.get("status"),
+            "assigned_to": task_data.get("assigned_to")
+        },
+        assigned_bde=client_bde,
+        assigned_to=task_data.get("assigned_to"),
+        created_by=task_data.get("created_by")
+    )
+
+# How often an open stream re-checks that its user is still active
+STREAM_AUTH_CHECK_SECONDS = 60
+
+async def stream_user_is_valid(user_id: str, expires_at: Optional[datetime]) -> bool:
+    if expires_at and datetime.utcnow() >= expires_at:
+        return False
+    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "is_active": 1})
+    return bool(user_doc and user_doc.get("is_active", True))
+
+@api_router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """Server-Sent Events feed of client, note, attachment and task changes.
+    
+    EventSource can't send headers, so the JWT may also be passed as ?token=.
+    BDEs only receive events about their own clients and tasks. A `resync`
+    event means events were dropped and the client should refetch (or /sync).
+    The stream ends when the token expires or the user is deactivated; the
+    reconnect is then refused, which stops EventSource.
+    """
+    if credentials:
+        token = credentials.credentials
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    current_user = await get_user_from_token(token)
+    expires_at = jwt.get_unverified_claims(token).get("exp")  # Already verified above
+    expires_at = datetime.utcfromtimestamp(expires_at) if expires_at else None
+    if not await stream_user_is_valid(current_user.id, expires_at):
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    
+    subscriber = event_broker.subscribe(current_user.id, restricted=current_user.role == UserRole.BDE)
+    
+    async def event_stream():
+        next_auth_check = datetime.utcnow() + timedelta(seconds=STREAM_AUTH_CHECK_SECONDS)
+        try:
+            # Tell EventSource how soon to reconnect if the connection drops
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                now = datetime.utcnow()
+                if (expires_at and now >= expires_at) or now >= next_auth_check:
+                    if not await stream_user_is_valid(current_user.id, expires_at):
+                        break
+                    next_auth_check = now + timedelta(seconds=STREAM_AUTH_CHECK_SECONDS)
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        finally:
+            event_broker.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Delta sync
+SYNC_PAGE_SIZE = 500
+# Overlap between consecutive syncs so a write that was in flight (or stamped by a
+# slightly skewed clock) when the token was issued is still picked up next time
+SYNC_CLOCK_SKEW_SECONDS = 5
+TOMBSTONE_RETENTION_DAYS = 30
+TOMBSTONE_PROJECTION = {"_id": 0, "id": 1, "assigned_bde": 1, "assigned_to": 1, "created_by": 1}
+
+async def record_tombstones(collection: str, docs: List[dict], reason: str = "deleted", assigned_bde: Optional[str] = None):
+    """Remember removed documents so /sync can tell clients to drop them"""
+    if not docs:
+        return
+    
+    deleted_at = datetime.utcnow()
+    await db.tombstones.insert_many([
+        {
+            "collection": collection,
+            "id": doc["id"],
+            "reason": reason,
+            # Who could see it, so BDEs only get tombstones for their own records
+            "assigned_bde": doc.get("assigned_bde", assigned_bde),
+            "assigned_to": doc.get("assigned_to"),
+            "created_by": doc.get("created_by"),
+            "deleted_at": deleted_at
+        }
+        for doc in docs
+    ])
+
+async def reassign_client_tasks(client_id: str, previous_bde: str, updated_at: datetime):
+    """Sync bookkeeping for the tasks of a reassigned client.
+    
+    The previous BDE loses the tasks they only saw through the client, and the
+    new BDE has to receive all of them on their next delta sync.
+    """
+    tasks = await db.tasks.find({"client_id": client_id}, TOMBSTONE_PROJECTION).to_list(None)
+    hidden = [
+        # Only the previous BDE may pick these up; the assignee and creator still see them
+        {"id": task["id"]} for task in tasks
+        if previous_bde not in (task.get("assigned_to"), task.get("created_by"))
+    ]
+    await record_tombstones("tasks", hidden, reason="reassigned", assigned_bde=previous_bde)
+    
+    if tasks:
+        await db.tasks.update_many({"client_id": client_id}, {"$set": {"updated_at": updated_at}})
+        await bump_collection_versions("tasks")
+
+# Each stream pages on its own (time, id) keyset, so a batch stamped with one
+# timestamp (a cascade delete, a reassignment) can span several pages
+SYNC_STREAMS = {"clients": "updated_at", "tasks": "updated_at", "tombstones": "deleted_at"}
+
+def encode_sync_token(positions: Dict[str, Tuple[datetime, str]]) -> str:
+    # Stored datetimes are naive UTC; .timestamp() would read them as local time
+    payload = {
+        stream: [calendar.timegm(timestamp.utctimetuple()) * 1000 + timestamp.microsecond // 1000, item_id]
+        for stream, (timestamp, item_id) in positions.items()
+    }
+    return base64.urlsafe_b64encode(f"v2:{json.dumps(payload, separators=(',', ':'))}".encode()).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> Dict[str, Tuple[datetime, str]]:
+    try:
+        version, payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode().split(":", 1)
+        if version == "v1":
+            # Tokens issued before keyset paging: one timestamp for every stream
+            timestamp = datetime.utcfromtimestamp(int(payload) / 1000)
+            return {stream: (timestamp, "") for stream in SYNC_STREAMS}
+        if version != "v2":
+            raise ValueError(version)
+        positions = json.loads(payload)
+        return {
+            stream: (datetime.utcfromtimestamp(int(positions[stream][0]) / 1000), str(positions[stream][1]))
+            for stream in SYNC_STREAMS
+        }
+    except (ValueError, TypeError, KeyError, IndexError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+def get_sync_position_query(position: Tuple[datetime, str], time_field: str) -> dict:
+    """Documents strictly after the position in (time asc, id asc) order"""
+    timestamp, item_id = position
+    return {
+        "$or": [
+            {time_field: {"$gt": timestamp}},
+            {time_field: timestamp, "id": {"$gt": item_id}}
+        ]
+    }
+
+def get_sync_next_position(page: List[dict], time_field: str, previous: Optional[Tuple[datetime, str]], caught_up: Tuple[datetime, str]) -> Tuple[Tuple[datetime, str], bool]:
+    """Where this stream resumes, and whether its page was cut short"""
+    if len(page) >= SYNC_PAGE_SIZE:
+        return (page[-1][time_field], page[-1]["id"]), True
+    if previous and previous > caught_up:
+        return previous, False
+    return caught_up, False
+
+@api_router.get("/sync")
+async def sync_changes(since: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    """Clients and tasks changed since the token, plus ids deleted since then.
+    
+    Call without `since` for a full snapshot, then pass back the returned token.
+    Keep calling while `has_more` is true. Items may repeat across calls, so
+    apply them as upserts.
+    """
+    issued_at = datetime.utcnow()
+    positions = decode_sync_token(since) if since else None
+    
+    # Tombstones expire; a client that's been away longer than that has to start over
+    if positions and min(timestamp for timestamp, _ in positions.values()) < issued_at - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        positions = None
+    
+    full = positions is None
+    client_query = {"assigned_bde": current_user.id} if current_user.role == UserRole.BDE else {}
+    task_query = await get_task_visibility_query(current_user)
+    
+    if not full:
+        client_query = {**client_query, **get_sync_position_query(positions["clients"], "updated_at")}
+        task_position_query = get_sync_position_query(positions["tasks"], "updated_at")
+        task_query = {"$and": [task_query, task_position_query]} if task_query else task_position_query
+    
+    sort = [("updated_at", 1), ("id", 1)]
+    clients_cursor = db.clients.find(client_query, {"_id": 0}).sort(sort).limit(SYNC_PAGE_SIZE)
+    tasks_cursor = db.tasks.find(task_query, {"_id": 0}).sort(sort).limit(SYNC_PAGE_SIZE)
+    clients, tasks = await asyncio.gather(clients_cursor.to_list(None), tasks_cursor.to_list(None))
+    
+    deleted = {"clients": [], "tasks": [], "users": []}
+    tombstones = []
+    if not full:
+        tombstone_query = get_sync_position_query(positions["tombstones"], "deleted_at")
+        if current_user.role == UserRole.BDE:
+            tombstone_query = {"$and": [tombstone_query, {"$or": [
+                {"assigned_bde": current_user.id},
+                {"assigned_to": current_user.id},
+                {"created_by": current_user.id}
+            ]}]}
+        else:
+            # Reassignment only hides a client from the previous BDE
+            tombstone_query["reason"] = "deleted"
+        tombstones = await db.tombstones.find(tombstone_query, {"_id": 0}).sort([("deleted_at", 1), ("id", 1)]).to_list(SYNC_PAGE_SIZE)
+        for tombstone in tombstones:
+            deleted.setdefault(tombstone["collection"], []).append(tombstone["id"])
+    
+    # A stream whose page was cut short resumes right after its last item; the others
+    # move up to now, less an overlap for writes that were in flight
+    caught_up = (issued_at - timedelta(seconds=SYNC_CLOCK_SKEW_SECONDS), "")
+    next_positions = {}
+    has_more = False
+    for stream, page in (("clients", clients), ("tasks", tasks), ("tombstones", tombstones)):
+        next_positions[stream], truncated = get_sync_next_position(
+            page, SYNC_STREAMS[stream], positions[stream] if positions else None, caught_up
+        )
+        has_more = has_more or truncated
+    
+    return {
+        "token": encode_sync_token(next_positions),
+        "full": full,
+        "has_more": has_more,
+        "clients": [Client(**client) for client in clients],
+        "tasks": [Task(**task) for task in tasks],
+        "deleted": deleted
+    }
+
+# Client timeline
+TIMELINE_DEFAULT_LIMIT = 50
+TIMELINE_MAX_LIMIT = 200
+
+async def iter_embedded_timeline(client_id: str, array_field: str, time_field: str, cursor, limit: int):
+    """Newest-first entries of an embedded array (notes or attachments), sorted and limited in Mongo"""
+    pipeline = [
+        {"$match": {"id": client_id}},
+        {"$unwind": f"${array_field}"},
+        # Legacy plain-string notes have no timestamp and can't be placed on the timeline
+        {"$match": {f"{array_field}.{time_field}": {"$type": "date"}}},
+    ]
+    if cursor:
+        pipeline.append({"$match": get_keyset_cursor_query(cursor, f"{array_field}.{time_field}", f"{array_field}.id")})
+    pipeline += [
+        {"$sort": {f"{array_field}.{time_field}": -1, f"{array_field}.id": -1}},
+        {"$limit": limit},
+        {"$replaceRoot": {"newRoot": f"${array_field}"}}
+    ]
+    async for doc in db.clients.aggregate(pipeline):
+        yield doc
+
+async def iter_collection_timeline(collection, client_id: str, time_field: str, cursor, limit: int):
+    """Newest-first documents of a per-client collection, served from its (client_id, time) index"""
+    query = {"client_id": client_id}
+    if cursor:
+        query.update(get_keyset_cursor_query(cursor, time_field))
+    async for doc in collection.find(query, {"_id": 0}).sort([(time_field, -1), ("id", -1)]).limit(limit):
+        yield doc
+
+async def merge_timeline_sources(sources: Dict[str, Tuple[AsyncIterator[dict], str]], limit: int) -> List[TimelineEvent]:
+    """K-way merge of already-sorted sources, pulling one document at a time from each"""
+    heads = {}
+    for event_type, (iterator, time_field) in sources.items():
+        heads[event_type] = await anext(iterator, None)
+    
+    events = []
+    while len(events) < limit:
+        candidates = [(doc[sources[event_type][1]], doc["id"], event_type) for event_type, doc in heads.items() if doc]
+        if not candidates:
+            break
+        timestamp, item_id, event_type = max(candidates)
+        doc = heads[event_type]
+        doc.pop("_id", None)
+        events.append(TimelineEvent(id=item_id, type=event_type, timestamp=timestamp, data=doc))
+        heads[event_type] = await anext(sources[event_type][0], None)
+    
+    return events
+
+@api_router.get("/clients/{client_id}/timeline", response_model=Timeline)
+async def get_client_timeline(
+    client_id: str,
+    cursor: Optional[str] = None,
+    limit: int = TIMELINE_DEFAULT_LIMIT,
+    current_user: User = Depends(get_current_user)
+):
+    """Notes, attachments, tasks and stage changes of a client, newest first"""
+    limit = max(1, min(limit, TIMELINE_MAX_LIMIT))
+    client_doc = await db.clients.find_one(
+        {"id": client_id},
+        {"_id": 0, "id": 1, "assigned_bde": 1, "company_name": 1, "created_by": 1, "created_at": 1}
+    )
+    if not client_doc:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    # BDE can only see their clients
+    if current_user.role == UserRole.BDE and client_doc.get("assigned_bde") != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    page_cursor = decode_keyset_cursor(cursor) if cursor else None
+    # One extra event tells us whether there is a next page
+    fetch_limit = limit + 1
+    
+    sources = {
+        "note": (iter_embedded_timeline(client_id, "notes", "timestamp", page_cursor, fetch_limit), "timestamp"),
+        "attachment": (iter_embedded_timeline(client_id, "attachments", "uploaded_at", page_cursor, fetch_limit), "uploaded_at"),
+        "task": (iter_collection_timeline(db.tasks, client_id, "created_at", page_cursor, fetch_limit), "created_at"),
+        "stage_change": (iter_collection_timeline(db.stage_changes, client_id, "changed_at", page_cursor, fetch_limit), "changed_at"),
+    }
+    events = await merge_timeline_sources(sources, fetch_limit)
+    
+    # The client's creation is always the oldest event
+    created_at = client_doc.get("created_at")
+    if len(events) < fetch_limit and created_at and (
+        page_cursor is None or (created_at, client_id) < page_cursor
+    ):
+        events.append(TimelineEvent(id=client_id, type="created", timestamp=created_at, data=client_doc))
+    
+    has_more = len(events) > limit
+    events = events[:limit]
+    return Timeline(
+        events=events,
+        next_cursor=encode_keyset_cursor(events[-1].timestamp, events[-1].id) if has_more else None
+    )
+
+# Kanban board
+BOARD_DEFAULT_LIMIT = 20
+BOARD_MAX_LIMIT = 100
+BOARD_SORT = {"last_interaction": -1, "id": -1}
+
+# Only what a card shows; notes and attachments are reduced to counts
+BOARD_CARD_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "company_name": 1,
+    "contact_person": 1,
+    "email": 1,
+    "phone": 1,
+    "industry": 1,
+    "budget": 1,
+    "budget_currency": 1,
+    "stage": 1,
+    "assigned_bde": 1,
+    "created_at": 1,
+    "last_interaction": 1,
+    "is_dropped": 1,
+    "notes_count": {"$size": {"$ifNull": ["$notes", []]}},
+    "attachments_count": {"$size": {"$ifNull": ["$attachments", []]}}
+}
+
+def get_board_query(current_user: User, include_dropped: bool) -> dict:
+    query = {}
+    
+    # BDE can only see their clients
+    if current_user.role == UserRole.BDE:
+        query["assigned_bde"] = current_user.id
+    
+    if not include_dropped:
+        query["is_dropped"] = {"$ne": True}
+    
+    return query
+
+def encode_keyset_cursor(timestamp: Optional[datetime], item_id: str) -> str:
+    timestamp = timestamp or datetime.min
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{item_id}".encode()).decode()
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        timestamp, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), item_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def get_keyset_cursor_query(cursor: Tuple[datetime, str], time_field: str, id_field: str = "id") -> dict:
+    """Documents strictly after the cursor in (time desc, id desc) order"""
+    timestamp, item_id = cursor
+    return {
+        "$or": [
+            {time_field: {"$lt": timestamp}},
+            {time_field: timestamp, id_field: {"$lt": item_id}}
+        ]
+    }
+
+def encode_board_cursor(card: dict) -> str:
+    return encode_keyset_cursor(card.get("last_interaction"), card["id"])
+
+def build_board_column(stage: ClientStage, count: int, cards: List[dict], limit: int) -> BoardColumn:
+    # We fetch one extra card to know whether there is a next page
+    has_more = len(cards) > limit
+    cards = cards[:limit]
+    return BoardColumn(
+        stage=stage,
+        name=STAGES[stage.value]["name"],
+        count=count,
+        cards=[BoardCard(**card) for card in cards],
+        next_cursor=encode_board_cursor(cards[-1]) if has_more else None
+    )
+
+async def load_board_column(stage: ClientStage, column_query: dict, limit: int, cursor: Optional[str] = None) -> BoardColumn:
+    """One column page: an indexed match/sort/limit (never inside $facet, where no index applies) plus its count"""
+    page_query = {**column_query, **get_keyset_cursor_query(decode_keyset_cursor(cursor), "last_interaction")} if cursor else column_query
+    
+    cards, count = await asyncio.gather(
+        db.clients.aggregate([
+            {"$match": page_query},
+            {"$sort": BOARD_SORT},
+            {"$limit": limit + 1},
+            {"$project": BOARD_CARD_PROJECTION}
+        ]).to_list(None),
+        db.clients.count_documents(column_query)
+    )
+    
+    return build_board_column(stage, count, cards, limit)
+
+@api_router.get("/board", response_model=Board)
+async def get_board(
+    request: Request,
+    response: Response,
+    limit: int = BOARD_DEFAULT_LIMIT,
+    include_dropped: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """Per-stage counts and the first `limit` cards of every column.
+    
+    Each column is its own query, run concurrently, so each one reads only
+    `limit` cards off the (stage, last_interaction) index, or the
+    (assigned_bde, stage, last_interaction) one for BDEs.
+    """
+    limit = max(1, min(limit, BOARD_MAX_LIMIT))
+    etag = await get_etag(f"board:{limit}:{include_dropped}", current_user, ["clients"])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    board_query = get_board_query(current_user, include_dropped)
+    columns = await asyncio.gather(*(
+        load_board_column(stage, {**board_query, "stage": stage.value}, limit)
+        for stage in ClientStage
+    ))
+    
+    set_etag_headers(response, etag)
+    return Board(columns=columns)
+
+@api_router.get("/board/{stage}", response_model=BoardColumn)
+async def get_board_column(
+    stage: ClientStage,
+    cursor: Optional[str] = None,
+    limit: int = BOARD_DEFAULT_LIMIT,
+    include_dropped: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """Next page of a single column, continuing from its `next_cursor`"""
+    limit = max(1, min(limit, BOARD_MAX_LIMIT))
+    column_query = {**get_board_query(current_user, include_dropped), "stage": stage.value}
+    return await load_board_column(stage, column_query, limit, cursor)
+
 # Dashboard Routes
 @api_router.get("/dashboard/stats", response_model=DashboardStats)
-async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
+async def get_dashboard_stats(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    # Tasks become overdue without any write, so the tag also rolls over every minute
+    etag = await get_etag("dashboard", current_user, ["clients", "tasks"], datetime.utcnow().strftime("%Y%m%d%H%M"))
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
     query = {}
     
     # BDE can only see their stats
@@ -755,14 +2146,12 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
     # Get clients
     clients = await db.clients.find(query).to_list(1000)
     
-    # Calculate stats
-    total_clients = len([c for c in clients if not c.get("is_dropped", False)])
-    dropped_clients = len([c for c in clients if c.get("is_dropped", False)])
-    
-    clients_by_stage = {}
-    for stage in ClientStage:
-        clients_by_stage[stage.value] = len([c for c in clients if c.get("stage") == stage.value and not c.get("is_dropped", False)])
-    
+    stats = await compute_dashboard_stats(clients, current_user)
+    set_etag_headers(response, etag)
+    return stats
+
+async def compute_dashboard_stats(clients: List[dict], current_user: User) -> DashboardStats:
+    """Stats for the clients the user can see; also used by /bootstrap"""
     # Get tasks
     task_query = {}
     if current_user.role == UserRole.BDE:
@@ -775,6 +2164,17 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         }
     
     tasks = await db.tasks.find(task_query).to_list(1000)
+    return summarize_dashboard_stats(clients, tasks)
+
+def summarize_dashboard_stats(clients: List[dict], tasks: List[dict]) -> DashboardStats:
+    # Calculate stats
+    total_clients = len([c for c in clients if not c.get("is_dropped", False)])
+    dropped_clients = len([c for c in clients if c.get("is_dropped", False)])
+    
+    clients_by_stage = {}
+    for stage in ClientStage:
+        clients_by_stage[stage.value] = len([c for c in clients if c.get("stage") == stage.value and not c.get("is_dropped", False)])
+    
     pending_tasks = len([t for t in tasks if t.get("status") == "pending"])
     
     # Safe datetime parsing for overdue tasks
@@ -808,15 +2208,63 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         overdue_tasks=overdue_tasks
     )
 
+# Client fields summarize_dashboard_stats reads
+STATS_CLIENT_PROJECTION = {"_id": 0, "id": 1, "stage": 1, "is_dropped": 1}
+
+@api_router.get("/bootstrap", response_model=Bootstrap)
+async def get_bootstrap(current_user: User = Depends(get_current_user)):
+    """Everything the first screen needs in one round trip, with one auth lookup"""
+    client_query = {}
+    
+    # BDE can only see their clients
+    if current_user.role == UserRole.BDE:
+        client_query["assigned_bde"] = current_user.id
+    
+    is_admin = current_user.role in [UserRole.SUPER_ADMIN, UserRole.ADMIN]
+    
+    async def load_stats():
+        # Only what the stats count; the client pages load (and page) the clients themselves
+        client_docs = await db.clients.find(client_query, STATS_CLIENT_PROJECTION).to_list(1000)
+        return await compute_dashboard_stats(client_docs, current_user)
+    
+    async def load_users():
+        return await db.users.find({}, {"password": 0}).to_list(1000) if is_admin else None
+    
+    stats, user_docs, bde_docs = await asyncio.gather(
+        load_stats(),
+        load_users(),
+        db.users.find({"role": UserRole.BDE}, {"password": 0}).to_list(1000)
+    )
+    
+    return Bootstrap(
+        user=current_user,
+        stats=stats,
+        users=[User(**user) for user in user_docs] if user_docs is not None else None,
+        bdes=[User(**user) for user in bde_docs]
+    )
+
 # User management routes
 @api_router.get("/users", response_model=List[User])
 async def get_users(current_user: User = Depends(check_permissions([UserRole.SUPER_ADMIN, UserRole.ADMIN]))):
+    if FAST_JSON_ENABLED:
+        return fast_json_list_response(db.users.find({}, {"password": 0, "_id": 0}).limit(1000), User)
+    
     users = await db.users.find({}, {"password": 0}).to_list(1000)
     return [User(**user) for user in users]
 
 @api_router.get("/users/bdes", response_model=List[User])
-async def get_bdes(current_user: User = Depends(get_current_user)):
+async def get_bdes(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    etag = await get_etag("bdes", current_user, ["users"])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    if FAST_JSON_ENABLED:
+        fast_response = fast_json_list_response(db.users.find({"role": UserRole.BDE}, {"password": 0, "_id": 0}).limit(1000), User)
+        set_etag_headers(fast_response, etag)
+        return fast_response
+    
     bdes = await db.users.find({"role": UserRole.BDE}, {"password": 0}).to_list(1000)
+    set_etag_headers(response, etag)
     return [User(**user) for user in bdes]
 
 @api_router.get("/users/{user_id}", response_model=User)
@@ -868,6 +2316,7 @@ async def update_user(user_id: str, user_data: UserUpdate, current_user: User =
         {"id": user_id},
         {"$set": update_dict}
     )
+    await bump_collection_versions("users")
     
     # Send notification
     await send_notification(f"👤 User {existing_user.name} updated by {current_user.name}")
@@ -923,6 +2372,7 @@ async def update_profile(profile_data: dict, current_user: User = Depends(get_cu
         {"id": current_user.id},
         {"$set": update_dict}
     )
+    await bump_collection_versions("users")
     
     # Get updated user
     updated_user_doc = await db.users.find_one({"id": current_user.id}, {"password": 0})
@@ -965,6 +2415,7 @@ async def google_callback(code_data: dict, current_user: User = Depends(get_curr
                 }
             }
         )
+        await bump_collection_versions("users")
         
         # Create "Client Tracker" folder in Google Drive
         drive_folder_url = await google_service.create_drive_folder(
@@ -1138,7 +2589,9 @@ async def notify_client_activity(user_id: str, activity: str, client_name: str =
 async def create_client_enhanced(client_data: ClientCreate, current_user: User = Depends(get_current_user)):
     """Create client with Google Workspace integration"""
     client = Client(**client_data.dict())
-    await db.clients.insert_one(client.dict())
+    await db.clients.insert_one({**client.dict(), **get_suggest_fields(client.dict())})
+    await bump_collection_versions("clients")
+    publish_client_event("client.created", client.dict())
     
     # Send notification
     await notify_client_activity(
@@ -1162,6 +2615,89 @@ async def create_client_enhanced(client_data: ClientCreate, current_user: User =
     
     return client
 
+# Health probes: liveness only says the process answers, readiness says it can serve traffic
+HEALTH_CHECK_TIMEOUT_SECONDS = 2
+PROCESS_STARTED_AT = datetime.utcnow()
+# build_indexes, started at startup and again when readiness finds indexes missing
+index_build_task: Optional[asyncio.Task] = None
+# "collection.index_name" -> error from this worker's last ensure_indexes
+index_build_errors: Dict[str, str] = {}
+
+def get_index_name(keys: List[Tuple[str, Any]], options: dict) -> str:
+    # create_index's default name, e.g. "assigned_bde_1_stage_1"
+    return options.get("name") or "_".join(f"{field}_{direction}" for field, direction in keys)
+
+async def get_missing_indexes() -> List[str]:
+    expected: Dict[str, set] = {}
+    for collection, keys, options in INDEXES:
+        expected.setdefault(collection, set()).add(get_index_name(keys, options))
+    
+    collections = list(expected)
+    existing = await asyncio.gather(*(db[collection].index_information() for collection in collections))
+    return [
+        f"{collection}.{name}"
+        for collection, indexes in zip(collections, existing)
+        for name in sorted(expected[collection] - set(indexes))
+    ]
+
+def get_integration_status() -> Dict[str, Any]:
+    """Optional integrations; reported for operators, never a reason to be unready"""
+    return {
+        "google": GOOGLE_ENABLED and bool(os.environ.get('GOOGLE_CLIENT_ID')),
+        "slack": bool(os.environ.get('SLACK_WEBHOOK_URL')),
+        "attachment_storage": attachment_storage.name,
+        "thumbnails": PIL_AVAILABLE,
+        "profiling": PYINSTRUMENT_AVAILABLE,
+        "fast_json": FAST_JSON_ENABLED,
+        "worker_bus": worker_bus.running,
+    }
+
+@api_router.get("/health/live")
+async def health_live():
+    return {"status": "alive", "uptime_seconds": round((datetime.utcnow() - PROCESS_STARTED_AT).total_seconds())}
+
+@api_router.get("/health/ready")
+async def health_ready():
+    """200 once Mongo answers and the index build has run, 503 (with the reason) until then.
+    
+    Indexes that failed to build (e.g. a conflicting existing index) are reported
+    but don't hold readiness back; the app works without them, only slower.
+    """
+    global index_build_task
+    checks: Dict[str, Any] = {}
+    ready = True
+    
+    try:
+        started = datetime.utcnow()
+        await asyncio.wait_for(db.command("ping"), HEALTH_CHECK_TIMEOUT_SECONDS)
+        checks["mongo"] = {"ok": True, "latency_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 1)}
+    except Exception as e:
+        checks["mongo"] = {"ok": False, "error": str(e) or type(e).__name__}
+        ready = False
+    
+    if ready and index_build_task is not None and not index_build_task.done():
+        checks["indexes"] = {"ok": False, "building": True}
+        ready = False
+    elif ready:
+        try:
+            missing = await asyncio.wait_for(get_missing_indexes(), HEALTH_CHECK_TIMEOUT_SECONDS)
+            failed = {name: index_build_errors[name] for name in missing if name in index_build_errors}
+            checks["indexes"] = {"ok": not missing, "missing": missing, "failed": failed}
+            # Not built yet, or dropped since: build again. Failures would only fail again
+            if index_build_task is None:
+                ready = not missing
+            if len(failed) < len(missing):
+                index_build_task = asyncio.create_task(build_indexes())
+        except Exception as e:
+            checks["indexes"] = {"ok": False, "error": str(e) or type(e).__name__}
+            ready = False
+    
+    checks["integrations"] = get_integration_status()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "unavailable", **checks}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -1172,6 +2708,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware, controller=profiling_controller, authorize=authorize_profiling, save=save_profile)
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Values owned by other modules, read at scrape time
+CallbackGauge("event_stream_subscribers", "Open /stream connections", lambda: len(event_broker.subscribers))
+CallbackGauge("event_stream_backlog", "Live-update events queued for subscribers", lambda: event_broker.backlog)
+CallbackGauge("thumbnail_jobs_pending", "Thumbnails waiting to be rendered", lambda: len(thumbnail_service.pending))
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint. Served on the API port only; nginx doesn't proxy it"""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+# Long-running jobs started at startup, cancelled at shutdown
+background_tasks: List[asyncio.Task] = []
 
 # Configure logging
 logging.basicConfig(
@@ -1179,7 +2731,134 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# Every worker imports this module, after uvicorn has set up its loggers
+logging.getLogger("uvicorn.access").addFilter(AccessLogTokenFilter())
+
+# (collection, keys, options) created at startup; create_index is a no-op when the index exists
+INDEXES = [
+    ("clients", [("updated_at", 1), ("id", 1)], {}),
+    ("clients", [("assigned_bde", 1), ("updated_at", 1), ("id", 1)], {}),
+    ("clients", [("assigned_bde", 1), ("stage", 1), ("last_interaction", -1)], {}),
+    ("clients", [("stage", 1), ("last_interaction", -1)], {}),
+    *[("clients", [(lower_field, 1)], {}) for lower_field in SUGGEST_FIELDS.values()],
+    *[("clients", [("assigned_bde", 1), (lower_field, 1)], {}) for lower_field in SUGGEST_FIELDS.values()],
+    ("clients", *get_search_index()),
+    ("tasks", [("updated_at", 1), ("id", 1)], {}),
+    ("tasks", [("client_id", 1), ("created_at", -1)], {}),
+    ("stage_changes", [("client_id", 1), ("changed_at", -1)], {}),
+    ("tombstones", [("deleted_at", 1)], {"expireAfterSeconds": TOMBSTONE_RETENTION_DAYS * 24 * 3600}),
+    ("tombstones", [("deleted_at", 1), ("id", 1)], {}),
+    ("profiles", [("created_at", 1)], {"expireAfterSeconds": PROFILE_RETENTION_DAYS * 24 * 3600}),
+]
+
+# Building the text index on a large collection takes a while; a builder that
+# dies leaves the lease behind for this long
+INDEX_BUILD_LEASE_SECONDS = 600
+INDEX_BUILD_RETRY_SECONDS = 5
+
+async def build_indexes():
+    """Background: ensure_indexes in one worker while the others wait for it to finish.
+    
+    Retries until Mongo is reachable; readiness reports 503 until this returns.
+    A waiting worker that still finds indexes missing once the lease is free runs
+    ensure_indexes itself, which is quick for the ones that exist and records the
+    errors of those that don't.
+    """
+    lease = LeaderLease(db, "index_build", lease_seconds=INDEX_BUILD_LEASE_SECONDS)
+    while True:
+        try:
+            if not await get_missing_indexes():
+                return
+            if await lease.try_acquire():
+                try:
+                    await ensure_indexes()
+                finally:
+                    await lease.release()
+                return
+        except Exception as e:
+            logger.error(f"Error building indexes, retrying: {e}")
+        await asyncio.sleep(INDEX_BUILD_RETRY_SECONDS)
+
+@app.on_event("startup")
+async def start_index_build():
+    # Not awaited: the probes answer (503 until done) while indexes build
+    global index_build_task
+    index_build_task = asyncio.create_task(build_indexes())
+
+async def ensure_indexes():
+    index_build_errors.clear()
+    for collection, keys, options in INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
+        except Exception as e:
+            logger.error(f"Error creating index {keys} on {collection}: {e}")
+            index_build_errors[f"{collection}.{get_index_name(keys, options)}"] = str(e) or type(e).__name__
+    
+    # Collections whose documents the backfills changed; cached ETags and facets go stale
+    backfilled = set()
+    
+    # Documents written before updated_at existed start from their last known activity
+    try:
+        result = await db.clients.update_many({"updated_at": {"$exists": False}}, [{"$set": {"updated_at": "$last_interaction"}}])
+        if result.modified_count:
+            backfilled.add("clients")
+        result = await db.tasks.update_many({"updated_at": {"$exists": False}}, [{"$set": {"updated_at": "$created_at"}}])
+        if result.modified_count:
+            backfilled.add("tasks")
+    except Exception as e:
+        logger.error(f"Error backfilling updated_at: {e}")
+    
+    try:
+        result = await db.clients.update_many({"company_name_lower": {"$exists": False}}, [{"$set": {
+            lower_field: {"$toLower": {"$trim": {"input": {"$ifNull": [f"${field}", ""]}}}}
+            for field, lower_field in SUGGEST_FIELDS.items()
+        }}])
+        if result.modified_count:
+            backfilled.add("clients")
+    except Exception as e:
+        logger.error(f"Error backfilling suggest fields: {e}")
+    
+    if backfilled:
+        await bump_collection_versions(*sorted(backfilled))
+
+# With several workers (WEB_CONCURRENCY) or nodes on one database, live-update events
+# and profiling triggers are shared between them over the worker bus
+WORKER_BUS_ENABLED = os.environ.get(
+    'WORKER_BUS_ENABLED',
+    'true' if int(os.environ.get('WEB_CONCURRENCY', 1)) > 1 else 'false'
+).lower() == 'true'
+
+@app.on_event("startup")
+async def start_background_jobs():
+    # Catches synchronous calls (bcrypt, requests, googleapiclient) that stall every request.
+    # Runs in every worker: each has its own event loop to block
+    if os.environ.get('LOOP_MONITOR_ENABLED', 'true').lower() == 'true':
+        background_tasks.append(asyncio.create_task(loop_monitor.run()))
+    
+    if WORKER_BUS_ENABLED:
+        worker_bus.subscribe("events", event_broker.publish_remote)
+        worker_bus.subscribe("profiling", profiling_controller.apply_remote)
+        event_broker.relay = lambda event: worker_bus.publish_nowait("events", event)
+        profiling_controller.relay = lambda message: worker_bus.publish_nowait("profiling", message)
+        background_tasks.append(asyncio.create_task(worker_bus.run(db)))
+    
+    # Deleted clients leave their files behind; sweep them up periodically if configured.
+    # One sweeper at a time: per host for local disk, one overall for shared (S3) storage
+    upload_gc_interval_hours = os.environ.get('UPLOAD_GC_INTERVAL_HOURS')
+    if upload_gc_interval_hours:
+        upload_gc = UploadGarbageCollector(db, attachment_storage, PARTIAL_UPLOAD_DIRECTORY)
+        lease_name = f"upload_gc:{socket.gethostname()}" if attachment_storage.name == "local" else "upload_gc"
+        background_tasks.append(asyncio.create_task(run_as_leader(db, lease_name, lambda: upload_gc.run_periodically(
+            float(upload_gc_interval_hours),
+            quarantine=os.environ.get('UPLOAD_GC_QUARANTINE', 'false').lower() == 'true'
+        ))))
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    tasks = [*background_tasks, *([index_build_task] if index_build_task else [])]
+    for task in tasks:
+        task.cancel()
+    # Let them finish cleaning up (e.g. releasing leases) while the client is still open
+    await asyncio.gather(*tasks, return_exceptions=True)
     client.close()
+    thumbnail_service.shutdown()
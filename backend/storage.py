@@ -0,0 +1,359 @@
+import os
+import shutil
+import asyncio
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB parts for S3 multipart uploads
+
+# Working folders inside the upload directory that are never attachments themselves
+LOCAL_ONLY_DIRECTORIES = {".partial", ".cache"}
+
+
+class InvalidStorageKey(ValueError):
+    """A key that would escape the storage root (absolute, "..", backslashes)"""
+
+
+def validate_key(key: str) -> str:
+    """Keys are relative paths of plain names, e.g. <uuid>.pdf or .thumbnails/<uuid>.jpg"""
+    if "\\" in key or "\0" in key or any(part in ("", ".", "..") for part in key.split("/")):
+        raise InvalidStorageKey(f"Invalid storage key: {key!r}")
+    return key
+
+
+@dataclass
+class StoredFile:
+    key: str
+    size: int
+    modified_at: datetime
+
+
+class AttachmentStorage(ABC):
+    """Where attachment bytes live. Keys are the unique filenames stored on FileAttachment.
+
+    Every method taking a key raises InvalidStorageKey for keys that could
+    point outside the storage (see validate_key).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def save(self, key: str, fileobj: BinaryIO, content_type: str) -> int:
+        """Stream a file object into storage and return the number of bytes written"""
+
+    @abstractmethod
+    async def save_file(self, key: str, path: Path, content_type: str) -> int:
+        """Move a local file into storage (the source is consumed) and return its size"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def move(self, key: str, new_key: str) -> None:
+        ...
+
+    @abstractmethod
+    def iter_chunks(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        ...
+
+    @abstractmethod
+    def list_files(self) -> AsyncIterator[StoredFile]:
+        ...
+
+    async def get_download_url(self, key: str, download_name: Optional[str] = None) -> Optional[str]:
+        """A URL the browser can fetch directly, or None if downloads must go through the API"""
+        return None
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path on this machine's disk if the backend is file based, otherwise None"""
+        return None
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        """Yield a readable local path for tools that need one (e.g. thumbnail rendering)"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / Path(key).name
+            with open(temp_path, "wb") as buffer:
+                async for chunk in self.iter_chunks(key):
+                    await asyncio.to_thread(buffer.write, chunk)
+            yield temp_path
+
+
+class LocalFileStorage(AttachmentStorage):
+    """Files under a local directory. Disk I/O runs in a thread, like S3Storage's
+    boto3 calls, so a large upload or download doesn't stall the event loop"""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def local_path(self, key: str) -> Path:
+        return self.root / validate_key(key)
+
+    def _save(self, file_path: Path, fileobj: BinaryIO) -> int:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer)
+        return file_path.stat().st_size
+
+    def _save_file(self, file_path: Path, path: Path) -> int:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # shutil.move is a cheap rename when the source is on the same filesystem
+        shutil.move(str(path), str(file_path))
+        return file_path.stat().st_size
+
+    def _move(self, path: Path, new_path: Path) -> None:
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, new_path)
+
+    def _list_directory(self, dirpath: str, filenames: List[str]) -> List[StoredFile]:
+        files = []
+        for filename in filenames:
+            file_path = Path(dirpath) / filename
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            files.append(StoredFile(
+                key=file_path.relative_to(self.root).as_posix(),
+                size=stat.st_size,
+                modified_at=datetime.utcfromtimestamp(stat.st_mtime)
+            ))
+        return files
+
+    async def save(self, key: str, fileobj: BinaryIO, content_type: str) -> int:
+        return await asyncio.to_thread(self._save, self.local_path(key), fileobj)
+
+    async def save_file(self, key: str, path: Path, content_type: str) -> int:
+        return await asyncio.to_thread(self._save_file, self.local_path(key), path)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self.local_path(key).is_file)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.local_path(key).unlink, missing_ok=True)
+
+    async def move(self, key: str, new_key: str) -> None:
+        await asyncio.to_thread(self._move, self.local_path(key), self.local_path(new_key))
+
+    async def iter_chunks(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self.local_path(key), "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            f.close()
+
+    async def list_files(self) -> AsyncIterator[StoredFile]:
+        # One directory per thread hop: the walk itself and every stat hit the disk
+        walk = os.walk(self.root)
+        while (entry := await asyncio.to_thread(next, walk, None)) is not None:
+            dirpath, dirnames, filenames = entry
+            if Path(dirpath) == self.root:
+                dirnames[:] = [d for d in dirnames if d not in LOCAL_ONLY_DIRECTORIES]
+            for stored_file in await asyncio.to_thread(self._list_directory, dirpath, filenames):
+                yield stored_file
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        # Already on disk, no copy needed
+        yield self.local_path(key)
+
+
+class _CountingReader:
+    """Wraps a file object so we know how many bytes were streamed to S3"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class S3Storage(AttachmentStorage):
+    """S3-compatible storage (AWS S3, MinIO, ...) with presigned downloads"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        presign_expire_seconds: int = 900
+    ):
+        if not BOTO3_AVAILABLE:
+            raise RuntimeError("boto3 is required for S3 attachment storage")
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.presign_expire_seconds = presign_expire_seconds
+
+        # MinIO and most S3 stand-ins only support path-style addressing
+        client_kwargs = {
+            "region_name": region_name,
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key,
+            "config": Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        }
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_kwargs)
+
+        # Presigned URLs must point at an address the browser can reach, which may
+        # differ from the one the API uses inside the cluster
+        if public_endpoint_url and public_endpoint_url != endpoint_url:
+            self.presign_client = boto3.client("s3", endpoint_url=public_endpoint_url, **client_kwargs)
+        else:
+            self.presign_client = self.client
+
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE
+        )
+
+    def object_key(self, key: str) -> str:
+        validate_key(key)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def save(self, key: str, fileobj: BinaryIO, content_type: str) -> int:
+        # upload_fileobj reads the stream in parts and switches to a multipart upload
+        # for large files, so the whole file is never held in memory
+        reader = _CountingReader(fileobj)
+        await asyncio.to_thread(
+            self.client.upload_fileobj,
+            reader,
+            self.bucket,
+            self.object_key(key),
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config
+        )
+        return reader.bytes_read
+
+    async def save_file(self, key: str, path: Path, content_type: str) -> int:
+        file_size = path.stat().st_size
+        await asyncio.to_thread(
+            self.client.upload_file,
+            str(path),
+            self.bucket,
+            self.object_key(key),
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config
+        )
+        path.unlink(missing_ok=True)
+        return file_size
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=self.object_key(key))
+
+    async def move(self, key: str, new_key: str) -> None:
+        # S3 has no rename; copy server-side and then delete the original
+        await asyncio.to_thread(
+            self.client.copy,
+            {"Bucket": self.bucket, "Key": self.object_key(key)},
+            self.bucket,
+            self.object_key(new_key),
+            Config=self.transfer_config
+        )
+        await self.delete(key)
+
+    async def iter_chunks(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=self.object_key(key))
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def list_files(self) -> AsyncIterator[StoredFile]:
+        list_kwargs: Dict[str, Any] = {"Bucket": self.bucket}
+        if self.prefix:
+            list_kwargs["Prefix"] = f"{self.prefix}/"
+
+        while True:
+            page = await asyncio.to_thread(self.client.list_objects_v2, **list_kwargs)
+            for obj in page.get("Contents", []):
+                key = obj["Key"][len(self.prefix) + 1:] if self.prefix else obj["Key"]
+                yield StoredFile(
+                    key=key,
+                    size=obj["Size"],
+                    modified_at=obj["LastModified"].replace(tzinfo=None)
+                )
+            if not page.get("IsTruncated"):
+                break
+            list_kwargs["ContinuationToken"] = page["NextContinuationToken"]
+
+    async def get_download_url(self, key: str, download_name: Optional[str] = None) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": self.object_key(key)}
+        if download_name:
+            params["ResponseContentDisposition"] = f'attachment; filename="{download_name}"'
+        # Presigning is a local HMAC computation, no network round trip
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=self.presign_expire_seconds
+        )
+
+
+def create_storage_from_env(default_root: Path) -> AttachmentStorage:
+    """Pick the storage backend from ATTACHMENT_STORAGE (local or s3)"""
+    backend = os.environ.get("ATTACHMENT_STORAGE", "local").lower()
+
+    if backend == "s3":
+        storage = S3Storage(
+            bucket=os.environ["S3_BUCKET"],
+            prefix=os.environ.get("S3_PREFIX", ""),
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL"),
+            public_endpoint_url=os.environ.get("S3_PUBLIC_ENDPOINT_URL"),
+            region_name=os.environ.get("S3_REGION"),
+            access_key_id=os.environ.get("S3_ACCESS_KEY_ID"),
+            secret_access_key=os.environ.get("S3_SECRET_ACCESS_KEY"),
+            presign_expire_seconds=int(os.environ.get("S3_PRESIGN_EXPIRE_SECONDS", 900))
+        )
+        logger.info(f"Attachment storage: S3 bucket {storage.bucket}")
+        return storage
+
+    if backend != "local":
+        raise ValueError(f"Unknown ATTACHMENT_STORAGE backend: {backend}")
+
+    return LocalFileStorage(default_root)
@@ -0,0 +1,147 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import pymupdf  # Used to rasterize the first page of PDFs
+    PDF_PREVIEW_AVAILABLE = PIL_AVAILABLE
+except ImportError:
+    PDF_PREVIEW_AVAILABLE = False
+
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_DIRECTORY_NAME = ".thumbnails"
+
+IMAGE_FILE_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"}
+PDF_FILE_TYPES = {"application/pdf"}
+
+
+def can_generate_thumbnail(file_type: str) -> bool:
+    """Check whether a preview can be rendered for this content type"""
+    if file_type in IMAGE_FILE_TYPES:
+        return PIL_AVAILABLE
+    if file_type in PDF_FILE_TYPES:
+        return PDF_PREVIEW_AVAILABLE
+    return False
+
+
+def get_thumbnail_key(filename: str) -> str:
+    """Thumbnails live in a hidden folder next to the originals"""
+    return f"{THUMBNAIL_DIRECTORY_NAME}/{Path(filename).stem}.jpg"
+
+
+def generate_thumbnail(source_path: str, thumbnail_path: str, file_type: str) -> bool:
+    """Render a downscaled JPEG preview. Runs in a worker process, so it must stay picklable"""
+    try:
+        if file_type in PDF_FILE_TYPES:
+            with pymupdf.open(source_path) as document:
+                if document.page_count == 0:
+                    return False
+                page = document.load_page(0)
+                # Render just big enough for the thumbnail instead of at full resolution
+                zoom = min(THUMBNAIL_SIZE[0] / page.rect.width, THUMBNAIL_SIZE[1] / page.rect.height) * 2
+                pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+                image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        else:
+            image = Image.open(source_path)
+            # JPEG decoders can downscale while decoding, which is much cheaper than a full decode
+            image.draft("RGB", THUMBNAIL_SIZE)
+
+        image.thumbnail(THUMBNAIL_SIZE)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        # Write to a temp name first so readers never see a half-written thumbnail
+        temp_path = f"{thumbnail_path}.tmp"
+        image.save(temp_path, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+        os.replace(temp_path, thumbnail_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error generating thumbnail for {source_path}: {e}")
+        return False
+
+
+# Render processes per API worker: each uvicorn worker (WEB_CONCURRENCY) starts its own pool,
+# so by default they split the cores between them
+DEFAULT_THUMBNAIL_WORKERS = min(4, max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1))))
+
+
+class ThumbnailService:
+    def __init__(self):
+        self.max_workers = int(os.environ.get('THUMBNAIL_WORKERS', DEFAULT_THUMBNAIL_WORKERS))
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending: Dict[str, asyncio.Future] = {}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use so idle API workers don't pay for them"""
+        if self.executor is None:
+            # Not fork: a child forked while one of our threads (Motor's executor, the loop
+            # monitor) holds a lock, e.g. the logging lock, would deadlock on it
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return self.executor
+
+    async def _render(self, storage, filename: str, file_type: str) -> bool:
+        loop = asyncio.get_running_loop()
+        async with storage.local_copy(filename) as source_path:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                thumbnail_path = Path(temp_dir) / "thumbnail.jpg"
+                generated = await loop.run_in_executor(
+                    self.get_executor(),
+                    generate_thumbnail,
+                    str(source_path),
+                    str(thumbnail_path),
+                    file_type
+                )
+                if generated:
+                    await storage.save_file(get_thumbnail_key(filename), thumbnail_path, "image/jpeg")
+        return generated
+
+    def generate(self, storage, filename: str, file_type: str) -> "asyncio.Future[bool]":
+        """Queue thumbnail generation, sharing the job if one is already running for this file"""
+        if filename in self.pending:
+            return self.pending[filename]
+
+        future = asyncio.ensure_future(self._render(storage, filename, file_type))
+        self.pending[filename] = future
+        future.add_done_callback(lambda _: self.pending.pop(filename, None))
+        return future
+
+    def schedule(self, storage, filename: str, file_type: str) -> None:
+        """Fire-and-forget generation after an upload; failures are only logged"""
+        if not can_generate_thumbnail(file_type):
+            return
+
+        try:
+            future = self.generate(storage, filename, file_type)
+            future.add_done_callback(self._log_failure)
+        except Exception as e:
+            logger.error(f"Error scheduling thumbnail for {filename}: {e}")
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception():
+            logger.error(f"Thumbnail worker failed: {future.exception()}")
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+# Global instance
+thumbnail_service = ThumbnailService()
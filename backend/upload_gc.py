@@ -0,0 +1,142 @@
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Set, Union
+
+from thumbnails import THUMBNAIL_DIRECTORY_NAME
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_DIRECTORY_NAME = ".quarantine"
+DEFAULT_GRACE_PERIOD_HOURS = 24
+
+
+def get_reference_key(filename: str) -> Union[bytes, str]:
+    """Compact form of a stored filename for the reference set.
+
+    Uploads are named "<uuid4><ext>", so the 16 raw UUID bytes identify them
+    (and their thumbnail, which shares the stem) at a fraction of the memory
+    of the full string. Anything else falls back to the plain name.
+    """
+    stem = Path(filename).stem
+    try:
+        return uuid.UUID(stem).bytes
+    except ValueError:
+        return filename
+
+
+class UploadGarbageCollector:
+    def __init__(self, db, storage, partial_upload_directory: Path):
+        self.db = db
+        self.storage = storage
+        self.partial_upload_directory = partial_upload_directory
+
+    async def collect_references(self) -> Set[Union[bytes, str]]:
+        """Stream every client and gather the files its attachments and note attachments point to"""
+        references: Set[Union[bytes, str]] = set()
+        projection = {"_id": 0, "attachments.filename": 1, "notes.attachments.filename": 1}
+
+        async for client_doc in self.db.clients.find({}, projection, batch_size=500):
+            for attachment in client_doc.get("attachments", []):
+                if attachment.get("filename"):
+                    references.add(get_reference_key(attachment["filename"]))
+            for note in client_doc.get("notes", []):
+                # Legacy plain-string notes have no attachments
+                if not isinstance(note, dict):
+                    continue
+                for attachment in note.get("attachments", []):
+                    if attachment.get("filename"):
+                        references.add(get_reference_key(attachment["filename"]))
+
+        return references
+
+    async def collect_expired_upload_sessions(self, dry_run: bool) -> Dict[str, int]:
+        """Drop resumable uploads that were abandoned past their expiry"""
+        sessions = 0
+        reclaimed_bytes = 0
+
+        async for session_doc in self.db.upload_sessions.find({"expires_at": {"$lt": datetime.utcnow()}}, {"_id": 0, "id": 1}):
+            partial_path = self.partial_upload_directory / f"{session_doc['id']}.part"
+            if partial_path.exists():
+                reclaimed_bytes += partial_path.stat().st_size
+                if not dry_run:
+                    partial_path.unlink(missing_ok=True)
+            if not dry_run:
+                await self.db.upload_sessions.delete_one({"id": session_doc["id"]})
+            sessions += 1
+
+        return {"expired_upload_sessions": sessions, "expired_upload_bytes": reclaimed_bytes}
+
+    async def run(
+        self,
+        grace_period_hours: float = DEFAULT_GRACE_PERIOD_HOURS,
+        quarantine: bool = False,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Delete (or quarantine) stored files no client references that are older than the grace period"""
+        started_at = datetime.utcnow()
+        # Files newer than this may belong to an upload whose client/note update hasn't landed yet
+        cutoff = started_at - timedelta(hours=grace_period_hours)
+
+        references = await self.collect_references()
+
+        report: Dict[str, Any] = {
+            "dry_run": dry_run,
+            "quarantine": quarantine,
+            "grace_period_hours": grace_period_hours,
+            "referenced_files": len(references),
+            "scanned_files": 0,
+            "orphaned_files": 0,
+            "skipped_recent_files": 0,
+            "reclaimed_bytes": 0,
+            "errors": 0,
+        }
+
+        async for stored_file in self.storage.list_files():
+            # Already quarantined files are left for an operator to inspect
+            if stored_file.key.startswith(f"{QUARANTINE_DIRECTORY_NAME}/"):
+                continue
+
+            report["scanned_files"] += 1
+            if get_reference_key(stored_file.key) in references:
+                continue
+
+            if stored_file.modified_at > cutoff:
+                report["skipped_recent_files"] += 1
+                continue
+
+            report["orphaned_files"] += 1
+            report["reclaimed_bytes"] += stored_file.size
+            if dry_run:
+                continue
+
+            try:
+                if quarantine and not stored_file.key.startswith(f"{THUMBNAIL_DIRECTORY_NAME}/"):
+                    await self.storage.move(stored_file.key, f"{QUARANTINE_DIRECTORY_NAME}/{stored_file.key}")
+                else:
+                    # Thumbnails can always be regenerated, so they are never worth quarantining
+                    await self.storage.delete(stored_file.key)
+            except Exception as e:
+                report["errors"] += 1
+                logger.error(f"Error collecting orphaned upload {stored_file.key}: {e}")
+
+        report.update(await self.collect_expired_upload_sessions(dry_run))
+        report["reclaimed_bytes"] += report["expired_upload_bytes"]
+        report["duration_seconds"] = round((datetime.utcnow() - started_at).total_seconds(), 3)
+
+        logger.info(
+            f"Upload GC {'(dry run) ' if dry_run else ''}found {report['orphaned_files']} orphaned files "
+            f"of {report['scanned_files']}, reclaimed {report['reclaimed_bytes']} bytes"
+        )
+        return report
+
+    async def run_periodically(self, interval_hours: float, **options) -> None:
+        """Background loop for UPLOAD_GC_INTERVAL_HOURS; one failed pass doesn't stop the next"""
+        while True:
+            await asyncio.sleep(interval_hours * 3600)
+            try:
+                await self.run(**options)
+            except Exception as e:
+                logger.error(f"Upload GC failed: {e}")
@@ -0,0 +1,116 @@
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Set
+
+from bson import ObjectId
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+logger = logging.getLogger(__name__)
+
+WORKER_BUS_COLLECTION = "worker_events"
+# Messages are small and consumed within a second; the cap only has to cover a reconnect
+WORKER_BUS_SIZE_BYTES = 8 * 1024 * 1024
+RECONNECT_DELAY_SECONDS = 1
+
+# Unique per process, also across containers sharing one database
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkerBus:
+    """Pub/sub between API workers (and nodes) over a capped Mongo collection.
+
+    Every worker tails the collection and hands each message from another
+    worker to the handler subscribed to its topic. A tailable cursor on a
+    capped collection works on any mongod; change streams would need a
+    replica set. Delivery is best effort: a worker that was down misses what
+    was published meanwhile, so only use it for state that is rebuilt or
+    expires on its own.
+    """
+
+    def __init__(self, collection_name: str = WORKER_BUS_COLLECTION, size_bytes: int = WORKER_BUS_SIZE_BYTES):
+        self.collection_name = collection_name
+        self.size_bytes = size_bytes
+        self.worker_id = WORKER_ID
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self.db = None  # Set while run() is running; publishing is a no-op otherwise
+        self.pending: Set[asyncio.Task] = set()
+
+    def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self.handlers[topic] = handler
+
+    @property
+    def running(self) -> bool:
+        return self.db is not None
+
+    async def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        if not self.running:
+            return
+        await self.db[self.collection_name].insert_one({
+            "topic": topic,
+            "origin": self.worker_id,
+            "payload": payload,
+            "at": datetime.utcnow(),
+        })
+
+    def publish_nowait(self, topic: str, payload: Dict[str, Any]) -> None:
+        """Publish from synchronous code without waiting for the write"""
+        if not self.running:
+            return
+        task = asyncio.get_running_loop().create_task(self.publish(topic, payload))
+        self.pending.add(task)
+        task.add_done_callback(self._publish_done)
+
+    def _publish_done(self, task: asyncio.Task) -> None:
+        self.pending.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Error publishing to the worker bus: {task.exception()}")
+
+    async def ensure_collection(self, db) -> None:
+        try:
+            await db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass  # Another worker created it first
+
+    async def run(self, db) -> None:
+        """Background loop: tail the collection until cancelled, reconnecting if the cursor dies"""
+        collection = db[self.collection_name]
+        # Only messages from now on; the (tiny) overlap with the current second is harmless
+        last_id = ObjectId.from_datetime(datetime.utcnow())
+        try:
+            while True:
+                try:
+                    if not self.running:
+                        await self.ensure_collection(db)
+                        self.db = db
+                        # A tailable cursor that matches nothing dies at once; give it something to find
+                        await self.publish("worker.started", {})
+                    cursor = collection.find({"_id": {"$gt": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                    while cursor.alive:
+                        async for message in cursor:
+                            last_id = message["_id"]
+                            self.dispatch(message)
+                except Exception as e:
+                    logger.error(f"Worker bus cursor failed, reconnecting: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+        finally:
+            self.db = None
+
+    def dispatch(self, message: Dict[str, Any]) -> None:
+        if message.get("origin") == self.worker_id:
+            return
+        handler = self.handlers.get(message.get("topic"))
+        if handler is None:
+            return
+        try:
+            handler(message.get("payload", {}))
+        except Exception as e:
+            logger.error(f"Error handling worker bus message {message.get('topic')}: {e}")
+
+
+# Global instance
+worker_bus = WorkerBus()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+API Load Benchmark
+Replays a realistic mix of requests (login, client list, board, board drag,
+note add, dashboard) from concurrent virtual users against a running API
+seeded by seed_data.py, and writes throughput and p50/p95/p99 latency per
+endpoint as JSON so runs can be compared between commits
+
+Usage (needs backend/requirements-dev.txt):
+    python benchmarks/load_test.py --base-url http://localhost:8001 --duration 60 --output after.json
+    python benchmarks/load_test.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent))
+
+from synthetic import ADMIN_EMAIL, BENCHMARK_PASSWORD, bde_email
+
+# Relative weight of each action in the mix
+REQUEST_MIX = {
+    "login": 5,
+    "list_clients": 15,
+    "client_detail": 10,
+    "board": 15,
+    "board_drag": 15,
+    "add_note": 15,
+    "dashboard": 25,
+}
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def record(self, name: str, seconds: float, ok: bool):
+        if not self.recording:
+            return
+        self.latencies[name].append(seconds * 1000)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, duration: float) -> Dict[str, Dict[str, float]]:
+        endpoints = {}
+        for name in sorted(self.latencies):
+            endpoints[name] = summarize(self.latencies[name], self.errors[name], duration)
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        endpoints["all"] = summarize(all_latencies, sum(self.errors.values()), duration)
+        return endpoints
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, float]:
+    if len(latencies) < 2:
+        return {"requests": len(latencies), "errors": errors, "throughput_rps": len(latencies) / duration}
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / duration, 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(cut_points[49], 2),
+        "p95_ms": round(cut_points[94], 2),
+        "p99_ms": round(cut_points[98], 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+class VirtualUser:
+    """One logged-in user repeatedly picking an action from REQUEST_MIX"""
+
+    def __init__(self, http: httpx.AsyncClient, email: str, stats: LoadStats, rng: random.Random):
+        self.http = http
+        self.email = email
+        self.stats = stats
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+        self.client_ids: List[str] = []
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(name, time.perf_counter() - started, ok=False)
+            return None
+        self.stats.record(name, time.perf_counter() - started, ok=response.status_code < 400)
+        return response
+
+    async def login(self):
+        response = await self.request("login", "POST", "/api/auth/login", json={"email": self.email, "password": BENCHMARK_PASSWORD})
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def start(self):
+        await self.login()
+        # The board's first cards are the clients this user would realistically touch
+        response = await self.request("board", "GET", "/api/board")
+        if response is not None and response.status_code == 200:
+            self.client_ids = [card["id"] for column in response.json()["columns"] for card in column["cards"]]
+
+    async def step(self):
+        action = self.rng.choices(list(REQUEST_MIX), weights=list(REQUEST_MIX.values()))[0]
+        client_id = self.rng.choice(self.client_ids) if self.client_ids else None
+
+        if action == "login":
+            await self.login()
+        elif action == "list_clients":
+            await self.request(action, "GET", "/api/clients")
+        elif action == "board":
+            await self.request(action, "GET", "/api/board")
+        elif action == "dashboard":
+            await self.request(action, "GET", "/api/dashboard/stats")
+        elif client_id is None:
+            return
+        elif action == "client_detail":
+            await self.request(action, "GET", f"/api/clients/{client_id}")
+        elif action == "board_drag":
+            await self.request(action, "PUT", f"/api/clients/{client_id}", json={"stage": self.rng.randint(1, 5)})
+        elif action == "add_note":
+            await self.request(action, "POST", f"/api/clients/{client_id}/notes", json={"text": "Load test follow-up note"})
+
+    async def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            await self.step()
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(endpoints: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None):
+    print(f"\n   {'endpoint':<15} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, result in endpoints.items():
+        line = (
+            f"   {name:<15} {result['throughput_rps']:>8.1f} {result.get('p50_ms', 0):>9.1f} "
+            f"{result.get('p95_ms', 0):>9.1f} {result.get('p99_ms', 0):>9.1f} {result['errors']:>7}"
+        )
+        previous = (baseline or {}).get(name)
+        if previous and previous.get("p95_ms") and result.get("p95_ms"):
+            change = (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"   p95 {change:+.0f}% vs baseline"
+        print(line)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay a realistic request mix and report latency percentiles")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--bdes", type=int, default=50, help="Seeded BDE accounts to spread users over")
+    parser.add_argument("--admin-ratio", type=float, default=0.2, help="Share of users logging in as the admin")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before that")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous JSON report to compare p95 against")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as http:
+        users = [
+            VirtualUser(
+                http,
+                ADMIN_EMAIL if rng.random() < args.admin_ratio else bde_email(rng.randrange(args.bdes)),
+                stats,
+                random.Random(rng.random())
+            )
+            for _ in range(args.users)
+        ]
+
+        print(f"🚀 {args.users} virtual users against {args.base_url} ({args.warmup:.0f}s warm-up, {args.duration:.0f}s measured)")
+        await asyncio.gather(*(user.start() for user in users))
+
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(user.run(warmup_deadline) for user in users))
+
+        stats.recording = True
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        await asyncio.gather(*(user.run(started + args.duration) for user in users))
+        duration = time.perf_counter() - started
+
+    report = {
+        "commit": get_git_commit(),
+        "started_at": started_at.isoformat(),
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration_seconds": round(duration, 2),
+        "mix": REQUEST_MIX,
+        "endpoints": stats.report(duration),
+    }
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["endpoints"]
+    print_report(report["endpoints"], baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n✅ Report written to {args.output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
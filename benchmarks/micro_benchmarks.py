@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmarks for Per-Request Python Costs
+Times the in-process work every request pays for (model validation, JWT
+handling, dashboard stats, response encoding) and fails when any of it is
+slower than the stored baseline by more than the tolerance
+
+Timings are stored relative to a fixed pure-Python calibration loop, timed
+right next to each benchmark, so a baseline recorded on one machine stays
+meaningful on a faster or slower (or busier) one
+
+Usage:
+    python benchmarks/micro_benchmarks.py                   # compare against micro_baseline.json
+    python benchmarks/micro_benchmarks.py --save-baseline   # after an intended change
+"""
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCHMARKS_DIR = Path(__file__).parent
+sys.path.append(str(BENCHMARKS_DIR))
+sys.path.append(str(BENCHMARKS_DIR.parent / 'backend'))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'benchmark')
+
+from fastapi.utils import create_response_field
+from jose import jwt
+
+import server
+from fast_json import ORJSON_AVAILABLE
+from serialization_benchmark import default_path, fast_path
+from synthetic import make_client_doc, make_task_doc, make_user_doc
+
+BASELINE_PATH = BENCHMARKS_DIR / "micro_baseline.json"
+DEFAULT_TOLERANCE = 0.5  # Shared CI runners jitter by ~30%; real regressions are usually 2x or worse
+MIN_RUN_SECONDS = 0.2  # Each round repeats the function for at least this long
+ROUNDS = 9
+
+def calibrate() -> float:
+    """Seconds for a fixed mix of dict, string and arithmetic work"""
+    def workload():
+        values = {}
+        for i in range(20_000):
+            values[f"key{i}"] = i * 3 % 7
+        return sum(len(key) for key in values)
+    return measure(workload)
+
+def measure(func: Callable[[], object]) -> float:
+    """Best seconds per call over ROUNDS rounds of back-to-back calls.
+
+    The minimum is the run least disturbed by the rest of the machine, which
+    makes it the most repeatable number to compare. Coroutine functions are
+    awaited inside one event loop, so only the awaited call itself is timed.
+    """
+    if inspect.iscoroutinefunction(func):
+        loop = asyncio.new_event_loop()
+
+        async def run_batch_async(iterations: int) -> float:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await func()
+            return time.perf_counter() - started
+
+        try:
+            return best_per_call(lambda iterations: loop.run_until_complete(run_batch_async(iterations)))
+        finally:
+            loop.close()
+
+    def run_batch(iterations: int) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return time.perf_counter() - started
+
+    return best_per_call(run_batch)
+
+def best_per_call(run_batch: Callable[[int], float]) -> float:
+    run_batch(1)  # warm caches
+    iterations = 1
+    while (elapsed := run_batch(iterations)) < MIN_RUN_SECONDS:
+        iterations *= 2
+
+    per_call = [elapsed / iterations]
+    for _ in range(ROUNDS - 1):
+        per_call.append(run_batch(iterations) / iterations)
+    return min(per_call)
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    user_doc = make_user_doc("bde0@benchmark.local", "BDE 0", "bde", "$2b$12$" + "x" * 53, now, rng)
+    user_doc["_id"] = uuid.uuid4().hex[:24]
+    user = server.User(**user_doc)
+
+    # A long-lived account: many notes, a mix of legacy strings and structured notes with attachments
+    large_client_doc = make_client_doc(0, user_doc, user_doc["id"], now, rng, notes_per_client=50)
+    large_client_doc["notes"] = ["Imported from the old spreadsheet"] * 10 + large_client_doc["notes"]
+
+    client_docs = [make_client_doc(i, user_doc, user_doc["id"], now, rng) for i in range(1000)]
+    task_docs = [make_task_doc(doc, now, rng) for doc in client_docs]
+
+    token = server.create_token({"sub": user.id})
+    response_field = create_response_field("Response_get_clients", List[server.Client])
+
+    benchmarks = {
+        "client_validation_large_notes": lambda: server.Client(**large_client_doc),
+        "user_construction": lambda: server.User(**user_doc),
+        "jwt_decode": lambda: jwt.decode(token, server.SECRET_KEY, algorithms=[server.ALGORITHM]),
+        "create_token": lambda: server.create_token({"sub": user.id}),
+        "dashboard_stats_1000_clients": lambda: server.summarize_dashboard_stats(client_docs, task_docs),
+        "encode_1000_clients_default": functools.partial(default_path, client_docs, response_field),
+    }
+    if ORJSON_AVAILABLE:
+        benchmarks["encode_1000_clients_fast"] = functools.partial(fast_path, client_docs)
+    return benchmarks
+
+def main():
+    parser = argparse.ArgumentParser(description="Time hot in-process code paths and compare them with a baseline")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    benchmarks = build_benchmarks()
+    if args.only:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.only in name}
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text())["relative"] if baseline_path.exists() and not args.save_baseline else {}
+
+    print(f"   {'benchmark':<32} {'time':>12} {'relative':>10} {'vs baseline':>12}")
+    results = {}
+    regressions = []
+    for name, func in benchmarks.items():
+        seconds = measure(func)
+        relative = seconds / calibrate()
+        results[name] = {"seconds": seconds, "relative": relative}
+
+        comparison = ""
+        if name in baseline:
+            change = relative / baseline[name] - 1
+            comparison = f"{change:+.0%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                comparison += " ❌"
+        print(f"   {name:<32} {seconds * 1000:>9.3f} ms {relative:>10.4g} {comparison:>12}")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps({
+            "recorded_at": datetime.utcnow().isoformat(),
+            "relative": {name: float(f"{result['relative']:.4g}") for name, result in results.items()},
+        }, indent=2) + "\n")
+        print(f"\n✅ Baseline saved to {baseline_path}")
+        return
+
+    if regressions:
+        print(f"\n❌ Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ Within {args.tolerance:.0%} of baseline" if baseline else "\n⚠️  No baseline yet; run with --save-baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark Data Seeder
+Fills a throwaway database with synthetic users, clients (with notes and
+attachment metadata) and tasks at 10k / 100k / 1M clients, then creates the
+same indexes the API creates at startup
+
+Usage:
+    python benchmarks/seed_data.py --scale 100k --drop
+    DB_NAME=crm_benchmark uvicorn server:app --port 8001   (from backend/)
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+
+from synthetic import (
+    ADMIN_EMAIL, BENCHMARK_PASSWORD, CLIENTS_PER_BDE, SCALES,
+    bde_email, make_client_doc, make_task_doc, make_user_doc
+)
+
+BATCH_SIZE = 2000
+
+class BenchmarkSeeder:
+    def __init__(self, db, rng: random.Random):
+        self.db = db
+        self.rng = rng
+        self.now = datetime.utcnow()
+
+    async def seed_users(self, bde_count: int, password_hash: str):
+        """A super admin, an admin and enough BDEs for CLIENTS_PER_BDE clients each"""
+        users = [
+            make_user_doc(ADMIN_EMAIL, "Benchmark Admin", "super_admin", password_hash, self.now, self.rng),
+            make_user_doc("manager@benchmark.local", "Benchmark Manager", "admin", password_hash, self.now, self.rng),
+        ] + [
+            make_user_doc(bde_email(n), f"BDE {n}", "bde", password_hash, self.now, self.rng)
+            for n in range(bde_count)
+        ]
+        await self.db.users.insert_many(users)
+        print(f"   👥 {len(users)} users ({bde_count} BDEs), password '{BENCHMARK_PASSWORD}'")
+        return users
+
+    async def seed_clients_and_tasks(self, client_count: int, users, tasks_per_client: int, notes_per_client: int):
+        bdes = [user for user in users if user["role"] == "bde"]
+        creators = [users[0]["id"], users[1]["id"]]
+        started = time.perf_counter()
+        task_count = 0
+
+        for batch_start in range(0, client_count, BATCH_SIZE):
+            clients = [
+                make_client_doc(
+                    index,
+                    bdes[index % len(bdes)],
+                    self.rng.choice(creators),
+                    self.now,
+                    self.rng,
+                    notes_per_client
+                )
+                for index in range(batch_start, min(batch_start + BATCH_SIZE, client_count))
+            ]
+            tasks = [
+                make_task_doc(client, self.now, self.rng)
+                for client in clients
+                for _ in range(self.rng.randint(0, tasks_per_client * 2))
+            ]
+            # Clients and tasks of a batch go in concurrently; order doesn't matter
+            await asyncio.gather(
+                self.db.clients.insert_many(clients, ordered=False),
+                self.db.tasks.insert_many(tasks, ordered=False) if tasks else asyncio.sleep(0)
+            )
+            task_count += len(tasks)
+
+            done = batch_start + len(clients)
+            rate = done / (time.perf_counter() - started)
+            print(f"\r   🏢 {done}/{client_count} clients, {task_count} tasks ({rate:.0f} clients/s)", end="", flush=True)
+
+        print()
+        return task_count
+
+async def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark database with synthetic CRM data")
+    parser.add_argument("--scale", choices=SCALES.keys(), default="10k", help="Number of clients")
+    parser.add_argument("--clients", type=int, help="Exact number of clients (overrides --scale)")
+    parser.add_argument("--tasks-per-client", type=int, default=2, help="Average tasks per client")
+    parser.add_argument("--notes-per-client", type=int, default=5, help="Average notes per client")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=os.environ.get("BENCHMARK_DB_NAME", "crm_benchmark"))
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, so runs are reproducible")
+    parser.add_argument("--drop", action="store_true", help="Drop the database first")
+    args = parser.parse_args()
+
+    # server reads these at import time; point it at the benchmark database
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    import server
+
+    client_count = args.clients or SCALES[args.scale]
+    if args.drop:
+        await server.client.drop_database(args.db_name)
+    elif await server.db.clients.estimated_document_count():
+        print(f"❌ {args.db_name} already has clients; pass --drop to start over")
+        sys.exit(1)
+
+    print(f"🌱 Seeding {client_count} clients into {args.db_name}")
+    started = time.perf_counter()
+    seeder = BenchmarkSeeder(server.db, random.Random(args.seed))
+
+    # Hashing is deliberately slow; every benchmark user shares one hash
+    users = await seeder.seed_users(max(1, client_count // CLIENTS_PER_BDE), server.hash_password(BENCHMARK_PASSWORD))
+    await seeder.seed_clients_and_tasks(client_count, users, args.tasks_per_client, args.notes_per_client)
+
+    print("   🗂️  Creating indexes")
+    await server.ensure_indexes()
+
+    print(f"\n✅ Done in {time.perf_counter() - started:.0f}s. Log in as {ADMIN_EMAIL} or {bde_email(0)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+List Endpoint Serialization Benchmark
+Compares the cost of encoding 1000 clients through the default path
+(Client(**doc) + response_model validation + stdlib json) with the
+FAST_JSON_RESPONSES path (model_construct + streamed orjson)
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).parent.parent / 'backend'
+sys.path.append(str(ROOT_DIR))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'benchmark')
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import server
+from fast_json import stream_json_array
+
+def make_client_docs(count: int, notes_per_client: int):
+    """Documents shaped like what create_client/add_note/add_*_attachment write"""
+    now = datetime.utcnow()
+    docs = []
+    for i in range(count):
+        attachment = {
+            "id": str(uuid.uuid4()),
+            "filename": f"{uuid.uuid4()}.pdf",
+            "original_filename": f"proposal-{i}.pdf",
+            "file_size": 120_000,
+            "file_type": "application/pdf",
+            "uploaded_by": str(uuid.uuid4()),
+            "uploaded_at": now,
+        }
+        notes = ["Legacy plain-text note"] + [
+            {
+                "id": str(uuid.uuid4()),
+                "text": f"Follow-up call {n} about the rollout plan and pricing tiers",
+                "author": "Sales Rep",
+                "author_id": str(uuid.uuid4()),
+                "timestamp": now - timedelta(days=n),
+                "attachments": [attachment] if n % 3 == 0 else [],
+            }
+            for n in range(notes_per_client)
+        ]
+        docs.append({
+            "_id": uuid.uuid4().hex[:24],
+            "id": str(uuid.uuid4()),
+            "company_name": f"Company {i}",
+            "contact_person": "Jane Doe",
+            "email": f"contact{i}@example.com",
+            "phone": "+1 555 0100",
+            "industry": "Software",
+            "company_size": "51-200",
+            "source": "Referral",
+            "referrer_name": "John",
+            "budget": 25000.0,
+            "budget_currency": "USD",
+            "requirements": "CRM integration",
+            "estimated_timeline": "Q3",
+            "decision_maker_details": "CTO",
+            "stage": (i % 5) + 1,
+            "assigned_bde": str(uuid.uuid4()),
+            "created_by": str(uuid.uuid4()),
+            "notes": notes,
+            "attachments": [attachment],
+            "created_at": now,
+            "last_interaction": now,
+            "is_dropped": False,
+            "drop_reason": None,
+        })
+    return docs
+
+async def default_path(docs, response_field):
+    # What get_clients does today: build models, let FastAPI validate and encode them again
+    clients = [server.Client(**doc) for doc in docs]
+    content = await serialize_response(field=response_field, response_content=clients)
+    return JSONResponse(content).body
+
+async def fast_path(docs):
+    async def cursor():
+        for doc in docs:
+            yield {k: v for k, v in doc.items() if k != "_id"}  # the fast path projects _id away
+    return b"".join([chunk async for chunk in stream_json_array(cursor(), server.Client)])
+
+async def measure(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), len(body)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-1000-clients serialization cost, before and after the fast path")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--notes", type=int, default=10, help="Notes per client")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = make_client_docs(args.clients, args.notes)
+    response_field = create_response_field("Response_get_clients", List[server.Client])
+
+    print(f"📊 Encoding {args.clients} clients with {args.notes} notes each (median of {args.repeat} runs)\n")
+    results = {
+        "default (validate x2 + json)": await measure(lambda: default_path(docs, response_field), args.repeat),
+        "fast (construct + orjson)": await measure(lambda: fast_path(docs), args.repeat),
+    }
+
+    scale = 1000 / args.clients
+    for name, (median, best, size) in results.items():
+        print(f"   {name:<30} {median * scale:8.2f} ms / 1000 clients (best {best * scale:.2f} ms, {size / 1024:.0f} KB)")
+
+    baseline = results["default (validate x2 + json)"][0]
+    fast = results["fast (construct + orjson)"][0]
+    print(f"\n✅ Speedup: {baseline / fast:.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""
+Synthetic CRM data shared by the benchmarks
+Documents are shaped like what the API itself writes (create_client, add_note,
+attachments, create_task), so the benchmarks exercise realistic payloads
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+BENCHMARK_PASSWORD = "benchmark123"
+ADMIN_EMAIL = "admin@benchmark.local"
+CLIENTS_PER_BDE = 200
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+INDUSTRIES = ["Software", "Finance", "Healthcare", "Retail", "Manufacturing", "Education", "Logistics", "Others"]
+COMPANY_SIZES = ["1-10", "11-50", "51-200", "201-1000", "1000+"]
+SOURCES = ["Direct", "Referral", "LinkedIn", "Website", "Event"]
+FILE_TYPES = [("application/pdf", ".pdf"), ("image/png", ".png"), ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".docx")]
+NOTE_TEXTS = [
+    "Intro call, interested in the rollout plan",
+    "Sent pricing tiers and the security questionnaire",
+    "Technical deep dive with their platform team about Kubernetes deployments",
+    "Follow-up on the proposal, waiting for procurement",
+    "Negotiating a multi-year discount",
+]
+
+
+def bde_email(n: int) -> str:
+    return f"bde{n}@benchmark.local"
+
+
+def make_id(rng: random.Random) -> str:
+    """A random UUID drawn from the seeded generator, so --seed reproduces ids too"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_user_doc(email: str, name: str, role: str, password_hash: str, now: datetime, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": make_id(rng),
+        "email": email,
+        "name": name,
+        "role": role,
+        "password": password_hash,
+        "created_at": now,
+        "is_active": True,
+        "google_credentials": None,
+        "google_connected": False,
+    }
+
+
+def make_attachment(uploaded_by: str, uploaded_at: datetime, rng: random.Random) -> Dict[str, Any]:
+    file_type, extension = rng.choice(FILE_TYPES)
+    return {
+        "id": make_id(rng),
+        "filename": f"{make_id(rng)}{extension}",
+        "original_filename": f"document-{rng.randint(1, 9999)}{extension}",
+        "file_size": rng.randint(20_000, 5_000_000),
+        "file_type": file_type,
+        "uploaded_by": uploaded_by,
+        "uploaded_at": uploaded_at,
+    }
+
+
+def make_client_doc(
+    index: int,
+    assigned_bde: Dict[str, Any],
+    created_by: str,
+    now: datetime,
+    rng: random.Random,
+    notes_per_client: int = 5
+) -> Dict[str, Any]:
+    """One client with a few years of notes and attachments"""
+    created_at = now - timedelta(days=rng.randint(30, 5 * 365))
+    notes: List[Any] = ["Imported from the old spreadsheet"] if rng.random() < 0.2 else []
+    for n in range(rng.randint(0, notes_per_client * 2)):
+        timestamp = created_at + (now - created_at) * rng.random()
+        notes.append({
+            "id": make_id(rng),
+            "text": rng.choice(NOTE_TEXTS),
+            "author": assigned_bde["name"],
+            "author_id": assigned_bde["id"],
+            "timestamp": timestamp,
+            "attachments": [make_attachment(assigned_bde["id"], timestamp, rng)] if rng.random() < 0.2 else [],
+        })
+    # add_note puts the latest note first
+    notes.sort(key=lambda note: note["timestamp"] if isinstance(note, dict) else created_at, reverse=True)
+    last_interaction = max([created_at] + [note["timestamp"] for note in notes if isinstance(note, dict)])
+
+    company_name = f"Company {index}"
+    contact_person = f"Contact {index}"
+    email = f"contact{index}@example.com"
+    return {
+        "id": make_id(rng),
+        "company_name": company_name,
+        "contact_person": contact_person,
+        "email": email,
+        "phone": f"+1 555 {index % 10000:04d}",
+        "industry": rng.choice(INDUSTRIES),
+        "company_size": rng.choice(COMPANY_SIZES),
+        "source": rng.choice(SOURCES),
+        "referrer_name": None,
+        "budget": float(rng.randint(1, 200) * 1000),
+        "budget_currency": "USD",
+        "requirements": "CRM integration and reporting",
+        "estimated_timeline": rng.choice(["Q1", "Q2", "Q3", "Q4"]),
+        "decision_maker_details": "CTO",
+        "stage": rng.randint(1, 5),
+        "assigned_bde": assigned_bde["id"],
+        "created_by": created_by,
+        "notes": notes,
+        "attachments": [make_attachment(created_by, created_at, rng) for _ in range(rng.randint(0, 2))],
+        "created_at": created_at,
+        "last_interaction": last_interaction,
+        "updated_at": last_interaction,
+        "is_dropped": rng.random() < 0.1,
+        "drop_reason": None,
+        # Normalized prefix fields the API writes for /clients/suggest
+        "company_name_lower": company_name.lower(),
+        "contact_person_lower": contact_person.lower(),
+        "email_lower": email.lower(),
+    }
+
+
+def make_task_doc(client_doc: Dict[str, Any], now: datetime, rng: random.Random) -> Dict[str, Any]:
+    created_at = client_doc["created_at"] + (now - client_doc["created_at"]) * rng.random()
+    deadline = created_at + timedelta(days=rng.randint(1, 30))
+    status = "done" if deadline < now and rng.random() < 0.7 else "pending"
+    return {
+        "id": make_id(rng),
+        "title": rng.choice(["Send proposal", "Schedule demo", "Follow-up call", "Prepare contract"]),
+        "description": None,
+        "client_id": client_doc["id"],
+        "assigned_to": client_doc["assigned_bde"],
+        "created_by": client_doc["created_by"],
+        "deadline": deadline,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
@@ -4,18 +4,44 @@ set -e
 # Start the FastAPI backend
 cd /backend || { echo "Backend directory not found"; exit 1; }
 
-echo "Starting FastAPI backend"
-# Start Uvicorn with proper host binding
-uvicorn server:app --host 0.0.0.0 --port 8001 &
+# Per-worker cold-start cost (import time and memory); --import-profile prints it and exits
+if [ "$1" = "--import-profile" ]; then
+    exec python3 import_profile.py
+fi
+if [ "$IMPORT_PROFILE" = "true" ]; then
+    python3 import_profile.py || echo "Import profile failed, starting anyway"
+fi
+
+# Worker processes, one event loop (and core) each. With more than one, the API
+# shares live updates and profiling triggers between them over Mongo and runs
+# background jobs on a single elected worker (see worker_bus.py, leader_election.py)
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-1}
+
+echo "Starting FastAPI backend with $WEB_CONCURRENCY worker(s)"
+# Start Uvicorn with proper host binding. Its access log has /stream's ?token= redacted (server.py)
+uvicorn server:app --host 0.0.0.0 --port 8001 --workers "$WEB_CONCURRENCY" &
 BACKEND_PID=$!
 
-echo "Waiting for backend to start..."
-sleep 30
+# Start serving as soon as the backend reports ready (Mongo reachable, index build finished;
+# indexes that failed to build are listed in the response but don't hold it back)
+READY_URL="http://127.0.0.1:8001/api/health/ready"
+STARTUP_TIMEOUT_SECONDS=${STARTUP_TIMEOUT_SECONDS:-120}
 
-if ! kill -0 $BACKEND_PID 2>/dev/null; then
-    echo "Backend failed to start at initialization, exiting"
-    exit 1
-fi
+echo "Waiting for backend to become ready..."
+STARTED_AT=$(date +%s)
+until wget -q -O /dev/null "$READY_URL" 2>/dev/null; do
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        echo "Backend failed to start at initialization, exiting"
+        exit 1
+    fi
+    if [ $(( $(date +%s) - STARTED_AT )) -ge "$STARTUP_TIMEOUT_SECONDS" ]; then
+        echo "Backend not ready after ${STARTUP_TIMEOUT_SECONDS}s, exiting"
+        kill $BACKEND_PID
+        exit 1
+    fi
+    sleep 0.5
+done
+echo "Backend ready after $(( $(date +%s) - STARTED_AT ))s"
 
 # Start Nginx
 nginx -g 'daemon off;' &
@@ -1305,6 +1305,26 @@ const KanbanPage = ({ currentUser, allUsers, onViewClient }) => {
     fetchBdes();
   }, []);
 
+  // Live board: apply other users' card moves as they happen instead of polling
+  useEffect(() => {
+    const events = new EventSource(`${API}/stream?token=${localStorage.getItem('token')}`);
+    const applyClientUpdate = (event) => {
+      const change = JSON.parse(event.data);
+      setClients(prev => prev.map(client => client.id === change.id ? { ...client, stage: change.stage, is_dropped: change.is_dropped } : client));
+    };
+    const removeClient = (event) => {
+      const change = JSON.parse(event.data);
+      setClients(prev => prev.filter(client => client.id !== change.id));
+    };
+    events.addEventListener('client.updated', applyClientUpdate);
+    events.addEventListener('client.created', fetchClients);
+    events.addEventListener('client.added', fetchClients);
+    events.addEventListener('client.deleted', removeClient);
+    events.addEventListener('client.removed', removeClient);
+    events.addEventListener('resync', fetchClients);
+    return () => events.close();
+  }, []);
+
   const fetchClients = async () => {
     try {
       const response = await axios.get(`${API}/clients`, {
@@ -1643,10 +1663,25 @@ function App() {
       name: 'Super Admin',
       email: 'admin@crm.com'
     });
-    fetchStats();
-    fetchAllUsers();
+    fetchBootstrap();
   }, []);
 
+  // Stats and users for the first screen in a single request
+  const fetchBootstrap = async () => {
+    try {
+      const response = await axios.get(`${API}/bootstrap`, {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+      });
+      setStats(response.data.stats);
+      // Only admins get the user list (as with /users); BDEs keep an empty one
+      setAllUsers(response.data.users || []);
+    } catch (error) {
+      console.error('Error fetching bootstrap data:', error);
+      fetchStats();
+      fetchAllUsers();
+    }
+  };
+
   const fetchStats = async () => {
     try {
       const response = await axios.get(`${API}/dashboard/stats`, {
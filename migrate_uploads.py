@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Attachment Storage Migration Script
+Copies files from the local upload directory into the storage backend
+configured by ATTACHMENT_STORAGE (e.g. S3 or a MinIO stand-in)
+"""
+
+import argparse
+import asyncio
+import mimetypes
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment
+ROOT_DIR = Path(__file__).parent / 'backend'
+load_dotenv(ROOT_DIR / '.env')
+sys.path.append(str(ROOT_DIR))
+
+from storage import LocalFileStorage, create_storage_from_env
+
+class UploadMigration:
+    def __init__(self, source_directory: Path):
+        self.source = LocalFileStorage(source_directory)
+        self.target = create_storage_from_env(source_directory)
+
+    async def migrate(self, dry_run: bool = False, delete_source: bool = False):
+        """Copy every attachment (and thumbnail) that the target doesn't have yet"""
+        if isinstance(self.target, LocalFileStorage):
+            print("❌ ATTACHMENT_STORAGE is 'local'; set it to 's3' to choose a migration target")
+            return False
+
+        print(f"🔄 Migrating {self.source.root} -> {self.target.name}")
+        copied = skipped = failed = 0
+        copied_bytes = 0
+
+        async for stored_file in self.source.list_files():
+            # Re-runs only copy what is missing
+            if await self.target.exists(stored_file.key):
+                skipped += 1
+                continue
+
+            if dry_run:
+                print(f"   would copy {stored_file.key} ({stored_file.size} bytes)")
+                copied += 1
+                copied_bytes += stored_file.size
+                continue
+
+            try:
+                content_type = mimetypes.guess_type(stored_file.key)[0] or 'application/octet-stream'
+                with open(self.source.local_path(stored_file.key), 'rb') as f:
+                    await self.target.save(stored_file.key, f, content_type)
+                copied += 1
+                copied_bytes += stored_file.size
+
+                if delete_source:
+                    await self.source.delete(stored_file.key)
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ {stored_file.key}: {e}")
+
+        print(f"\n✅ Copied {copied} files ({copied_bytes / 1024 / 1024:.1f} MB), skipped {skipped} already present, {failed} failed")
+        return failed == 0
+
+async def main():
+    parser = argparse.ArgumentParser(description="Copy local attachments into the configured storage backend")
+    parser.add_argument("--source", default=str(ROOT_DIR / "uploads"), help="Local upload directory to copy from")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be copied without uploading")
+    parser.add_argument("--delete-source", action="store_true", help="Remove local files once they are uploaded")
+    args = parser.parse_args()
+
+    migration = UploadMigration(Path(args.source))
+    success = await migration.migrate(dry_run=args.dry_run, delete_source=args.delete_source)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
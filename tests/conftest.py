@@ -0,0 +1,187 @@
+"""
+In-process API test harness
+Drives server.app through httpx's ASGI transport (no uvicorn, no network)
+against a fresh database per test: an in-memory Motor stand-in
+(mongomock-motor) by default, or a disposable mongod when TEST_MONGO_URL is
+set. Each test gets its own database and upload directory, so tests are
+independent and run in parallel workers
+
+Usage (from the repository root):
+    pip install -r backend/requirements-dev.txt
+    python -m pytest -n auto                                        # in-memory, all cores
+    TEST_MONGO_URL=mongodb://localhost:27017 python -m pytest -n 4  # real mongod, throwaway databases
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / 'backend'))
+# server reads these at import time; nothing may talk to a real deployment
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'crm_test')
+os.environ['LOOP_MONITOR_ENABLED'] = 'false'
+os.environ.pop('SLACK_WEBHOOK_URL', None)
+os.environ.pop('ATTACHMENT_STORAGE', None)
+
+import server
+from storage import LocalFileStorage
+
+TEST_MONGO_URL = os.environ.get('TEST_MONGO_URL')
+TEST_PASSWORD = "testpassword123"
+
+# For the few queries the in-memory stand-in can't run (e.g. $push through the positional operator)
+requires_mongod = pytest.mark.skipif(not TEST_MONGO_URL, reason="needs a real mongod (set TEST_MONGO_URL)")
+
+
+@lru_cache(maxsize=None)
+def get_test_password_hash() -> str:
+    # Hashing is deliberately slow; every factory-made user shares one hash per worker
+    return server.hash_password(TEST_PASSWORD)
+
+
+class ApiSession:
+    """The API as seen by one logged-in user"""
+
+    def __init__(self, http: httpx.AsyncClient, user: Dict[str, Any]):
+        self.http = http
+        self.user = user
+        self.id = user["id"]
+        self.headers = {"Authorization": f"Bearer {server.create_token({'sub': user['id']})}"}
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.http.request(method, url, headers={**self.headers, **kwargs.pop("headers", {})}, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db(monkeypatch, tmp_path):
+    """A fresh database (and upload directory) swapped into the server module"""
+    if TEST_MONGO_URL:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        mongo_client = AsyncIOMotorClient(TEST_MONGO_URL)
+        db_name = f"crm_test_{uuid.uuid4().hex[:12]}"
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        mongo_client = AsyncMongoMockClient()
+        db_name = "crm_test"
+    test_db = mongo_client[db_name]
+
+    monkeypatch.setattr(server, "client", mongo_client)
+    monkeypatch.setattr(server, "db", test_db)
+    monkeypatch.setattr(server, "facets_cache", {})
+    monkeypatch.setattr(server, "index_build_task", None)
+    monkeypatch.setattr(server, "attachment_storage", LocalFileStorage(tmp_path / "uploads"))
+    partial_directory = tmp_path / "uploads" / ".partial"
+    partial_directory.mkdir(parents=True)
+    monkeypatch.setattr(server, "PARTIAL_UPLOAD_DIRECTORY", partial_directory)
+
+    yield test_db
+
+    if TEST_MONGO_URL:
+        await mongo_client.drop_database(db_name)
+        mongo_client.close()
+
+
+@pytest.fixture
+async def http(db):
+    """Anonymous client; requests go straight into the ASGI app"""
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(db, http):
+    """Factory: insert a user with the given role and return an ApiSession for them"""
+    async def factory(role: str = "bde", **overrides) -> ApiSession:
+        user = server.User(
+            email=overrides.pop("email", f"{role}-{uuid.uuid4().hex[:8]}@example.com"),
+            name=overrides.pop("name", f"Test {role.replace('_', ' ').title()}"),
+            role=role,
+            **overrides
+        )
+        user_doc = {**user.dict(), "password": get_test_password_hash()}
+        await db.users.insert_one(user_doc)
+        await server.bump_collection_versions("users")
+        return ApiSession(http, user.dict())
+    return factory
+
+
+@pytest.fixture
+async def super_admin(make_user):
+    return await make_user("super_admin")
+
+
+@pytest.fixture
+async def admin(make_user):
+    return await make_user("admin")
+
+
+@pytest.fixture
+async def bde(make_user):
+    return await make_user("bde")
+
+
+@pytest.fixture
+def make_client(db):
+    """Factory: insert a client the way create_client stores it and return the document"""
+    async def factory(assigned_bde: str, created_by: Optional[str] = None, **overrides) -> Dict[str, Any]:
+        fields = {
+            "company_name": f"Company {uuid.uuid4().hex[:6]}",
+            "contact_person": "Test Contact",
+            "email": "contact@example.com",
+            "phone": "123-456-7890",
+            "industry": "Technology",
+            "company_size": "1-10",
+            "assigned_bde": assigned_bde,
+            "created_by": created_by or assigned_bde,
+            **overrides
+        }
+        client = server.Client(**fields).dict()
+        await db.clients.insert_one({**client, **server.get_suggest_fields(client)})
+        await server.bump_collection_versions("clients")
+        return client
+    return factory
+
+
+@pytest.fixture
+def make_task(db):
+    """Factory: insert a task for a client and return the document"""
+    async def factory(client: Dict[str, Any], assigned_to: Optional[str] = None, **overrides) -> Dict[str, Any]:
+        fields = {
+            "title": "Follow-up call",
+            "client_id": client["id"],
+            "assigned_to": assigned_to or client["assigned_bde"],
+            "created_by": client["created_by"],
+            "deadline": datetime.utcnow() + timedelta(days=1),
+            **overrides
+        }
+        task = server.Task(**fields).dict()
+        await db.tasks.insert_one(dict(task))
+        await server.bump_collection_versions("tasks")
+        return task
+    return factory
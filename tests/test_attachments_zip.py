@@ -0,0 +1,79 @@
+"""
+Attachment export: every client and note attachment of a client as one streamed ZIP
+"""
+
+import io
+import uuid
+import zipfile
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def make_attachment(original_filename: str, content: bytes, uploaded_by: str) -> dict:
+    filename = f"{uuid.uuid4()}{original_filename[original_filename.rfind('.'):]}"
+    await server.attachment_storage.save(filename, io.BytesIO(content), "application/pdf")
+    return server.FileAttachment(
+        filename=filename,
+        original_filename=original_filename,
+        file_size=len(content),
+        file_type="application/pdf",
+        uploaded_by=uploaded_by
+    ).dict()
+
+
+async def test_duplicate_names_are_numbered(db, super_admin, make_client):
+    client = await make_client(super_admin.id, company_name="Acme & Co")
+    first = await make_attachment("contract.pdf", b"first contract", super_admin.id)
+    second = await make_attachment("contract.pdf", b"second contract", super_admin.id)
+    note_attachment = await make_attachment("contract.pdf", b"note contract", super_admin.id)
+    note = server.NoteWithAttachment(
+        text="Signed copy", author="Admin", author_id=super_admin.id,
+        timestamp=datetime(2025, 6, 16, 9, 30), attachments=[note_attachment]
+    ).dict()
+    await db.clients.update_one({"id": client["id"]}, {"$set": {"attachments": [first, second], "notes": [note]}})
+
+    response = await super_admin.get(f"/api/clients/{client['id']}/attachments.zip")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="Acme_Co-attachments.zip"'
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == ["client/contract.pdf", "client/contract (2).pdf", "notes/2025-06-16/contract.pdf"]
+        assert archive.read("client/contract.pdf") == b"first contract"
+        assert archive.read("client/contract (2).pdf") == b"second contract"
+        assert archive.read("notes/2025-06-16/contract.pdf") == b"note contract"
+
+
+async def test_missing_files_are_listed(db, super_admin, make_client):
+    client = await make_client(super_admin.id)
+    stored = await make_attachment("proposal.pdf", b"proposal", super_admin.id)
+    lost = await make_attachment("invoice.pdf", b"invoice", super_admin.id)
+    await server.attachment_storage.delete(lost["filename"])
+    await db.clients.update_one({"id": client["id"]}, {"$set": {"attachments": [stored, lost]}})
+
+    response = await super_admin.get(f"/api/clients/{client['id']}/attachments.zip")
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == ["client/proposal.pdf", "MISSING_FILES.txt"]
+        assert "client/invoice.pdf" in archive.read("MISSING_FILES.txt").decode()
+
+
+async def test_bde_cannot_export_other_clients(db, make_user, make_client):
+    owner, other = await make_user("bde"), await make_user("bde")
+    client = await make_client(owner.id)
+    attachment = await make_attachment("contract.pdf", b"contract", owner.id)
+    await db.clients.update_one({"id": client["id"]}, {"$set": {"attachments": [attachment]}})
+
+    response = await other.get(f"/api/clients/{client['id']}/attachments.zip")
+    assert response.status_code == 403
+    response = await owner.get(f"/api/clients/{client['id']}/attachments.zip")
+    assert response.status_code == 200
+
+
+async def test_client_without_attachments(super_admin, make_client):
+    client = await make_client(super_admin.id)
+    response = await super_admin.get(f"/api/clients/{client['id']}/attachments.zip")
+    assert response.status_code == 404
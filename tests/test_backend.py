@@ -0,0 +1,225 @@
+"""
+Core CRM API scenarios (ported from backend_test.py): auth, clients, notes,
+stages, tasks, dropped clients and delete permissions
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+from tests.conftest import TEST_PASSWORD
+
+pytestmark = pytest.mark.anyio
+
+CLIENT_PAYLOAD = {
+    "company_name": "Drag Test Company",
+    "contact_person": "Drag Test Contact",
+    "email": "dragtest@example.com",
+    "phone": "123-456-7890",
+    "industry": "Technology",
+    "company_size": "1-10",
+    "requirements": "Testing drag and drop",
+    "budget": 5000,
+    "budget_currency": "USD",
+}
+
+
+async def test_init_super_admin_and_login(http):
+    response = await http.post("/api/auth/init-super-admin")
+    assert response.status_code == 200
+
+    response = await http.post("/api/auth/init-super-admin")
+    assert response.status_code == 400
+
+    response = await http.post("/api/auth/login", json={"email": "admin@crm.com", "password": "admin123"})
+    assert response.status_code == 200
+    assert response.json()["user"]["role"] == "super_admin"
+
+    response = await http.post("/api/auth/login", json={"email": "admin@crm.com", "password": "wrong"})
+    assert response.status_code == 401
+
+
+async def test_requires_authentication(http):
+    response = await http.get("/api/clients")
+    assert response.status_code in (401, 403)
+
+
+async def test_create_and_get_client(super_admin, bde):
+    response = await super_admin.post("/api/clients", json={**CLIENT_PAYLOAD, "assigned_bde": bde.id})
+    assert response.status_code == 200
+    client = response.json()
+    assert client["created_by"] == super_admin.id
+    assert client["stage"] == 1
+
+    response = await super_admin.get(f"/api/clients/{client['id']}")
+    assert response.status_code == 200
+    assert response.json()["company_name"] == CLIENT_PAYLOAD["company_name"]
+
+
+async def test_update_client_fields(super_admin, make_client):
+    client = await make_client(super_admin.id)
+    update = {
+        "stage": 2,
+        "requirements": "Updated requirements",
+        "budget": 15000,
+        "budget_currency": "EUR",
+        "source": "Referral",
+        "referrer_name": "John Doe",
+    }
+
+    response = await super_admin.put(f"/api/clients/{client['id']}", json=update)
+    assert response.status_code == 200
+
+    updated = (await super_admin.get(f"/api/clients/{client['id']}")).json()
+    for field, value in update.items():
+        assert updated[field] == value
+
+
+async def test_drag_and_drop_stage_change(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    response = await super_admin.put(f"/api/clients/{client['id']}", json={"stage": 2})
+    assert response.status_code == 200
+
+    response = await super_admin.get(f"/api/clients/{client['id']}")
+    assert response.json()["stage"] == 2
+
+
+async def test_add_note(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    response = await super_admin.post(f"/api/clients/{client['id']}/notes", json={"text": "Notification test note"})
+    assert response.status_code == 200
+
+    notes = (await super_admin.get(f"/api/clients/{client['id']}")).json()["notes"]
+    assert notes[0]["text"] == "Notification test note"
+    assert notes[0]["author_id"] == super_admin.id
+
+
+async def test_bde_sees_only_assigned_clients(make_user, make_client):
+    bde = await make_user("bde")
+    other_bde = await make_user("bde")
+    own = await make_client(bde.id)
+    await make_client(other_bde.id)
+
+    response = await bde.get("/api/clients")
+    assert response.status_code == 200
+    assert [client["id"] for client in response.json()] == [own["id"]]
+
+
+async def test_dashboard_stats(super_admin, bde, make_client):
+    await make_client(bde.id, stage=1)
+    await make_client(bde.id, stage=3)
+
+    response = await super_admin.get("/api/dashboard/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total_clients"] == 2
+    assert stats["clients_by_stage"]["3"] == 1
+
+
+async def test_dropped_client(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    response = await super_admin.put(
+        f"/api/clients/{client['id']}",
+        json={"is_dropped": True, "drop_reason": "Test drop reason"}
+    )
+    assert response.status_code == 200
+
+    dropped = (await super_admin.get(f"/api/clients/{client['id']}")).json()
+    assert dropped["is_dropped"] is True
+    assert dropped["drop_reason"] == "Test drop reason"
+
+    # Dropped clients stay in the list, flagged
+    clients = (await super_admin.get("/api/clients")).json()
+    assert next(c for c in clients if c["id"] == client["id"])["is_dropped"] is True
+
+
+async def test_only_super_admin_deletes_clients(super_admin, bde, make_client):
+    client = await make_client(bde.id, created_by=super_admin.id)
+
+    response = await bde.delete(f"/api/clients/{client['id']}")
+    assert response.status_code == 403
+
+    response = await super_admin.delete(f"/api/clients/{client['id']}")
+    assert response.status_code == 200
+
+    response = await super_admin.get(f"/api/clients/{client['id']}")
+    assert response.status_code == 404
+
+
+async def test_profile_and_change_password(http, super_admin):
+    response = await super_admin.get("/api/auth/profile")
+    assert response.status_code == 200
+    assert response.json()["id"] == super_admin.id
+
+    response = await super_admin.post(
+        "/api/auth/change-password",
+        json={"current_password": TEST_PASSWORD, "new_password": "newpassword123"}
+    )
+    assert response.status_code == 200
+
+    response = await http.post(
+        "/api/auth/login",
+        json={"email": super_admin.user["email"], "password": "newpassword123"}
+    )
+    assert response.status_code == 200
+
+
+async def test_task_assignment(super_admin, bde, make_client):
+    client = await make_client(bde.id)
+
+    users = (await super_admin.get("/api/users/all")).json()
+    assert {user["id"] for user in users} == {super_admin.id, bde.id}
+
+    response = await super_admin.post("/api/tasks", json={
+        "title": "Test Task",
+        "description": "Created by the API tests",
+        "client_id": client["id"],
+        "assigned_to": bde.id,
+        "deadline": (datetime.utcnow() + timedelta(days=1)).isoformat(),
+    })
+    assert response.status_code == 200
+
+    tasks = (await bde.get("/api/tasks")).json()
+    assert [task["title"] for task in tasks] == ["Test Task"]
+
+
+async def test_google_endpoints_need_connected_account(super_admin):
+    response = await super_admin.post("/api/google/create-calendar-event", json={
+        "title": "Test Meeting",
+        "start_time": datetime.utcnow().isoformat(),
+        "end_time": (datetime.utcnow() + timedelta(hours=1)).isoformat(),
+    })
+    if server.GOOGLE_ENABLED:
+        assert "not connected" in response.json()["detail"]
+    else:
+        assert response.status_code == 503
+
+
+async def test_bde_sees_only_own_tasks(make_user, make_client, make_task):
+    bde = await make_user("bde")
+    other_bde = await make_user("bde")
+    own = await make_task(await make_client(bde.id))
+    await make_task(await make_client(other_bde.id))
+
+    tasks = (await bde.get("/api/tasks")).json()
+    assert [task["id"] for task in tasks] == [own["id"]]
+
+
+async def test_bootstrap(super_admin, bde, make_client):
+    await make_client(bde.id)
+    await make_client(bde.id, is_dropped=True)
+
+    body = (await super_admin.get("/api/bootstrap")).json()
+    assert "clients" not in body
+    assert body["stats"]["total_clients"] == 1
+    assert body["stats"]["dropped_clients"] == 1
+    assert {user["id"] for user in body["users"]} == {super_admin.id, bde.id}
+
+    # Like /users, the user list is for admins only
+    body = (await bde.get("/api/bootstrap")).json()
+    assert body["users"] is None
+    assert [user["id"] for user in body["bdes"]] == [bde.id]
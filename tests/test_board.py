@@ -0,0 +1,45 @@
+"""
+Kanban board: per-stage columns with counts and keyset-paged cards
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_board_columns(super_admin, make_user, make_client):
+    bde, other_bde = await make_user("bde"), await make_user("bde")
+    now = datetime.utcnow()
+    for n in range(5):
+        await make_client(bde.id, stage=1, company_name=f"Lead {n}", last_interaction=now - timedelta(hours=n))
+    await make_client(bde.id, stage=3, is_dropped=True)
+    await make_client(other_bde.id, stage=2)
+
+    board = (await super_admin.get("/api/board", params={"limit": 2})).json()
+    columns = {column["stage"]: column for column in board["columns"]}
+    assert [column["stage"] for column in board["columns"]] == [1, 2, 3, 4, 5]
+    assert {stage: column["count"] for stage, column in columns.items()} == {1: 5, 2: 1, 3: 1, 4: 0, 5: 0}
+    # Most recent activity first
+    assert [card["company_name"] for card in columns[1]["cards"]] == ["Lead 0", "Lead 1"]
+    assert columns[1]["next_cursor"] and columns[2]["next_cursor"] is None
+
+    # BDEs only see their own clients; dropped ones can be left out
+    board = (await bde.get("/api/board", params={"include_dropped": "false"})).json()
+    assert [column["count"] for column in board["columns"]] == [5, 0, 0, 0, 0]
+
+
+async def test_column_pages_continue_from_board(bde, make_client):
+    now = datetime.utcnow()
+    for n in range(5):
+        await make_client(bde.id, stage=1, company_name=f"Lead {n}", last_interaction=now - timedelta(hours=n))
+
+    column = (await bde.get("/api/board", params={"limit": 2})).json()["columns"][0]
+    names = [card["company_name"] for card in column["cards"]]
+    while column["next_cursor"]:
+        column = (await bde.get("/api/board/1", params={"limit": 2, "cursor": column["next_cursor"]})).json()
+        names += [card["company_name"] for card in column["cards"]]
+
+    assert names == [f"Lead {n}" for n in range(5)]
+    assert column["count"] == 5
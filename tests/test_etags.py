@@ -0,0 +1,78 @@
+"""
+Conditional GETs: ETag / If-None-Match on client, task and dashboard reads
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def revalidate(user, url: str):
+    first = await user.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    return etag, await user.get(url, headers={"If-None-Match": etag})
+
+
+@pytest.mark.parametrize("url", ["/api/clients", "/api/tasks", "/api/dashboard/stats", "/api/users/bdes"])
+async def test_unchanged_read_is_not_modified(super_admin, bde, make_client, make_task, url):
+    await make_task(await make_client(bde.id))
+
+    etag, response = await revalidate(super_admin, url)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+async def test_single_client_is_not_modified(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    _, response = await revalidate(super_admin, f"/api/clients/{client['id']}")
+    assert response.status_code == 304
+
+
+async def test_access_checked_before_etag(make_user, make_client):
+    owner, other = await make_user("bde"), await make_user("bde")
+    client = await make_client(owner.id)
+
+    # A wildcard matches any ETag, so a 304 would confirm the client exists
+    response = await other.get(f"/api/clients/{client['id']}", headers={"If-None-Match": "*"})
+    assert response.status_code == 403
+    assert "ETag" not in response.headers
+    response = await other.get("/api/clients/does-not-exist", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+async def test_write_changes_etag(super_admin, bde, make_client):
+    client = await make_client(bde.id)
+    etag, _ = await revalidate(super_admin, "/api/clients")
+
+    response = await bde.put(f"/api/clients/{client['id']}", json={"stage": 2})
+    assert response.status_code == 200
+
+    response = await super_admin.get("/api/clients", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["stage"] == 2
+
+
+async def test_task_write_changes_bde_task_etag(bde, make_client):
+    client = await make_client(bde.id)
+    etag, _ = await revalidate(bde, "/api/tasks")
+
+    response = await bde.post("/api/tasks", json={
+        "title": "Call back", "client_id": client["id"], "assigned_to": bde.id, "deadline": "2030-01-01T10:00:00"
+    })
+    assert response.status_code == 200
+
+    response = await bde.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+async def test_etag_is_per_user(super_admin, admin, make_client):
+    await make_client(super_admin.id)
+    etag, _ = await revalidate(super_admin, "/api/clients")
+
+    response = await admin.get("/api/clients", headers={"If-None-Match": etag})
+    assert response.status_code == 200
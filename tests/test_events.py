@@ -0,0 +1,66 @@
+"""
+Live board events: who receives which change, and when a /stream ends
+"""
+
+import asyncio
+
+import pytest
+
+import server
+from events import EventBroker
+
+pytestmark = pytest.mark.anyio
+
+
+def drain(subscriber):
+    events = []
+    while not subscriber.queue.empty():
+        events.append(subscriber.queue.get_nowait())
+    return [(event["type"], event["data"]["id"]) for event in events]
+
+
+async def test_bdes_only_see_their_own_clients():
+    broker = EventBroker()
+    admin = broker.subscribe("admin-1", restricted=False)
+    own, other = broker.subscribe("bde-1", restricted=True), broker.subscribe("bde-2", restricted=True)
+
+    broker.publish("client.updated", {"id": "client-1"}, assigned_bde="bde-1")
+    assert drain(admin) == drain(own) == [("client.updated", "client-1")]
+    assert drain(other) == []
+
+
+async def test_reassignment_moves_card_between_bdes(monkeypatch, super_admin, make_user, make_client):
+    broker = EventBroker()
+    monkeypatch.setattr(server, "event_broker", broker)
+    previous_bde, new_bde = await make_user("bde"), await make_user("bde")
+    client = await make_client(previous_bde.id)
+    admin = broker.subscribe(super_admin.id, restricted=False)
+    previous, new = broker.subscribe(previous_bde.id, restricted=True), broker.subscribe(new_bde.id, restricted=True)
+
+    response = await super_admin.put(f"/api/clients/{client['id']}", json={"assigned_bde": new_bde.id})
+    assert response.status_code == 200
+
+    # The card stays on admin boards
+    assert drain(admin) == [("client.updated", client["id"])]
+    assert drain(previous) == [("client.removed", client["id"])]
+    assert ("client.added", client["id"]) in drain(new)
+
+
+async def test_stream_refused_for_inactive_user(make_user):
+    inactive = await make_user("bde", is_active=False)
+    response = await inactive.get("/api/stream")
+    assert response.status_code == 401
+
+
+async def test_stream_ends_when_user_is_deactivated(monkeypatch, db, bde):
+    monkeypatch.setattr(server, "HEARTBEAT_INTERVAL_SECONDS", 0.05)
+    monkeypatch.setattr(server, "STREAM_AUTH_CHECK_SECONDS", 0)
+
+    stream = asyncio.create_task(bde.get("/api/stream"))
+    await asyncio.sleep(0.2)
+    assert not stream.done()
+
+    await db.users.update_one({"id": bde.id}, {"$set": {"is_active": False}})
+    response = await asyncio.wait_for(stream, 2)
+    assert response.status_code == 200
+    assert server.event_broker.subscribers == set()
@@ -0,0 +1,66 @@
+"""
+Filter facets: counts per stage, industry, source, size and BDE, cached per scope
+until a client or user write bumps the collection versions
+"""
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def counts(facets: dict, attribute: str) -> dict:
+    return {facet["value"]: facet["count"] for facet in facets[attribute]}
+
+
+async def test_counts_and_labels(super_admin, make_user, make_client):
+    bde = await make_user("bde", name="Dana")
+    await make_client(bde.id, industry="Technology")
+    await make_client(bde.id, industry="Technology", stage=server.ClientStage.NEGOTIATION)
+    await make_client(super_admin.id, industry="Retail")
+
+    facets = (await super_admin.get("/api/clients/facets")).json()
+    assert counts(facets, "industries") == {"Technology": 2, "Retail": 1}
+    assert counts(facets, "stages") == {server.ClientStage.FIRST_CONTACT: 2, server.ClientStage.NEGOTIATION: 1}
+    assert [(facet["value"], facet["label"]) for facet in facets["bdes"]][0] == (bde.id, "Dana")
+
+
+async def test_cache_invalidated_by_version_bump(db, super_admin, make_client):
+    await make_client(super_admin.id, industry="Technology")
+    assert counts((await super_admin.get("/api/clients/facets")).json(), "industries") == {"Technology": 1}
+
+    # A write that doesn't bump the versions isn't seen: the cached facets are served
+    await db.clients.update_many({}, {"$set": {"industry": "Retail"}})
+    assert counts((await super_admin.get("/api/clients/facets")).json(), "industries") == {"Technology": 1}
+
+    await server.bump_collection_versions("clients")
+    assert counts((await super_admin.get("/api/clients/facets")).json(), "industries") == {"Retail": 1}
+
+
+async def test_user_rename_refreshes_bde_labels(db, super_admin, make_user, make_client):
+    bde = await make_user("bde", name="Dana")
+    await make_client(bde.id)
+    assert (await super_admin.get("/api/clients/facets")).json()["bdes"][0]["label"] == "Dana"
+
+    await db.users.update_one({"id": bde.id}, {"$set": {"name": "Dana Scully"}})
+    await server.bump_collection_versions("users")
+    assert (await super_admin.get("/api/clients/facets")).json()["bdes"][0]["label"] == "Dana Scully"
+
+
+async def test_api_writes_invalidate_the_cache(super_admin, make_client):
+    client = await make_client(super_admin.id, industry="Technology")
+    await super_admin.get("/api/clients/facets")
+
+    await super_admin.put(f"/api/clients/{client['id']}", json={"industry": "Retail"})
+    assert counts((await super_admin.get("/api/clients/facets")).json(), "industries") == {"Retail": 1}
+
+
+async def test_bde_scope_is_cached_separately(super_admin, make_user, make_client):
+    owner, other = await make_user("bde"), await make_user("bde")
+    await make_client(owner.id, industry="Technology")
+    await make_client(other.id, industry="Retail")
+
+    assert counts((await super_admin.get("/api/clients/facets")).json(), "industries") == {"Technology": 1, "Retail": 1}
+    assert counts((await owner.get("/api/clients/facets")).json(), "industries") == {"Technology": 1}
+    assert counts((await other.get("/api/clients/facets")).json(), "industries") == {"Retail": 1}
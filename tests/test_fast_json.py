@@ -0,0 +1,69 @@
+"""
+FAST_JSON_RESPONSES: list endpoints streamed through orjson must send exactly
+the bytes the response_model path sends
+"""
+
+from datetime import datetime
+
+import pytest
+
+import fast_json
+import server
+
+pytestmark = pytest.mark.anyio
+
+pytest.importorskip("orjson")
+
+LIST_ENDPOINTS = ["/api/clients", "/api/tasks", "/api/users", "/api/users/bdes"]
+
+
+@pytest.fixture
+async def records(db, super_admin, make_user, make_client, make_task):
+    bde = await make_user("bde", name="Zoë Müller")
+    client = await make_client(
+        bde.id,
+        company_name="Café Ünïcode",
+        budget=12500.5,
+        stage=server.ClientStage.PRICING_PROPOSAL,
+        created_at=datetime(2025, 6, 16, 12, 0, 0, 123456)
+    )
+    attachment = server.FileAttachment(
+        filename="deck.pdf", original_filename="Präsentation.pdf", file_size=10,
+        file_type="application/pdf", uploaded_by=bde.id
+    ).dict()
+    note = server.NoteWithAttachment(text="Prix: 10 €", author="Zoë Müller", author_id=bde.id, attachments=[attachment]).dict()
+    await db.clients.update_one({"id": client["id"]}, {"$set": {"notes": [note], "attachments": [attachment]}})
+    await make_client(bde.id, created_at=datetime(2025, 6, 17))
+    await make_task(client, title="Relance téléphonique")
+    return bde
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+async def test_same_bytes_as_default_path(monkeypatch, super_admin, records, path):
+    monkeypatch.setattr(server, "FAST_JSON_ENABLED", False)
+    default = await super_admin.get(path)
+    assert default.status_code == 200
+    assert default.json()
+
+    monkeypatch.setattr(server, "FAST_JSON_ENABLED", True)
+    fast = await super_admin.get(path)
+    assert fast.status_code == 200
+    assert "content-length" not in fast.headers  # Streamed, so it really took the fast path
+    assert fast.content == default.content
+    assert fast.headers.get("etag") == default.headers.get("etag")
+
+
+async def test_streams_in_batches(monkeypatch, super_admin, records):
+    monkeypatch.setattr(fast_json, "STREAM_BATCH_SIZE", 1)
+    monkeypatch.setattr(server, "FAST_JSON_ENABLED", False)
+    default = await super_admin.get("/api/clients")
+
+    monkeypatch.setattr(server, "FAST_JSON_ENABLED", True)
+    fast = await super_admin.get("/api/clients")
+    assert fast.content == default.content
+
+
+async def test_empty_list(monkeypatch, bde):
+    monkeypatch.setattr(server, "FAST_JSON_ENABLED", True)
+    response = await bde.get("/api/clients")
+    assert response.content == b"[]"
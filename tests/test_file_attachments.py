@@ -0,0 +1,81 @@
+"""
+File attachment scenarios (ported from test_file_attachments.py): uploads,
+client and note attachments, downloads and file type validation
+"""
+
+import io
+
+import pytest
+
+from tests.conftest import requires_mongod
+
+pytestmark = pytest.mark.anyio
+
+PDF_CONTENT = b"This is a test PDF file content for testing file upload functionality."
+
+
+def upload(name: str, content: bytes, content_type: str):
+    return {"file": (name, io.BytesIO(content), content_type)}
+
+
+async def test_upload_and_download(super_admin):
+    response = await super_admin.post("/api/upload-file", files=upload("test_document.pdf", PDF_CONTENT, "application/pdf"))
+    assert response.status_code == 200
+    file_data = response.json()
+    assert file_data["original_filename"] == "test_document.pdf"
+    assert file_data["file_size"] == len(PDF_CONTENT)
+
+    response = await super_admin.get(f"/api/download/{file_data['filename']}")
+    assert response.status_code == 200
+    assert response.content == PDF_CONTENT
+
+
+async def test_download_missing_file(super_admin):
+    response = await super_admin.get("/api/download/does-not-exist.pdf")
+    assert response.status_code == 404
+
+
+async def test_client_attachment(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    response = await super_admin.post(
+        f"/api/clients/{client['id']}/attachments",
+        files=upload("client_contract.pdf", b"This is a test contract document for the client.", "application/pdf")
+    )
+    assert response.status_code == 200
+    attachment = response.json()["attachment"]
+    assert attachment["original_filename"] == "client_contract.pdf"
+
+    attachments = (await super_admin.get(f"/api/clients/{client['id']}")).json()["attachments"]
+    assert [a["id"] for a in attachments] == [attachment["id"]]
+
+
+@requires_mongod
+async def test_note_attachment(super_admin, make_client):
+    client = await make_client(super_admin.id)
+
+    response = await super_admin.post(f"/api/clients/{client['id']}/notes", json={"text": "Test note with attachment"})
+    assert response.status_code == 200
+    note_id = response.json()["note_id"]
+
+    response = await super_admin.post(
+        f"/api/clients/{client['id']}/notes/{note_id}/attachments",
+        files=upload(
+            "meeting_summary.docx",
+            b"This is a meeting summary document attached to the note.",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+    )
+    assert response.status_code == 200
+    assert response.json()["attachment"]["original_filename"] == "meeting_summary.docx"
+
+    notes = (await super_admin.get(f"/api/clients/{client['id']}")).json()["notes"]
+    assert notes[0]["attachments"][0]["original_filename"] == "meeting_summary.docx"
+
+
+async def test_invalid_file_type_rejected(super_admin):
+    response = await super_admin.post(
+        "/api/upload-file",
+        files=upload("malicious.exe", b"This is an executable file which should be rejected.", "application/x-executable")
+    )
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+"""
+Liveness and readiness probes
+"""
+
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import server
+from leader_election import LeaderLease
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_live(http):
+    response = await http.get("/api/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+async def test_not_ready_until_indexes_exist(http):
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["mongo"]["ok"] is True
+    assert "clients.assigned_bde_1_stage_1_last_interaction_-1" in body["indexes"]["missing"]
+
+    # The probe builds the missing indexes in the background
+    await server.index_build_task
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 200
+
+
+async def test_ready(http):
+    await server.ensure_indexes()
+
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["integrations"]["attachment_storage"] == "local"
+
+
+async def test_not_ready_while_indexes_build(monkeypatch, db, http):
+    monkeypatch.setattr(server, "INDEX_BUILD_RETRY_SECONDS", 0.01)
+    # Another worker holds the build lease; this one waits for its indexes
+    await LeaderLease(db, "index_build", holder="other-worker").try_acquire()
+    monkeypatch.setattr(server, "index_build_task", asyncio.create_task(server.build_indexes()))
+
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["indexes"] == {"ok": False, "building": True}
+
+    await server.ensure_indexes()  # The other worker finishes
+    await asyncio.wait_for(server.index_build_task, 1)
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 200
+    assert await db.leader_leases.find_one({"_id": "index_build"})  # Never taken over
+
+
+async def test_index_build_releases_lease(db):
+    await server.build_indexes()
+    assert not await server.get_missing_indexes()
+    assert await db.leader_leases.find_one({"_id": "index_build"}) is None
+
+
+async def test_ready_after_build_with_failed_index(monkeypatch, db, http):
+    # One index can never be built, e.g. it conflicts with an existing index
+    conflicting = ("clients", [("company_name", "text")], {"name": "conflicting_text"})
+    monkeypatch.setattr(server, "INDEXES", [*server.INDEXES, conflicting])
+    create_index = type(db.clients).create_index
+
+    async def failing_create_index(collection, keys, **options):
+        if options.get("name") == "conflicting_text":
+            raise OperationFailure("An equivalent index already exists with a different name")
+        return await create_index(collection, keys, **options)
+
+    monkeypatch.setattr(type(db.clients), "create_index", failing_create_index)
+    monkeypatch.setattr(server, "index_build_task", asyncio.create_task(server.build_indexes()))
+    await server.index_build_task
+
+    response = await http.get("/api/health/ready")
+    assert response.status_code == 200
+    indexes = response.json()["indexes"]
+    assert indexes["missing"] == ["clients.conflicting_text"]
+    assert "equivalent index" in indexes["failed"]["clients.conflicting_text"]
+    assert server.index_build_task.done()  # Not rebuilt on every probe
+
+
+async def test_backfill_bumps_collection_versions(db, bde, make_client):
+    client = await make_client(bde.id)
+    # Written before updated_at and the suggest fields existed
+    await db.clients.update_one({"id": client["id"]}, {"$unset": {"updated_at": "", "company_name_lower": ""}})
+    versions = await server.get_collection_versions()
+
+    await server.ensure_indexes()
+    backfilled = await server.get_collection_versions()
+    assert backfilled["clients"] > versions["clients"]
+    assert backfilled.get("tasks", 0) == versions.get("tasks", 0)
+
+    await server.ensure_indexes()  # Nothing left to backfill
+    assert await server.get_collection_versions() == backfilled
@@ -0,0 +1,81 @@
+"""
+Prometheus metrics: the /metrics exposition and what it reports
+"""
+
+import re
+
+import pytest
+
+from metrics import Metric
+
+pytestmark = pytest.mark.anyio
+
+METRIC_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+LABEL = r'[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*"'
+SAMPLE_LINE = re.compile(rf"^({METRIC_NAME})(\{{(?:{LABEL}(?:,{LABEL})*)?\}})? (\S+)$")
+HISTOGRAM_SUFFIXES = ("_bucket", "_count", "_sum")
+
+
+def parse_exposition(text: str) -> dict:
+    """Check the text format line by line; returns {family: {"type": ..., "samples": [(name, labels, value)]}}"""
+    assert text.endswith("\n")
+    families: dict = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            name = line.split(" ")[2]
+            assert re.fullmatch(METRIC_NAME, name) and name not in families, line
+            families[name] = {"type": None, "samples": []}
+        elif line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            assert families[name]["type"] is None and not families[name]["samples"], line
+            assert metric_type in ("counter", "gauge", "histogram", "summary", "untyped"), line
+            families[name]["type"] = metric_type
+        else:
+            match = SAMPLE_LINE.match(line)
+            assert match, f"Not a sample line: {line!r}"
+            name, labels, value = match.groups()
+            float(value)  # Also accepts +Inf / NaN, as the format does
+            family = next(
+                (family for family, info in families.items()
+                 if name == family or (info["type"] == "histogram" and name in (family + suffix for suffix in HISTOGRAM_SUFFIXES))),
+                None
+            )
+            assert family is not None, f"Sample before its # TYPE line: {line!r}"
+            families[family]["samples"].append((name, dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or "")), float(value)))
+    return families
+
+
+async def test_metrics_exposition_is_valid(http):
+    await http.get("/api/health/live")
+
+    response = await http.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    families = parse_exposition(response.text)
+    assert families["http_request_duration_seconds"]["type"] == "histogram"
+    assert families["http_requests_in_flight"]["type"] == "gauge"
+
+
+async def test_requests_labelled_by_route_template(http, super_admin, make_client):
+    client = await make_client(super_admin.id)
+    for _ in range(2):
+        assert (await super_admin.get(f"/api/clients/{client['id']}")).status_code == 200
+    await http.get("/api/no-such-route/12345")
+
+    families = parse_exposition((await http.get("/metrics")).text)
+    counts = {
+        (labels["method"], labels["route"], labels["status"]): value
+        for name, labels, value in families["http_request_duration_seconds"]["samples"]
+        if name == "http_request_duration_seconds_count"
+    }
+    assert counts[("GET", "/api/clients/{client_id}", "200")] >= 2
+    routes = {route for _, route, _ in counts}
+    assert not any(client["id"] in route or "12345" in route for route in routes)
+
+
+async def test_metric_families_implement_samples():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Never registered")
@@ -0,0 +1,84 @@
+"""
+Per-request accounting: Server-Timing and the slow / DB-chatty request log
+"""
+
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pymongo import monitoring
+
+import request_context
+from request_context import RequestStatsListener, RequestTimingMiddleware
+from tests.conftest import TEST_MONGO_URL, requires_mongod
+
+pytestmark = pytest.mark.anyio
+
+
+def make_app(find_one) -> FastAPI:
+    """An endpoint with the N+1 shape: one lookup per item of a list"""
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+
+    @app.get("/clients/{count}")
+    async def list_with_owners(count: int):
+        return [await find_one(index) for index in range(count)]
+
+    return app
+
+
+async def get(app: FastAPI, url: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http:
+        return await http.get(url)
+
+
+def emit_find(listener: RequestStatsListener):
+    """What the driver reports for one find_one on users"""
+    async def find_one(index):
+        listener.started(monitoring.CommandStartedEvent({"find": "users", "filter": {"id": index}}, "crm", index, ("localhost", 27017), index))
+        return index
+    return find_one
+
+
+@pytest.fixture
+def chatty_requests(monkeypatch, caplog):
+    monkeypatch.setattr(request_context, "SLOW_REQUEST_DB_COMMANDS", 10)
+    caplog.set_level(logging.WARNING, logger="request_context")
+    return caplog
+
+
+async def test_query_per_item_is_flagged(chatty_requests):
+    app = make_app(emit_find(RequestStatsListener()))
+
+    response = await get(app, "/clients/5")
+    assert 'db;desc="MongoDB (5 commands)"' in response.headers["server-timing"]
+    assert not chatty_requests.records
+
+    await get(app, "/clients/25")
+    [record] = chatty_requests.records
+    assert "ran 25 DB commands" in record.message
+    assert "users.find x25" in record.message
+
+
+@requires_mongod
+async def test_query_per_item_is_flagged_with_mongod(chatty_requests):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    mongo_client = AsyncIOMotorClient(TEST_MONGO_URL, event_listeners=[RequestStatsListener()])
+    users = mongo_client["crm_test_request_context"].users
+    try:
+        await get(make_app(lambda index: users.find_one({"id": index}, {"_id": 0})), "/clients/25")
+    finally:
+        mongo_client.close()
+
+    [record] = chatty_requests.records
+    assert "users.find x25" in record.message
+
+
+def test_access_log_redacts_stream_token():
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/api/stream?token=eyJhbGciOi.payload.signature&x=1", "1.1", 200), None
+    )
+    assert request_context.AccessLogTokenFilter().filter(record)
+    assert record.getMessage() == '127.0.0.1:5000 - "GET /api/stream?token=[redacted]&x=1 HTTP/1.1" 200'
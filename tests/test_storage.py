@@ -0,0 +1,102 @@
+"""
+Attachment storage backends (local disk; S3 needs a bucket and isn't covered here)
+"""
+
+import io
+import threading
+
+import pytest
+
+from storage import AttachmentStorage, InvalidStorageKey, LocalFileStorage
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFileStorage(tmp_path / "uploads")
+
+
+async def read(storage, key: str) -> bytes:
+    return b"".join([chunk async for chunk in storage.iter_chunks(key, chunk_size=4)])
+
+
+async def test_save_read_and_delete(storage):
+    assert await storage.save("report.pdf", io.BytesIO(b"file contents"), "application/pdf") == 13
+    assert await storage.exists("report.pdf")
+    assert await read(storage, "report.pdf") == b"file contents"
+    async with storage.local_copy("report.pdf") as path:
+        assert path.read_bytes() == b"file contents"
+
+    await storage.delete("report.pdf")
+    assert not await storage.exists("report.pdf")
+    await storage.delete("report.pdf")  # Already gone is fine
+
+
+async def test_save_file_consumes_source(storage, tmp_path):
+    source = tmp_path / "upload.part"
+    source.write_bytes(b"chunked upload")
+
+    assert await storage.save_file(".thumbnails/report.jpg", source, "image/jpeg") == 14
+    assert not source.exists()
+    assert await read(storage, ".thumbnails/report.jpg") == b"chunked upload"
+
+
+async def test_disk_io_runs_off_the_event_loop(storage):
+    loop_thread = threading.current_thread()
+    reader_threads = []
+
+    class Upload(io.BytesIO):
+        def read(self, *args):
+            reader_threads.append(threading.current_thread())
+            return super().read(*args)
+
+    await storage.save("report.pdf", Upload(b"file contents"), "application/pdf")
+    assert reader_threads and loop_thread not in reader_threads
+
+
+async def test_move(storage):
+    await storage.save("report.pdf", io.BytesIO(b"file contents"), "application/pdf")
+
+    await storage.move("report.pdf", ".quarantine/report.pdf")
+    assert not await storage.exists("report.pdf")
+    assert await read(storage, ".quarantine/report.pdf") == b"file contents"
+
+
+async def test_list_files_skips_working_directories(storage):
+    for key in ("report.pdf", ".thumbnails/report.jpg", ".partial/session.part", ".cache/archive.zip"):
+        path = storage.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * len(key))
+
+    files = {stored.key: stored.size async for stored in storage.list_files()}
+    assert files == {"report.pdf": 10, ".thumbnails/report.jpg": 22}
+
+
+@pytest.mark.parametrize("key", ["../secret", "a/../../secret", "/etc/passwd", "..\\secret", "", ".", "a//b"])
+async def test_keys_outside_root_rejected(storage, tmp_path, key):
+    (tmp_path / "secret").write_bytes(b"secret")
+
+    with pytest.raises(InvalidStorageKey):
+        await storage.exists(key)
+    with pytest.raises(InvalidStorageKey):
+        await storage.save(key, io.BytesIO(b"overwritten"), "text/plain")
+    with pytest.raises(InvalidStorageKey):
+        await storage.delete(key)
+    with pytest.raises(InvalidStorageKey):
+        await storage.move("report.pdf", key)
+    assert (tmp_path / "secret").read_bytes() == b"secret"
+
+
+async def test_download_rejects_traversal(super_admin):
+    response = await super_admin.get("/api/download/..%5C..%5Cserver.py")
+    assert response.status_code == 400
+
+
+async def test_backends_implement_every_method():
+    class Incomplete(AttachmentStorage):
+        async def exists(self, key):
+            return False
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,55 @@
+"""
+Client autocomplete: case-insensitive prefix matches on company, contact and email
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_prefix_matches_each_field(super_admin, make_client):
+    acme = await make_client(super_admin.id, company_name="Acme Corp", contact_person="Alice Smith", email="alice@acme.com")
+    await make_client(super_admin.id, company_name="Acorn Ltd", contact_person="Bob Jones", email="bob@acorn.com")
+    await make_client(super_admin.id, company_name="Globex", contact_person="Acme Liaison", email="info@globex.com")
+
+    body = (await super_admin.get("/api/clients/suggest", params={"q": "  ACM"})).json()
+    assert [suggestion["value"] for suggestion in body["companies"]] == ["Acme Corp"]
+    assert body["companies"][0]["client_id"] == acme["id"]
+    assert [suggestion["value"] for suggestion in body["contacts"]] == ["Acme Liaison"]
+    assert body["emails"] == []
+
+    body = (await super_admin.get("/api/clients/suggest", params={"q": "a"})).json()
+    assert [suggestion["value"] for suggestion in body["companies"]] == ["Acme Corp", "Acorn Ltd"]
+    assert [suggestion["value"] for suggestion in body["emails"]] == ["alice@acme.com"]
+
+
+async def test_prefix_is_not_a_pattern(super_admin, make_client):
+    await make_client(super_admin.id, company_name="Acme Corp")
+    body = (await super_admin.get("/api/clients/suggest", params={"q": ".*"})).json()
+    assert body["companies"] == []
+
+
+async def test_updated_names_are_suggested(super_admin, make_client):
+    client = await make_client(super_admin.id, company_name="Initech")
+    await super_admin.put(f"/api/clients/{client['id']}", json={"company_name": "Umbrella"})
+
+    body = (await super_admin.get("/api/clients/suggest", params={"q": "umb"})).json()
+    assert [suggestion["value"] for suggestion in body["companies"]] == ["Umbrella"]
+    body = (await super_admin.get("/api/clients/suggest", params={"q": "ini"})).json()
+    assert body["companies"] == []
+
+
+async def test_limit(super_admin, make_client):
+    for index in range(4):
+        await make_client(super_admin.id, company_name=f"Acme {index}")
+    body = (await super_admin.get("/api/clients/suggest", params={"q": "acme", "limit": 2})).json()
+    assert [suggestion["value"] for suggestion in body["companies"]] == ["Acme 0", "Acme 1"]
+
+
+async def test_bde_only_sees_their_clients(make_user, make_client):
+    owner, other = await make_user("bde"), await make_user("bde")
+    await make_client(owner.id, company_name="Acme Corp")
+    await make_client(other.id, company_name="Acme Rival")
+
+    body = (await owner.get("/api/clients/suggest", params={"q": "acme"})).json()
+    assert [suggestion["value"] for suggestion in body["companies"]] == ["Acme Corp"]
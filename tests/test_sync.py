@@ -0,0 +1,115 @@
+"""
+Delta sync: tokens, changed records and tombstones for removed ones
+"""
+
+import base64
+import time
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["UTC", "America/New_York", "Asia/Kolkata"])
+def local_timezone(request, monkeypatch):
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+async def test_sync_token_round_trip(local_timezone):
+    timestamp = datetime(2025, 6, 16, 12, 0, 0, 123000)
+    positions = {"clients": (timestamp, "a"), "tasks": (timestamp, ""), "tombstones": (datetime(2025, 6, 1), "b")}
+    assert server.decode_sync_token(server.encode_sync_token(positions)) == positions
+
+
+async def test_v1_sync_token_still_accepted():
+    token = base64.urlsafe_b64encode(b"v1:1750075200123").decode().rstrip("=")
+    timestamp = datetime(2025, 6, 16, 12, 0, 0, 123000)
+    assert server.decode_sync_token(token) == {stream: (timestamp, "") for stream in server.SYNC_STREAMS}
+
+
+async def test_invalid_sync_token(bde):
+    response = await bde.get("/api/sync", params={"since": "not-a-token"})
+    assert response.status_code == 400
+
+
+async def test_delta_returns_changes_since_token(super_admin, bde, make_client):
+    first = await make_client(bde.id)
+    snapshot = (await bde.get("/api/sync")).json()
+    assert snapshot["full"]
+    assert [client["id"] for client in snapshot["clients"]] == [first["id"]]
+
+    await super_admin.put(f"/api/clients/{first['id']}", json={"requirements": "Changed"})
+    delta = (await bde.get("/api/sync", params={"since": snapshot["token"]})).json()
+    assert not delta["full"]
+    assert [client["requirements"] for client in delta["clients"]] == ["Changed"]
+
+
+async def test_reassignment_moves_client_and_tasks(super_admin, make_user, make_client, make_task):
+    previous_bde, new_bde = await make_user("bde"), await make_user("bde")
+    client = await make_client(previous_bde.id, created_by=super_admin.id)
+    client_task = await make_task(client, assigned_to=super_admin.id)
+    own_task = await make_task(client, assigned_to=previous_bde.id)
+
+    previous_token = (await previous_bde.get("/api/sync")).json()["token"]
+    new_token = (await new_bde.get("/api/sync")).json()["token"]
+
+    response = await super_admin.put(f"/api/clients/{client['id']}", json={"assigned_bde": new_bde.id})
+    assert response.status_code == 200
+
+    delta = (await previous_bde.get("/api/sync", params={"since": previous_token})).json()
+    assert delta["deleted"]["clients"] == [client["id"]]
+    # Still assigned to them, so it stays
+    assert delta["deleted"]["tasks"] == [client_task["id"]]
+
+    delta = (await new_bde.get("/api/sync", params={"since": new_token})).json()
+    assert [c["id"] for c in delta["clients"]] == [client["id"]]
+    assert sorted(task["id"] for task in delta["tasks"]) == sorted([client_task["id"], own_task["id"]])
+    assert delta["deleted"] == {"clients": [], "tasks": [], "users": []}
+
+
+async def test_same_stamp_tombstones_span_pages(monkeypatch, super_admin, bde, make_client, make_task):
+    monkeypatch.setattr(server, "SYNC_PAGE_SIZE", 5)
+    client = await make_client(bde.id)
+    tasks = [await make_task(client) for _ in range(8)]
+    token = (await super_admin.get("/api/sync")).json()["token"]
+
+    # The cascade stamps all nine tombstones with one deleted_at
+    response = await super_admin.delete(f"/api/clients/{client['id']}")
+    assert response.status_code == 200
+
+    first = (await super_admin.get("/api/sync", params={"since": token})).json()
+    assert first["has_more"]
+    second = (await super_admin.get("/api/sync", params={"since": first["token"]})).json()
+    assert not second["has_more"]
+
+    deleted_tasks = first["deleted"]["tasks"] + second["deleted"]["tasks"]
+    assert sorted(deleted_tasks) == sorted(task["id"] for task in tasks)
+    assert first["deleted"]["clients"] + second["deleted"]["clients"] == [client["id"]]
+
+
+async def test_same_stamp_tasks_span_pages(monkeypatch, super_admin, make_user, make_client, make_task):
+    monkeypatch.setattr(server, "SYNC_PAGE_SIZE", 5)
+    previous_bde, new_bde = await make_user("bde"), await make_user("bde")
+    client = await make_client(previous_bde.id)
+    tasks = [await make_task(client) for _ in range(8)]
+    token = (await new_bde.get("/api/sync")).json()["token"]
+
+    # Reassignment stamps all of the client's tasks with one updated_at
+    await super_admin.put(f"/api/clients/{client['id']}", json={"assigned_bde": new_bde.id})
+
+    received = []
+    for _ in range(3):
+        delta = (await new_bde.get("/api/sync", params={"since": token})).json()
+        received += [task["id"] for task in delta["tasks"]]
+        token = delta["token"]
+        if not delta["has_more"]:
+            break
+    assert not delta["has_more"]
+    assert sorted(received) == sorted(task["id"] for task in tasks)
@@ -0,0 +1,92 @@
+"""
+Client timeline: notes, attachments, tasks and stage changes merged newest first
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 6, 1, 9, 0)
+
+
+@pytest.fixture
+async def timeline_client(db, bde, make_client, make_task):
+    """A client with one event of every kind, an hour apart"""
+    client = await make_client(bde.id, created_at=START)
+    note = server.NoteWithAttachment(text="Intro call", author="Test Bde", author_id=bde.id, timestamp=START + timedelta(hours=1)).dict()
+    attachment = server.FileAttachment(
+        filename="deck.pdf", original_filename="deck.pdf", file_size=10, file_type="application/pdf",
+        uploaded_by=bde.id, uploaded_at=START + timedelta(hours=2)
+    ).dict()
+    await db.clients.update_one({"id": client["id"]}, {"$set": {"notes": [note], "attachments": [attachment]}})
+    task = await make_task(client, created_at=START + timedelta(hours=3))
+    stage_change = server.StageChange(
+        client_id=client["id"],
+        from_stage=server.ClientStage.FIRST_CONTACT,
+        to_stage=server.ClientStage.TECHNICAL_DISCUSSION,
+        changed_by=bde.id,
+        changed_by_name="Test Bde",
+        changed_at=START + timedelta(hours=4)
+    ).dict()
+    await db.stage_changes.insert_one(dict(stage_change))
+    return {"client": client, "note": note, "attachment": attachment, "task": task, "stage_change": stage_change}
+
+
+async def test_sources_are_merged_newest_first(bde, timeline_client):
+    client = timeline_client["client"]
+    response = await bde.get(f"/api/clients/{client['id']}/timeline")
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [event["type"] for event in body["events"]] == ["stage_change", "task", "attachment", "note", "created"]
+    assert [event["id"] for event in body["events"]] == [
+        timeline_client["stage_change"]["id"], timeline_client["task"]["id"],
+        timeline_client["attachment"]["id"], timeline_client["note"]["id"], client["id"]
+    ]
+    assert body["next_cursor"] is None
+
+
+async def test_cursor_pages_through_every_event(bde, timeline_client):
+    client = timeline_client["client"]
+    pages = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = (await bde.get(f"/api/clients/{client['id']}/timeline", params=params)).json()
+        pages.append([event["type"] for event in body["events"]])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert pages == [["stage_change", "task"], ["attachment", "note"], ["created"]]
+
+
+async def test_same_timestamp_events_are_not_skipped(db, bde, make_client, make_task):
+    client = await make_client(bde.id, created_at=START)
+    tasks = [await make_task(client, created_at=START + timedelta(hours=1)) for _ in range(3)]
+
+    first = (await bde.get(f"/api/clients/{client['id']}/timeline", params={"limit": 2})).json()
+    second = (await bde.get(
+        f"/api/clients/{client['id']}/timeline", params={"limit": 2, "cursor": first["next_cursor"]}
+    )).json()
+
+    task_ids = [event["id"] for event in first["events"] + second["events"] if event["type"] == "task"]
+    assert task_ids == sorted((task["id"] for task in tasks), reverse=True)
+    assert second["events"][-1]["type"] == "created"
+
+
+async def test_invalid_cursor(bde, make_client):
+    client = await make_client(bde.id)
+    response = await bde.get(f"/api/clients/{client['id']}/timeline", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+async def test_bde_cannot_see_other_clients(make_user, make_client):
+    owner, other = await make_user("bde"), await make_user("bde")
+    client = await make_client(owner.id)
+    response = await other.get(f"/api/clients/{client['id']}/timeline")
+    assert response.status_code == 403
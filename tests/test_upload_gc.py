@@ -0,0 +1,127 @@
+"""
+Upload garbage collection: orphaned attachment files and abandoned upload sessions
+"""
+
+import io
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+from tests.conftest import requires_mongod
+from upload_gc import UploadGarbageCollector
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def storage(db):
+    return server.attachment_storage
+
+
+@pytest.fixture
+def gc(db, storage, tmp_path):
+    return UploadGarbageCollector(db, storage, tmp_path / "uploads" / ".partial")
+
+
+async def store(storage, key: str, age_seconds: float = 2 * 24 * 3600) -> str:
+    await storage.save(key, io.BytesIO(b"file contents"), "text/plain")
+    modified = time.time() - age_seconds
+    os.utime(storage.local_path(key), (modified, modified))
+    return key
+
+
+async def test_referenced_files_are_kept(db, gc, storage):
+    attachment = await store(storage, f"{uuid.uuid4()}.pdf")
+    note_attachment = await store(storage, f"{uuid.uuid4()}.png")
+    await db.clients.insert_many([
+        {"id": "client-1", "attachments": [{"filename": attachment}]},
+        {"id": "client-2", "notes": [{"text": "See screenshot", "attachments": [{"filename": note_attachment}]}]},
+    ])
+
+    report = await gc.run()
+    assert report["orphaned_files"] == 0
+    assert await storage.exists(attachment)
+    assert await storage.exists(note_attachment)
+
+
+@requires_mongod  # The stand-in can't project through arrays mixing strings and documents
+async def test_legacy_string_notes_are_skipped(db, gc, storage):
+    note_attachment = await store(storage, f"{uuid.uuid4()}.png")
+    await db.clients.insert_one({
+        "id": "client-1",
+        "notes": ["Legacy plain note", {"text": "See screenshot", "attachments": [{"filename": note_attachment}]}]
+    })
+
+    report = await gc.run()
+    assert report["orphaned_files"] == 0
+    assert await storage.exists(note_attachment)
+
+
+async def test_orphaned_files_are_deleted(gc, storage):
+    orphan = await store(storage, f"{uuid.uuid4()}.pdf")
+    recent = await store(storage, f"{uuid.uuid4()}.pdf", age_seconds=60)
+
+    report = await gc.run()
+    assert report["orphaned_files"] == 1
+    assert report["skipped_recent_files"] == 1
+    assert report["reclaimed_bytes"] == len(b"file contents")
+    assert not await storage.exists(orphan)
+    # Its client update may not have landed yet
+    assert await storage.exists(recent)
+
+
+async def test_dry_run_keeps_files(gc, storage):
+    orphan = await store(storage, f"{uuid.uuid4()}.pdf")
+
+    report = await gc.run(dry_run=True)
+    assert report["orphaned_files"] == 1
+    assert await storage.exists(orphan)
+
+
+async def test_orphans_are_quarantined(gc, storage):
+    orphan = await store(storage, f"{uuid.uuid4()}.pdf")
+
+    await gc.run(quarantine=True)
+    assert not await storage.exists(orphan)
+    assert await storage.exists(f".quarantine/{orphan}")
+
+    # Quarantined files are left for an operator
+    report = await gc.run(quarantine=True)
+    assert report["scanned_files"] == 0
+
+
+async def test_thumbnails_follow_their_original(db, gc, storage):
+    kept, orphan = uuid.uuid4(), uuid.uuid4()
+    await store(storage, f"{kept}.png")
+    await store(storage, f".thumbnails/{kept}.jpg")
+    await store(storage, f"{orphan}.png")
+    await store(storage, f".thumbnails/{orphan}.jpg")
+    await db.clients.insert_one({"id": "client-1", "attachments": [{"filename": f"{kept}.png"}]})
+
+    await gc.run(quarantine=True)
+    assert await storage.exists(f".thumbnails/{kept}.jpg")
+    assert not await storage.exists(f".thumbnails/{orphan}.jpg")
+    # Thumbnails can be regenerated, so they are deleted rather than quarantined
+    assert not await storage.exists(f".quarantine/.thumbnails/{orphan}.jpg")
+    assert await storage.exists(f".quarantine/{orphan}.png")
+
+
+async def test_abandoned_upload_sessions_are_removed(db, gc, tmp_path):
+    partial_directory = tmp_path / "uploads" / ".partial"
+    now = datetime.utcnow()
+    for session_id, expires_at in (("abandoned", now - timedelta(hours=1)), ("active", now + timedelta(hours=1))):
+        await db.upload_sessions.insert_one({"id": session_id, "expires_at": expires_at})
+        (partial_directory / f"{session_id}.part").write_bytes(b"partial")
+
+    report = await gc.run()
+    assert report["expired_upload_sessions"] == 1
+    assert report["expired_upload_bytes"] == len(b"partial")
+    assert not (partial_directory / "abandoned.part").exists()
+    assert (partial_directory / "active.part").exists()
+    assert [session["id"] async for session in db.upload_sessions.find()] == ["active"]
+    # The partial directory itself is never scanned as attachments
+    assert report["scanned_files"] == 0
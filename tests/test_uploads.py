@@ -0,0 +1,122 @@
+"""
+Resumable uploads: chunks at the committed offset, resume after failures,
+completion into attachment storage
+"""
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = b"0123456789" * 10
+
+
+async def start_upload(user, total_size: int = len(CONTENT)) -> dict:
+    response = await user.post("/api/uploads", json={"filename": "report.pdf", "file_type": "application/pdf", "total_size": total_size})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def put_chunk(user, session: dict, offset: int, data: bytes):
+    return await user.put(f"/api/uploads/{session['id']}", content=data, headers={"Upload-Offset": str(offset)})
+
+
+async def test_upload_in_chunks_and_complete(bde):
+    session = await start_upload(bde)
+
+    for offset in range(0, len(CONTENT), 40):
+        response = await put_chunk(bde, session, offset, CONTENT[offset:offset + 40])
+        assert response.status_code == 200
+        assert response.json()["offset"] == min(offset + 40, len(CONTENT))
+
+    response = await bde.post(f"/api/uploads/{session['id']}/complete")
+    assert response.status_code == 200
+    attachment = response.json()
+    assert attachment["filename"] == session["filename"]
+    assert attachment["file_size"] == len(CONTENT)
+    assert server.attachment_storage.local_path(session["filename"]).read_bytes() == CONTENT
+    assert not server.get_partial_upload_path(session["id"]).exists()
+
+    response = await bde.get(f"/api/uploads/{session['id']}")
+    assert response.status_code == 404
+
+
+async def test_offset_mismatch(bde):
+    session = await start_upload(bde)
+    await put_chunk(bde, session, 0, CONTENT[:30])
+
+    # A retry of a chunk that already landed, and a chunk after a gap
+    for offset in (0, 50):
+        response = await put_chunk(bde, session, offset, CONTENT[offset:offset + 20])
+        assert response.status_code == 409
+        assert response.headers["Upload-Offset"] == "30"
+
+
+async def test_resume_after_failed_chunk(bde):
+    session = await start_upload(bde)
+    await put_chunk(bde, session, 0, CONTENT[:50])
+
+    # A chunk that died mid-write leaves bytes past the committed offset
+    with open(server.get_partial_upload_path(session["id"]), "ab") as partial:
+        partial.write(b"garbage")
+
+    status = (await bde.get(f"/api/uploads/{session['id']}")).json()
+    assert status["offset"] == 50
+
+    response = await put_chunk(bde, session, 50, CONTENT[50:])
+    assert response.status_code == 200
+    response = await bde.post(f"/api/uploads/{session['id']}/complete")
+    assert response.status_code == 200
+    assert server.attachment_storage.local_path(session["filename"]).read_bytes() == CONTENT
+
+
+async def test_chunk_rejected_while_another_is_written(db, bde):
+    session = await start_upload(bde)
+    # Another worker holds the claim at this offset
+    await server.claim_upload_session(server.UploadSession(**await db.upload_sessions.find_one({"id": session["id"]})), 0)
+
+    response = await put_chunk(bde, session, 0, CONTENT[:10])
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Another request is writing to this upload"
+
+
+async def test_oversized_chunk_keeps_offset(bde):
+    session = await start_upload(bde, total_size=20)
+
+    response = await put_chunk(bde, session, 0, CONTENT[:30])
+    assert response.status_code == 400
+    status = (await bde.get(f"/api/uploads/{session['id']}")).json()
+    assert status["offset"] == 0
+
+    # The failed chunk released its claim
+    response = await put_chunk(bde, session, 0, CONTENT[:20])
+    assert response.status_code == 200
+
+
+async def test_complete_needs_every_byte(bde):
+    session = await start_upload(bde)
+    await put_chunk(bde, session, 0, CONTENT[:50])
+
+    response = await bde.post(f"/api/uploads/{session['id']}/complete")
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "50"
+
+
+async def test_only_uploader_resumes(bde, make_user):
+    session = await start_upload(bde)
+    other = await make_user("bde")
+
+    response = await put_chunk(other, session, 0, CONTENT[:10])
+    assert response.status_code == 403
+
+
+async def test_cancel(bde):
+    session = await start_upload(bde)
+    await put_chunk(bde, session, 0, CONTENT[:10])
+
+    response = await bde.delete(f"/api/uploads/{session['id']}")
+    assert response.status_code == 200
+    assert not server.get_partial_upload_path(session["id"]).exists()
+    response = await put_chunk(bde, session, 10, CONTENT[10:20])
+    assert response.status_code == 404
@@ -0,0 +1,87 @@
+"""
+User management scenarios (ported from user_management_test.py and the user
+checks in backend_test.py): register, read, update and delete users, and who
+is allowed to do what
+"""
+
+import pytest
+
+from tests.conftest import TEST_PASSWORD
+
+pytestmark = pytest.mark.anyio
+
+NEW_BDE = {
+    "email": "testbde@example.com",
+    "name": "Test BDE User",
+    "password": "testpassword123",
+    "role": "bde",
+}
+
+
+async def test_register_update_and_delete_user(http, super_admin):
+    bdes_before = (await super_admin.get("/api/users/bdes")).json()
+
+    response = await super_admin.post("/api/auth/register", json=NEW_BDE)
+    assert response.status_code == 200
+    user_id = response.json()["id"]
+
+    response = await super_admin.get(f"/api/users/{user_id}")
+    assert response.status_code == 200
+    assert response.json()["email"] == NEW_BDE["email"]
+
+    bdes_after = (await super_admin.get("/api/users/bdes")).json()
+    assert len(bdes_after) == len(bdes_before) + 1
+
+    update = {"name": "Updated BDE User", "email": "updated.bde@example.com", "is_active": True}
+    response = await super_admin.put(f"/api/users/{user_id}", json=update)
+    assert response.status_code == 200
+
+    user = (await super_admin.get(f"/api/users/{user_id}")).json()
+    assert user["name"] == update["name"]
+    assert user["email"] == update["email"]
+
+    # The registered password works
+    response = await http.post("/api/auth/login", json={"email": update["email"], "password": NEW_BDE["password"]})
+    assert response.status_code == 200
+
+    response = await super_admin.delete(f"/api/users/{user_id}")
+    assert response.status_code == 200
+
+    response = await super_admin.get(f"/api/users/{user_id}")
+    assert response.status_code == 404
+
+
+async def test_duplicate_email_rejected(super_admin, bde):
+    response = await super_admin.post("/api/auth/register", json={**NEW_BDE, "email": bde.user["email"]})
+    assert response.status_code == 400
+
+
+async def test_admin_cannot_create_admins(admin):
+    response = await admin.post("/api/auth/register", json={**NEW_BDE, "role": "admin"})
+    assert response.status_code == 403
+
+    response = await admin.post("/api/auth/register", json=NEW_BDE)
+    assert response.status_code == 200
+
+
+async def test_bde_cannot_register_users(bde):
+    response = await bde.post("/api/auth/register", json=NEW_BDE)
+    assert response.status_code == 403
+
+
+async def test_only_super_admin_deletes_users(super_admin, admin, bde):
+    response = await admin.delete(f"/api/users/{bde.id}")
+    assert response.status_code == 403
+
+    response = await super_admin.delete(f"/api/users/{super_admin.id}")
+    assert response.status_code == 400
+
+
+async def test_inactive_user_cannot_log_in(http, super_admin, make_user):
+    user = await make_user("bde")
+
+    response = await super_admin.put(f"/api/users/{user.id}", json={"is_active": False})
+    assert response.status_code == 200
+
+    response = await http.post("/api/auth/login", json={"email": user.user["email"], "password": TEST_PASSWORD})
+    assert response.status_code == 401
@@ -0,0 +1,126 @@
+"""
+Multi-worker coordination: leader leases for background jobs and the worker
+bus that keeps live-update events and profiling triggers in step
+"""
+
+import asyncio
+
+import pytest
+
+from events import EventBroker
+from leader_election import LeaderLease, run_as_leader
+from profiling import ProfilingController
+from tests.conftest import requires_mongod
+from worker_bus import WorkerBus
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_lease_has_one_holder(db):
+    first = LeaderLease(db, "job", holder="worker-1")
+    second = LeaderLease(db, "job", holder="worker-2")
+
+    assert await first.try_acquire()
+    assert not await second.try_acquire()
+    assert await first.try_acquire()  # Renewal
+
+    await first.release()
+    assert await second.try_acquire()
+    assert not await first.try_acquire()
+
+
+async def test_expired_lease_is_taken_over(db):
+    crashed = LeaderLease(db, "job", holder="worker-1", lease_seconds=-1)
+    assert await crashed.try_acquire()
+
+    assert await LeaderLease(db, "job", holder="worker-2").try_acquire()
+
+
+async def test_job_runs_on_one_worker_and_fails_over(db):
+    running = []
+
+    def job_for(holder):
+        async def job():
+            running.append(holder)
+            try:
+                await asyncio.Event().wait()
+            finally:
+                running.remove(holder)
+        return job
+
+    workers = {
+        holder: asyncio.create_task(run_as_leader(db, "job", job_for(holder), lease_seconds=0.3, holder=holder))
+        for holder in ("worker-1", "worker-2")
+    }
+    await asyncio.sleep(0.2)
+    assert len(running) == 1
+    leader = running[0]
+
+    # The leader shuts down and hands the lease over
+    workers.pop(leader).cancel()
+    await asyncio.sleep(0.3)
+    assert running and running[0] != leader
+
+    for task in workers.values():
+        task.cancel()
+    await asyncio.gather(*workers.values(), return_exceptions=True)
+
+
+async def test_events_relayed_to_other_workers():
+    here, there = EventBroker(), EventBroker()
+    here.relay = there.publish_remote
+    there.publish("unrelated", {})  # Advance the other worker's own sequence
+    subscriber = there.subscribe("bde-1", restricted=True)
+
+    here.publish("client.updated", {"id": "client-1"}, assigned_bde="bde-1")
+    here.publish("client.updated", {"id": "client-2"}, assigned_bde="bde-2")
+
+    event = subscriber.queue.get_nowait()
+    assert event["data"]["id"] == "client-1"
+    assert event["id"] == 2  # Numbered in the receiving worker's sequence
+    assert subscriber.queue.empty()
+
+
+async def test_profiling_triggers_shared_between_workers():
+    here, there = ProfilingController(), ProfilingController()
+    here.relay, there.relay = there.apply_remote, here.apply_remote
+
+    trigger = here.arm("/api/clients", count=2, expires_minutes=5, requested_by="admin-1")
+    assert [t.id for t in there.triggers] == [trigger.id]
+
+    # A slot used on one worker is used up on all of them
+    assert there.claim("GET", "/api/clients") is not None
+    assert here.triggers[0].remaining == 1
+
+    here.disarm()
+    assert there.triggers == []
+
+
+async def test_bus_ignores_own_messages():
+    bus = WorkerBus()
+    received = []
+    bus.subscribe("topic", received.append)
+
+    bus.dispatch({"topic": "topic", "origin": bus.worker_id, "payload": {"n": 1}})
+    bus.dispatch({"topic": "topic", "origin": "other-worker", "payload": {"n": 2}})
+    bus.dispatch({"topic": "other-topic", "origin": "other-worker", "payload": {"n": 3}})
+    assert received == [{"n": 2}]
+
+
+@requires_mongod
+async def test_bus_delivers_between_workers(db):
+    sender, receiver = WorkerBus(), WorkerBus()
+    sender.worker_id, receiver.worker_id = "worker-1", "worker-2"
+    received = asyncio.Queue()
+    receiver.subscribe("topic", received.put_nowait)
+
+    tasks = [asyncio.create_task(bus.run(db)) for bus in (sender, receiver)]
+    while not (sender.running and receiver.running):
+        await asyncio.sleep(0.01)
+
+    await sender.publish("topic", {"n": 1})
+    assert await asyncio.wait_for(received.get(), 5) == {"n": 1}
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)